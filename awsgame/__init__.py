@@ -0,0 +1 @@
+"""Peças do AWS Game que não dependem de uma execução do script Streamlit."""
@@ -0,0 +1,340 @@
+"""Linha de comando: `python -m awsgame <comando>`."""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+from awsgame import (
+    bench, bundle, curation, curation_db, dataset, leaderboard, levels, loadtest, matching, pipeline, refresh,
+    services, telemetry,
+)
+
+
+def _dataset_error(exc):
+    print(f"ERRO: {exc}", file=sys.stderr)
+    return 1
+
+
+def _dataset(args):
+    try:
+        catalog = dataset.compile_dataset(args.source, args.out)
+    except dataset.DatasetError as exc:
+        return _dataset_error(exc)
+    size = Path(args.out).stat().st_size
+    start = time.perf_counter()
+    dataset.load_dataset(args.out, descriptions=False)
+    load_us = (time.perf_counter() - start) * 1e6
+    categories = len({service["category"] for service in catalog})
+    print(f"{args.out}: {size:,} bytes, {len(catalog)} serviços, {categories} categorias")
+    print(f"carga sem descrições: {load_us:,.0f} µs")
+    return 0
+
+
+def _build(args):
+    try:
+        manifest = bundle.build(args.out)
+    except dataset.DatasetError as exc:
+        return _dataset_error(exc)
+    print(
+        f"{manifest['html']}: {manifest['bytes']:,} bytes, {manifest['services']} serviços "
+        f"(folga de {bundle.HTML_BUDGET_BYTES - manifest['bytes']:,} até o teto)"
+    )
+    print(f"  gzip (o tornado comprime na hora): {manifest['gzip_bytes']:,} bytes")
+    levels_info = manifest["levels"]
+    print(f"fases: {levels_info['count']} em {levels_info['bytes']:,} bytes ({levels_info['file']})")
+    if manifest["bytes"] > bundle.HTML_BUDGET_BYTES:
+        print(
+            f"ERRO: acima do teto de {bundle.HTML_BUDGET_BYTES:,} bytes (HTML_BUDGET_BYTES).",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def _bench_cache(args):
+    if args.worker:
+        print(json.dumps(bench.run_scenario(args.worker, args.sessions[0], args.reruns)))
+        return 0
+    print(bench.format_results(bench.compare_caches(args.sessions, args.reruns)))
+    return 0
+
+
+def _bench(args):
+    results = bench.run_suite()
+    if args.update:
+        bench.save_baseline(results)
+        print(f"Linha de base gravada em {bench.BASELINE_PATH}")
+        return 0
+
+    baseline = bench.load_baseline()
+    lines, regressions = bench.confirm(results, baseline)
+    print("\n".join(lines))
+    if baseline is None:
+        print("Sem linha de base: rode com --update para gravar uma.")
+    if regressions:
+        print(f"ERRO: {len(regressions)} regressão(ões): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _tuning_override(text):
+    name, sep, value = text.partition("=")
+    if not sep or name not in levels.TUNING_FIELDS:
+        raise argparse.ArgumentTypeError(
+            f"use nome=valor, com nome em: {', '.join(levels.TUNING_FIELDS)}"
+        )
+    return name, float(value)
+
+
+def _levels(args):
+    overrides = dict(args.set)
+    for name in ("moving_every", "breakable_every", "break_ticks"):
+        if name in overrides:
+            overrides[name] = int(overrides[name])
+    tuning = levels.Tuning(**overrides)
+    pack = None
+    if args.pack:
+        manifest = bundle.ensure_bundle()
+        pack = levels.pack_layouts(bundle.BUNDLE_DIR / manifest["levels"]["file"])
+    result = levels.analyze(args.layouts, args.platforms, tuning, args.seed, pack=pack)
+    print(levels.format_report(result, args.worst))
+    return 1 if result["failure_probability"].any() else 0
+
+
+def _frames(args):
+    print(telemetry.format_report(telemetry.load_aggregate(args.path)))
+    return 0
+
+
+def _leaderboard(args):
+    board = leaderboard.Leaderboard(args.path)
+    if args.day is None:
+        entries = board.top(args.top)
+    else:
+        entries = board.daily_top(args.day, args.top)
+    print(leaderboard.format_top(entries))
+    print(f"{board.counts.total:,} partidas")
+    return 0
+
+
+def _match(args):
+    right = matching.load_catalog(args.right)
+    if args.name:
+        index = matching.TrigramIndex(right)
+        position = index.exact(args.name)
+        if position is not None:
+            print(f"exato: {index.names[position]}")
+        for score, position in index.candidates(args.name, args.threshold, args.limit):
+            print(f"{score:.2f}  {index.names[position]}")
+        return 0
+
+    left = matching.load_catalog(args.left)
+    start = time.perf_counter()
+    result = matching.reconcile(left, right, args.threshold)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(matching.format_reconciliation(result, args.left, args.right))
+    for side, label in (("only_left", args.left), ("only_right", args.right)):
+        if args.all and result[side]:
+            print(f"\nSÓ EM {label.upper()} ({len(result[side])})")
+            print("\n".join(result[side]))
+    print(f"\n{len(left)} x {len(right)} nomes em {elapsed_ms:.1f} ms")
+    return 0
+
+
+def _curate(args):
+    runner = pipeline.Runner(curation.STAGES, workers=args.workers, force=args.force)
+    start = time.perf_counter()
+    try:
+        results = runner.run()
+    except (pipeline.PipelineError, dataset.DatasetError) as exc:
+        return _dataset_error(exc)
+    print(pipeline.format_results(results, (time.perf_counter() - start) * 1000))
+    return 0
+
+
+def _curation_db(args):
+    query = curation_db.QUERIES[args.query]
+    extra = (args.catalog,) if args.query in curation_db.CATALOG_QUERIES else ()
+    try:
+        db = curation_db.connect(args.path)
+    except FileNotFoundError as exc:
+        return _dataset_error(exc)
+    with closing(db):
+        start = time.perf_counter()
+        rows = query(db, *extra)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    for row in rows:
+        # Os textos longos (descrição, texto da fonte) ficam de fora da listagem.
+        print("  |  ".join(row[:2]) if isinstance(row, tuple) else row)
+    print(f"\n{len(rows)} linha(s) em {elapsed_ms:.2f} ms")
+    return 0
+
+
+def _refresh(args):
+    urls = refresh.catalog_urls()[:args.limit]
+    if args.fixtures:
+        written = refresh.write_fixtures()
+        print(f"fixtures em {refresh.FIXTURES_DIR}: {written} página(s) gravada(s)")
+    start = time.perf_counter()
+    results = refresh.run_refresh(urls, args.fixtures, args.concurrency, args.per_host, args.interval)
+    print(refresh.format_results(results, time.perf_counter() - start))
+    if args.write:
+        changed = refresh.apply_descriptions(results)
+        print(f"{len(changed)} descrição(ões) nova(s) em {refresh.COLLECTED_PATH.name}")
+        for name in changed:
+            print(f"  {name}")
+    return 1 if any(result["error"] for result in results) else 0
+
+
+def _loadtest(args):
+    results = loadtest.run_load(args.steps, args.ramp, args.port, args.url, args.pid)
+    print(loadtest.format_results(results))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m awsgame")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="pré-renderiza o bundle do jogo em build/game/")
+    build.add_argument("--out", default=bundle.BUNDLE_DIR, help="pasta de saída")
+    build.set_defaults(func=_build)
+
+    compiler = commands.add_parser(
+        "dataset", help="valida o servicos.json e compila o dataset em build/dataset/",
+    )
+    compiler.add_argument("--source", type=Path, default=services.SERVICES_PATH)
+    compiler.add_argument("--out", type=Path, default=dataset.DATASET_PATH)
+    compiler.set_defaults(func=_dataset)
+
+    bench_suite = commands.add_parser(
+        "bench", help="mede tempos e deltas e compara com a linha de base",
+    )
+    bench_suite.add_argument(
+        "--update", action="store_true", help="regrava awsgame/bench_baseline.json",
+    )
+    bench_suite.set_defaults(func=_bench)
+
+    bench_cache = commands.add_parser(
+        "bench-cache", help="compara o cache antigo (TTL) com o compartilhado por processo",
+    )
+    bench_cache.add_argument(
+        "--sessions", type=int, nargs="+", default=list(bench.DEFAULT_SESSIONS),
+        help="quantidades de sessões simultâneas",
+    )
+    bench_cache.add_argument("--reruns", type=int, default=bench.RERUNS, help="reruns por sessão")
+    bench_cache.add_argument("--worker", choices=bench.APPROACHES, help=argparse.SUPPRESS)
+    bench_cache.set_defaults(func=_bench_cache)
+
+    level_parser = commands.add_parser(
+        "levels", help="mede a alcançabilidade das fases sorteadas por awsgame.layouts",
+    )
+    level_parser.add_argument("--layouts", type=int, default=1_000_000, help="fases sorteadas")
+    level_parser.add_argument(
+        "--platforms", type=int, help="plataformas por fase (padrão: as do servicos.json)",
+    )
+    level_parser.add_argument("--seed", type=int, default=0)
+    level_parser.add_argument(
+        "--pack", action="store_true", help="mede as fases empacotadas pelo build, não um sorteio",
+    )
+    level_parser.add_argument("--worst", type=int, default=10, help="piores pulos listados")
+    level_parser.add_argument(
+        "--set", type=_tuning_override, action="append", default=[], metavar="NOME=VALOR",
+        help="sobrescreve um parâmetro de ajuste (ex.: --set jump_power=22)",
+    )
+    level_parser.set_defaults(func=_levels)
+
+    frames = commands.add_parser(
+        "frames", help="tempos de quadro dos jogadores, por classe de aparelho",
+    )
+    frames.add_argument(
+        "--path", type=Path, default=telemetry.FRAMES_PATH, help="agregado gravado pelo app",
+    )
+    frames.set_defaults(func=_frames)
+
+    ranking = commands.add_parser("leaderboard", help="o topo do placar gravado pelo app")
+    ranking.add_argument("--top", type=int, default=10, help="quantos resultados listar")
+    ranking.add_argument("--day", type=int, help="só a escalada deste dia (dias desde 1970)")
+    ranking.add_argument("--path", type=Path, default=leaderboard.DB_PATH, help="banco do placar")
+    ranking.set_defaults(func=_leaderboard)
+
+    match = commands.add_parser(
+        "match", help="cruza os nomes de dois catálogos da curadoria (exatos e quase casamentos)",
+    )
+    match.add_argument(
+        "left", nargs="?", default="tetris",
+        help=f"catálogo da esquerda: {', '.join(matching.CATALOGS)} ou um JSON com \"name\"",
+    )
+    match.add_argument("right", nargs="?", default="jogo", help="catálogo da direita")
+    match.add_argument("--threshold", type=float, default=matching.NEAR_THRESHOLD)
+    match.add_argument("--name", help="só procura este nome no catálogo da direita")
+    match.add_argument("--limit", type=int, default=5, help="candidatos listados com --name")
+    match.add_argument("--all", action="store_true", help="lista também o que sobrou de cada lado")
+    match.set_defaults(func=_match)
+
+    curate = commands.add_parser(
+        "curate", help="regera o servicos.json e os relatórios da curadoria que ficaram velhos",
+    )
+    curate.add_argument("--workers", type=int, default=4, help="etapas rodando ao mesmo tempo")
+    curate.add_argument(
+        "--force", action="store_true", help="sobrescreve saídas editadas à mão",
+    )
+    curate.set_defaults(func=_curate)
+
+    query = commands.add_parser(
+        "curation-db", help="consulta o banco da curadoria gravado pelo curate",
+    )
+    query.add_argument("query", choices=curation_db.QUERIES)
+    query.add_argument(
+        "--catalog", default="tetris", choices=curation_db.CATALOG_FILES,
+        help="catálogo de both, only-catalog e only-game",
+    )
+    query.add_argument("--path", type=Path, default=curation_db.DB_PATH, help="banco da curadoria")
+    query.set_defaults(func=_curation_db)
+
+    refresher = commands.add_parser(
+        "refresh", help="rebaixa as páginas dos catálogos oficiais (condicional, com cache em disco)",
+    )
+    refresher.add_argument(
+        "--fixtures", action="store_true", help="usa um servidor local com páginas de fixture, sem rede",
+    )
+    refresher.add_argument(
+        "--write", action="store_true", help="grava as descrições novas no oficial_coletado.json",
+    )
+    refresher.add_argument("--concurrency", type=int, default=refresh.CONCURRENCY, help="requisições em voo")
+    refresher.add_argument("--per-host", type=int, default=refresh.PER_HOST, help="em voo por host")
+    refresher.add_argument(
+        "--interval", type=float, default=refresh.HOST_INTERVAL_SECONDS,
+        help="segundos entre o início de duas requisições ao mesmo host",
+    )
+    refresher.add_argument("--limit", type=int, help="só as primeiras N URLs")
+    refresher.set_defaults(func=_refresh)
+
+    load = commands.add_parser(
+        "loadtest", help="sessões simultâneas contra o app.py, em degraus, sem navegador",
+    )
+    load.add_argument(
+        "--steps", type=int, nargs="+", default=list(loadtest.DEFAULT_STEPS),
+        help="sessões simultâneas em cada degrau",
+    )
+    load.add_argument(
+        "--ramp", type=float, default=loadtest.RAMP_SECONDS,
+        help="segundos em que as sessões de um degrau chegam",
+    )
+    load.add_argument(
+        "--port", type=int, default=loadtest.DEFAULT_PORT,
+        help="porta do servidor que o teste sobe a cada degrau",
+    )
+    load.add_argument("--url", help="usa um servidor já no ar em vez de subir um")
+    load.add_argument("--pid", type=int, help="processo desse servidor, para medir CPU e memória")
+    load.set_defaults(func=_loadtest)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
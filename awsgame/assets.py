@@ -0,0 +1,195 @@
+"""Assets do jogo servidos por URL com hash de conteúdo.
+
+Antes o mascote e os quatro MP3 iam embutidos em base64 no HTML do jogo:
+~1,15 MB empurrados pelo websocket a cada sessão nova, sem o navegador poder
+cachear nada. Aqui cada arquivo é publicado numa pasta servida pelo próprio
+Streamlit, com o hash do conteúdo no nome — a URL muda quando o arquivo muda,
+então o navegador pode guardá-la para sempre.
+
+O próprio jogo também é servido assim: a pasta do build (awsgame.bundle) é um
+componente declarado, e o app o renderiza pelo nome. O HTML sai do disco por
+HTTP, uma vez por visitante; pelo websocket só passam os argumentos.
+"""
+
+import hashlib
+import logging
+import re
+from functools import cache
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BUILD_DIR = BASE_DIR / "build"
+ASSETS_DIR = BUILD_DIR / "assets"
+GAME_DIR = BUILD_DIR / "game"
+
+# Componente -> pasta servida. "game" é a saída do build (awsgame.bundle) e o
+# componente que o app renderiza; os trechos de descrição vêm de lá também.
+SERVED_DIRS = {"static": ASSETS_DIR, "game": GAME_DIR}
+
+# Chave que o JS usa -> arquivo em static/. Todos continuam opcionais: o jogo
+# tem sprite de fallback e roda mudo sem eles.
+ASSET_SOURCES = {
+    "mascote": "static/mascote.png",
+    "aplausos": "static/aplausos.mp3",
+    "pulo": "static/pulo.mp3",
+    "gameover": "static/gameover.mp3",
+    "sonora": "static/sonora.mp3",
+}
+
+HASH_LENGTH = 12
+IMMUTABLE = "public, max-age=31536000, immutable"
+# O Streamlit abre todo componente por index.html. Nome fixo, então o navegador
+# sempre pergunta ao servidor — com o ETag do tornado, a resposta é um 304.
+ENTRY_NAME = "index.html"
+REVALIDATE = "no-cache"
+
+# Versões (maior.menor) do Streamlit em que os ganchos no
+# ComponentRequestHandler — set_extra_headers aqui, post em awsgame.routes —
+# foram conferidos. É API interna: fora desta lista o patch não entra, o log
+# avisa, e tests/test_streamlit_hooks.py falha até alguém conferir de novo.
+STREAMLIT_TESTED = ("1.47",)
+
+_LOGGER = logging.getLogger(__name__)
+
+# nome.<12 hex>.ext — só o que casa com isso recebe o cabeçalho imutável.
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{%d}\.[a-z0-9]+$" % HASH_LENGTH)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(relative_path, data):
+    path = Path(relative_path)
+    return f"{path.stem}.{content_hash(data)}{path.suffix}"
+
+
+def publish(sources, out_dir):
+    """Copia cada fonte para out_dir com o hash no nome e devolve {chave: nome}.
+
+    Fonte ausente vira None. Arquivo já publicado não é reescrito: o nome é o
+    hash, então se existe, tem o conteúdo certo. A escrita passa por um .tmp
+    para que uma requisição concorrente nunca leia um arquivo pela metade.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    published = {}
+    for key, relative_path in sources.items():
+        try:
+            data = (BASE_DIR / relative_path).read_bytes()
+        except FileNotFoundError:
+            published[key] = None
+            continue
+
+        name = hashed_name(relative_path, data)
+        target = out_dir / name
+        if not target.exists():
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+        published[key] = name
+    return published
+
+
+@cache
+def publish_assets():
+    """Uma vez por processo: os arquivos de static/ só mudam com um deploy."""
+    return publish(ASSET_SOURCES, ASSETS_DIR)
+
+
+@cache
+def component_handler():
+    """O ComponentRequestHandler do Streamlit, se dá para remendá-lo; senão None.
+
+    None quando a versão não está em STREAMLIT_TESTED ou o gancho sumiu. Aí o
+    jogo segue funcionando com o cache padrão do Streamlit e sem as rotas POST,
+    e o aviso sai no log, uma vez por processo.
+    """
+    try:
+        import streamlit
+        from streamlit.web.server.component_request_handler import ComponentRequestHandler
+    except ImportError:
+        _LOGGER.warning("ComponentRequestHandler não existe mais: cache imutável e rotas POST desligados.")
+        return None
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    if version not in STREAMLIT_TESTED:
+        _LOGGER.warning(
+            "Streamlit %s não conferido (STREAMLIT_TESTED): cache imutável e rotas POST desligados.",
+            streamlit.__version__,
+        )
+        return None
+    if not callable(getattr(ComponentRequestHandler, "set_extra_headers", None)):
+        _LOGGER.warning("ComponentRequestHandler sem set_extra_headers: cache imutável desligado.")
+        return None
+    return ComponentRequestHandler
+
+
+def _serve_immutable(component_name):
+    """Marca as URLs com hash do componente como imutáveis.
+
+    O Streamlit serve arquivos de componente com "Cache-Control: public" e sem
+    max-age, e aí o navegador revalida por heurística. Como o nome já carrega o
+    hash, dá para prometer um ano. O index.html, sem hash, é revalidado sempre:
+    a heurística podia segurar por horas um que aponta para o jogo antigo. O
+    ETag continua vindo do tornado.
+    """
+    ComponentRequestHandler = component_handler()
+    if ComponentRequestHandler is None:
+        return
+
+    original = ComponentRequestHandler.set_extra_headers
+    if getattr(original, "awsgame_immutable", None) is not None:
+        original.awsgame_immutable.add(component_name)
+        return
+
+    prefixes = {component_name}
+
+    def set_extra_headers(self, path):
+        original(self, path)
+        component, _, filename = path.partition("/")
+        if component not in prefixes:
+            return
+        if _HASHED_NAME.search(filename):
+            self.set_header("Cache-Control", IMMUTABLE)
+        elif filename == ENTRY_NAME:
+            self.set_header("Cache-Control", REVALIDATE)
+
+    set_extra_headers.awsgame_immutable = prefixes
+    ComponentRequestHandler.set_extra_headers = set_extra_headers
+
+
+def component_url(component, filename):
+    """URL relativa de um arquivo numa das SERVED_DIRS.
+
+    declare_component() prefixa o nome com o módulo de quem chama — este aqui.
+    A URL é relativa ao próprio jogo, servido em component/<nome>/: sobe um
+    nível e entra na pasta pedida. Assim vale com qualquer baseUrlPath.
+    """
+    return f"../{__name__}.{component}/{filename}"
+
+
+def asset_urls():
+    """{chave: URL relativa} de cada asset, ou None para os que não existem."""
+    return {
+        key: (component_url("static", name) if name else None)
+        for key, name in publish_assets().items()
+    }
+
+
+def register_assets():
+    """Registra as SERVED_DIRS no servidor do Streamlit e devolve os componentes.
+
+    Cada pasta é servida como um componente declarado, o único jeito de o
+    Streamlit servir arquivos que funciona igual no Streamlit Cloud — o
+    enableStaticServing não é confiável lá e manda MP3 como text/plain. Para
+    servir, declarar já basta: "static" nunca é renderizado, "game" é o jogo.
+    Precisa rodar dentro de uma execução do script, senão o Streamlit ignora.
+    """
+    import streamlit.components.v1 as components
+
+    publish_assets()
+    declared = {}
+    for name, path in SERVED_DIRS.items():
+        path.mkdir(parents=True, exist_ok=True)
+        declared[name] = components.declare_component(name, path=path)
+        _serve_immutable(declared[name].name)
+    return declared
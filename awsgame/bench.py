@@ -0,0 +1,366 @@
+"""Medições de desempenho do lado do servidor.
+
+`python -m awsgame bench` é a suíte com linha de base: mede os carregadores, o
+template, o build do bundle e o rerun completo do app.py (via AppTest), além
+do tamanho de cada delta que o script manda ao navegador — numa sessão nova e
+num rerun em que o navegador já tem os elementos cacheáveis. Compara tudo com
+bench_baseline.json e sai com código 1 se algo piorou além da tolerância.
+`--update` regrava a linha de base — faça isso só quando a mudança for
+intencional, e commite o JSON junto.
+
+`python -m awsgame bench-cache` compara o cache antigo (@st.cache_data com TTL,
+que despickla uma cópia do HTML por acerto) com o de awsgame.store, em que a
+sessão só segura o manifesto — o HTML vai por HTTP, como componente. Cada
+cenário roda num subprocesso próprio, porque o pico de RSS (ru_maxrss) só cresce
+dentro de um processo e não pode ser zerado entre cenários.
+
+Uma "sessão" aqui é uma thread fazendo reruns, como o Streamlit faz: cada rerun
+pede o dataset e o jogo, e a sessão segura o que recebeu até o próximo rerun —
+é o que acontece enquanto a mensagem ainda está na fila do websocket.
+"""
+
+import gc
+import json
+import logging
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from awsgame.assets import BASE_DIR
+
+APPROACHES = ("ttl", "store")
+DEFAULT_SESSIONS = (1, 50, 500)
+RERUNS = 5
+
+
+def _loaders(approach):
+    import streamlit as st
+
+    from awsgame import bundle, services, store
+
+    if approach == "store":
+        return store.shared_services, store.shared_bundle
+
+    # Cópia fiel do app.py antes do awsgame.store e do componente declarado — e
+    # do dataset compilado: o JSON era parseado a cada expiração do cache.
+    @st.cache_data(ttl=8 * 60 * 60, show_spinner=False)
+    def load_aws_services():
+        return services.read_nodes()
+
+    @st.cache_data(ttl=8 * 60 * 60, show_spinner=False)
+    def load_game_html():
+        return bundle.read_html(bundle.ensure_bundle())
+
+    return load_aws_services, load_game_html
+
+
+def _current_rss_kb():
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() // 1024
+
+
+def run_scenario(approach, sessions, reruns=RERUNS):
+    """Roda um cenário neste processo e devolve latências e memória."""
+    # Fora de um `streamlit run` o cache avisa que não há runtime a cada chamada.
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    load_services, load_html = _loaders(approach)
+    load_services()
+    load_html()  # aquece: o cenário mede acertos, não o primeiro build
+
+    baseline_kb = _current_rss_kb()
+    barrier = threading.Barrier(sessions)
+    latencies = [[] for _ in range(sessions)]
+
+    def session(index):
+        held = None
+        barrier.wait()
+        for _ in range(reruns):
+            start = time.perf_counter()
+            load_services()
+            held = load_html()
+            latencies[index].append((time.perf_counter() - start) * 1000)
+        barrier.wait()  # todas seguram o último HTML até o fim, juntas
+        del held
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    flat = sorted(ms for per_session in latencies for ms in per_session)
+    return {
+        "approach": approach,
+        "sessions": sessions,
+        "median_ms": statistics.median(flat),
+        "p95_ms": flat[int(len(flat) * 0.95) - 1] if len(flat) > 1 else flat[0],
+        "peak_rss_delta_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+    }
+
+
+def compare_caches(sessions=DEFAULT_SESSIONS, reruns=RERUNS):
+    results = []
+    for count in sessions:
+        for approach in APPROACHES:
+            output = subprocess.run(
+                [sys.executable, "-m", "awsgame", "bench-cache", "--worker", approach,
+                 "--sessions", str(count), "--reruns", str(reruns)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def format_results(results):
+    lines = [f"{'cache':<6} {'sessões':>7} {'mediana':>10} {'p95':>10} {'pico RSS':>10}"]
+    for r in results:
+        lines.append(
+            f"{r['approach']:<6} {r['sessions']:>7} {r['median_ms']:>8.3f}ms "
+            f"{r['p95_ms']:>8.3f}ms {max(0.0, r['peak_rss_delta_mb']):>7.1f} MB"
+        )
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------
+# Suíte com linha de base
+# --------------------------------------------------------------------------
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+APP_PATH = BASE_DIR / "app.py"
+
+# Tempo varia de máquina para máquina e com a carga do momento. Por isso cada
+# medida é o MELHOR de N rodadas — e de pelo menos MIN_SAMPLE_SECONDS, para que
+# as etapas rápidas tenham amostras de sobra —, e a linha de base é reescalada
+# por uma carga de referência medida junto (reference_ms). Só conta como
+# regressão o que piorou mais de 50% E mais de 0,2 ms; e o que piorou é medido
+# de novo (CONFIRM_ROUNDS vezes, valendo a melhor medida), porque um pico de
+# carga no meio de uma etapa de 15 ms bastava para a suíte falhar. Bytes não
+# variam — qualquer crescimento acima de 10% é mudança de verdade.
+TIME_TOLERANCE = 0.5
+TIME_FLOOR_MS = 0.2
+BYTES_TOLERANCE = 0.1
+MIN_SAMPLE_SECONDS = 0.25
+CONFIRM_ROUNDS = 2
+
+
+def _best_ms(fn, repeat):
+    # Sem o coletor de ciclos durante a medida, como no timeit: a hora em que
+    # ele roda depende do tamanho do heap (o AppTest deixa um heap grande), e a
+    # mesma carga de referência chegava a variar 35% entre o início e o fim.
+    best = float("inf")
+    deadline = time.perf_counter() + MIN_SAMPLE_SECONDS
+    runs = 0
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        while runs < repeat or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            fn()
+            best = min(best, (time.perf_counter() - start) * 1000)
+            runs += 1
+    finally:
+        if collecting:
+            gc.enable()
+    return best
+
+
+def reference_ms():
+    """Carga fixa, só de CPU, que mede quão rápida a máquina está agora."""
+    payload = [{"name": str(i), "category": "Compute", "description": "x" * 64} for i in range(2000)]
+    return _best_ms(lambda: json.loads(json.dumps(payload)), 30)
+
+
+def _call_benchmarks(tmp):
+    """{nome: (função, rodadas mínimas)} de cada etapa chamada diretamente."""
+    from awsgame import assets, bundle, dataset, game, layouts, matching, services, store
+
+    catalog = dataset.ensure_dataset()
+    game_names = [service["name"] for service in catalog]
+    official = matching.load_catalog("oficial")
+    urls = assets.asset_urls()
+    description_urls = [f"desc.{i}.json" for i in range(len(game.description_chunks(catalog)))]
+    store.shared_services()
+    store.shared_bundle()
+
+    return {
+        "read_nodes (JSON)": (services.read_nodes, 20),
+        "compile_dataset": (lambda: dataset.compile_dataset(out=Path(tmp) / "servicos.bin"), 20),
+        "load_dataset": (dataset.load_dataset, 50),
+        "load_dataset (sem descrições)": (lambda: dataset.load_dataset(descriptions=False), 200),
+        "reconcile (oficial x jogo)": (lambda: matching.reconcile(official, game_names), 20),
+        "shared_services (acerto)": (store.shared_services, 200),
+        "to_js (catálogo)": (lambda: game.to_js(catalog), 50),
+        "render_game_html": (
+            lambda: game.render_game_html(catalog, urls, description_urls, "levels.bin", "frames", "results"), 20,
+        ),
+        "build (frio)": (lambda: bundle.build(tmp), 5),
+        "build_pack": (lambda: layouts.build_pack(len(catalog)), 5),
+        "shared_bundle (acerto)": (store.shared_bundle, 200),
+    }
+
+
+def measure_calls(names=None):
+    """Melhor tempo, em ms, de cada etapa chamada diretamente (ou só das `names`)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks = _call_benchmarks(tmp)
+        return {
+            name: _best_ms(fn, repeat)
+            for name, (fn, repeat) in benchmarks.items()
+            if names is None or name in names
+        }
+
+
+def _delta_label(msg):
+    delta = msg.delta
+    kind = delta.WhichOneof("type")
+    if kind == "new_element":
+        return delta.new_element.WhichOneof("type")
+    return kind
+
+
+def measure_reruns(repeat=5):
+    """Tempo do script inteiro via AppTest e os deltas de um rerun típico.
+
+    Cada AppTest.run() é uma execução completa do app.py, como a de uma sessão
+    nova. A primeira inclui os imports e o aquecimento dos caches; as
+    seguintes são o caso comum. O AppTest não guarda cache de mensagens, então
+    os bytes de um rerun numa sessão já aberta saem das flags de cada delta:
+    o que é cacheável vai só como referência ao hash (ver awsgame.chrome).
+
+    O placar é um banco vazio e temporário: o ranking da sidebar entra nos
+    deltas, e com o placar de verdade os bytes mudariam a cada partida jogada.
+    """
+    from streamlit.runtime.forward_msg_cache import create_reference_msg
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1 import local_script_runner
+
+    from awsgame import leaderboard
+
+    captured = []
+    original = local_script_runner.parse_tree_from_messages
+
+    def capture(messages):
+        captured[:] = list(messages)
+        return original(messages)
+
+    app = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(leaderboard, "_board", leaderboard.Leaderboard(Path(tmp) / "placar.sqlite3")), \
+            mock.patch.object(local_script_runner, "parse_tree_from_messages", capture):
+        start = time.perf_counter()
+        app.run()
+        first_ms = (time.perf_counter() - start) * 1000
+        rerun_ms = _best_ms(app.run, repeat)
+
+    if app.exception:
+        raise RuntimeError(f"app.py falhou no AppTest: {app.exception[0].message}")
+
+    messages = [msg for msg in captured if msg.WhichOneof("type") == "delta"]
+    deltas = [[_delta_label(msg), msg.ByteSize()] for msg in messages]
+    cached_bytes = sum(
+        create_reference_msg(msg).ByteSize() if msg.metadata.cacheable else msg.ByteSize()
+        for msg in messages
+    )
+    timings = {"rerun (primeiro)": first_ms, "rerun (seguintes)": rerun_ms}
+    return timings, deltas, cached_bytes
+
+
+def run_suite():
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    # A referência antes e depois: vale a melhor, como nos outros tempos.
+    reference = reference_ms()
+    timings = measure_calls()
+    rerun_timings, deltas, cached_bytes = measure_reruns()
+    timings.update(rerun_timings)
+    return {
+        "reference_ms": round(min(reference, reference_ms()), 3),
+        "timings_ms": {name: round(ms, 3) for name, ms in timings.items()},
+        "deltas": deltas,
+        "delta_bytes_total": sum(size for _, size in deltas),
+        "delta_bytes_cached": cached_bytes,
+    }
+
+
+def confirm(results, baseline, rounds=CONFIRM_ROUNDS):
+    """compare(), medindo de novo os tempos que pioraram; vale a melhor medida.
+
+    A velocidade da máquina muda de um segundo para outro, então a referência
+    é medida de novo junto, e a nova medida é levada para a referência da
+    rodada original antes de comparar. O "rerun (primeiro)" fica como está: os
+    imports já foram feitos, e medir de novo não seria mais a primeira
+    execução. Atualiza `results`.
+    """
+    lines, regressions = compare(results, baseline)
+    for _ in range(rounds):
+        slow = [name for name in regressions if name in results["timings_ms"]]
+        if not slow:
+            break
+        reference = reference_ms()
+        again = measure_calls(slow)
+        if "rerun (seguintes)" in slow:
+            again["rerun (seguintes)"] = measure_reruns()[0]["rerun (seguintes)"]
+        scale = results["reference_ms"] / min(reference, reference_ms())
+        for name, ms in again.items():
+            results["timings_ms"][name] = round(min(results["timings_ms"][name], ms * scale), 3)
+        lines, regressions = compare(results, baseline)
+    return lines, regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    Path(path).write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def compare(results, baseline):
+    """Devolve (linhas do relatório, lista de regressões)."""
+    lines, regressions = [], []
+
+    def check(name, current, base, unit, tolerance, floor=0):
+        worse = base is not None and current > base * (1 + tolerance) and current - base > floor
+        status = "REGRESSÃO" if worse else "ok"
+        shown_base = "—" if base is None else f"{base:,.3f}" if unit == "ms" else f"{base:,}"
+        shown = f"{current:,.3f}" if unit == "ms" else f"{current:,}"
+        lines.append(f"{name:<34} {shown_base:>12} {shown:>12} {unit:<5} {status}")
+        if worse:
+            regressions.append(name)
+
+    base_timings = baseline.get("timings_ms", {}) if baseline else {}
+    # Máquina 30% mais lenta agora -> a base vale 30% a mais. Mais rápida, a
+    # base fica como está: a referência só mede CPU, e as etapas que gravam em
+    # disco não aceleram junto — reescalar para baixo dava falsa regressão.
+    scale = max(1.0, results["reference_ms"] / baseline["reference_ms"]) if baseline else 1.0
+    lines.append(f"{'máquina vs. linha de base':<34} {'':>12} {scale:>12.2f} x")
+    for name, ms in results["timings_ms"].items():
+        base = base_timings.get(name)
+        check(name, ms, None if base is None else base * scale, "ms", TIME_TOLERANCE, TIME_FLOOR_MS)
+
+    base_deltas = baseline.get("deltas", []) if baseline else []
+    for index, (label, size) in enumerate(results["deltas"]):
+        base = base_deltas[index] if index < len(base_deltas) else None
+        # Se o tipo do delta mudou, o layout mudou: não há base comparável.
+        base_size = base[1] if base and base[0] == label else None
+        check(f"delta {index:>2} {label}", size, base_size, "bytes", BYTES_TOLERANCE)
+
+    check(
+        "deltas (total)", results["delta_bytes_total"],
+        baseline.get("delta_bytes_total") if baseline else None, "bytes", BYTES_TOLERANCE,
+    )
+    check(
+        "deltas (rerun, navegador com cache)", results["delta_bytes_cached"],
+        baseline.get("delta_bytes_cached") if baseline else None, "bytes", BYTES_TOLERANCE,
+    )
+    header = f"{'medida':<34} {'base':>12} {'atual':>12}"
+    return [header, *lines], regressions
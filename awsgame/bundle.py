@@ -0,0 +1,167 @@
+"""Bundle do jogo pré-renderizado em disco.
+
+Montar o HTML é trabalho de template sobre dados que só mudam com um deploy.
+`python -m awsgame build` faz isso uma vez e grava:
+
+    build/game/game.<hash>.html      o HTML pronto
+    build/game/desc.<n>.<hash>.json  as descrições, um trecho de plataformas cada
+    build/game/levels.<hash>.bin     as fases pré-geradas (awsgame.layouts)
+    build/game/index.html            a entrada do componente, que aponta para o HTML
+    build/game/manifest.json         nomes, tamanhos e a impressão das entradas
+
+Não há variantes .gz/.br no disco: o ComponentRequestHandler do Streamlit só
+serve o arquivo pedido, e o tornado comprime a resposta na hora
+(compress_response). O manifesto guarda o tamanho em gzip só como medida do que
+trafega.
+
+A pasta é servida como o componente "game" (awsgame.assets): o app não lê o
+HTML, só manda ao navegador o nome dele. Se o manifesto faltar ou as entradas tiverem mudado —
+o Streamlit Cloud não roda passo de build nenhum —, ensure_bundle() refaz o
+build ali mesmo, uma vez, e os processos seguintes reaproveitam.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from awsgame import assets, categories, dataset, game, layouts, leaderboard, routes, services, telemetry
+from awsgame.assets import GAME_DIR, HASH_LENGTH, component_url, content_hash
+
+BUNDLE_DIR = GAME_DIR
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 5
+
+# Teto do HTML que todo visitante novo baixa antes de jogar. Assets,
+# descrições e fases vêm por URL; o que sobra no HTML é, em out/2026:
+#   ~63 KB  o núcleo do jogo (<script id="gameCore">, que também vai ao worker)
+#   ~18 KB  o shell: DOM, áudio, telemetria, placar e o atlas de emojis
+#    ~4 KB  CSS
+#    ~9 KB  nome e categoria de cada serviço (374)
+# ~95 KB no total (~27 KB em gzip). O teto fica ~16 KB acima disso: cabe uma
+# feature nova, não cabe alguém voltar a embutir descrições ou assets, que é o
+# que ele existe para pegar. Ao chegar perto, mova um subsistema para um
+# arquivo com hash no bundle em vez de só subir o número.
+HTML_BUDGET_BYTES = 112 * 1024
+
+# O código que gera o HTML também é entrada: mudar o template invalida o bundle.
+SOURCE_FILES = tuple(
+    Path(m.__file__)
+    for m in (assets, categories, dataset, game, layouts, leaderboard, routes, services, telemetry)
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def fingerprint(services_path=services.SERVICES_PATH):
+    """Hash de tudo que entra no HTML: dataset, código do template e URLs."""
+    digest = hashlib.sha256()
+    digest.update(Path(services_path).read_bytes())
+    for source in SOURCE_FILES:
+        digest.update(source.read_bytes())
+    digest.update(json.dumps(assets.asset_urls(), sort_keys=True).encode())
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def build(out_dir=BUNDLE_DIR, services_path=services.SERVICES_PATH):
+    """Renderiza o bundle, grava trechos, pacote de níveis, HTML, index.html e o manifesto (com o tamanho gzip medido)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    inputs = fingerprint(services_path)
+    # Dado que não passa em dataset.validate() derruba o build aqui.
+    catalog = dataset.ensure_dataset(services_path)
+
+    # Os trechos saem antes do HTML: as URLs deles, com hash, vão dentro dele.
+    descriptions = []
+    for index, chunk in enumerate(game.description_chunks(catalog)):
+        data = json.dumps(chunk, ensure_ascii=False).encode("utf-8")
+        chunk_name = f"desc.{index:03d}.{content_hash(data)}.json"
+        _write_atomic(out_dir / chunk_name, data)
+        descriptions.append(chunk_name)
+
+    pack = layouts.build_pack(len(catalog))
+    levels = f"levels.{content_hash(pack)}.bin"
+    _write_atomic(out_dir / levels, pack)
+
+    html = game.render_game_html(
+        catalog,
+        assets.asset_urls(),
+        [component_url("game", chunk_name) for chunk_name in descriptions],
+        component_url("game", levels),
+        telemetry.ENDPOINT_URL,
+        leaderboard.ENDPOINT_URL,
+    ).encode("utf-8")
+    name = f"game.{content_hash(html)}.html"
+
+    _write_atomic(out_dir / name, html)
+    # Depois do HTML: quem abrir o index.html já encontra o arquivo.
+    _write_atomic(out_dir / assets.ENTRY_NAME, game.render_entry_html(name).encode("utf-8"))
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "inputs": inputs,
+        "html": name,
+        "entry": assets.ENTRY_NAME,
+        "bytes": len(html),
+        "services": len(catalog),
+        # O nível 6 é o padrão do gzip do tornado.
+        "gzip_bytes": len(gzip.compress(html, compresslevel=6, mtime=0)),
+        "descriptions": descriptions,
+        "levels": {"file": levels, "bytes": len(pack), "count": layouts.LEVEL_POOL},
+    }
+    _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+
+    # Bundles de builds anteriores não servem mais para nada. O "*" depois de
+    # .html também pega os .gz/.br que builds antigos gravavam ao lado.
+    keep = {name, levels, *descriptions}
+    for pattern in ("game.*.html*", "desc.*.json", "levels.*.bin"):
+        for stale in out_dir.glob(pattern):
+            if stale.name not in keep:
+                stale.unlink(missing_ok=True)
+    return manifest
+
+
+def read_manifest(out_dir=BUNDLE_DIR):
+    try:
+        manifest = json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def ensure_bundle(out_dir=BUNDLE_DIR):
+    """Devolve o manifesto do bundle atual, refazendo o build se preciso."""
+    manifest = read_manifest(out_dir)
+    if (
+        manifest is None
+        or manifest["inputs"] != fingerprint()
+        or not all(
+            (Path(out_dir) / name).exists()
+            for name in (
+                manifest["html"], manifest["entry"], manifest["levels"]["file"], *manifest["descriptions"],
+            )
+        )
+    ):
+        manifest = build(out_dir)
+
+    if manifest["bytes"] > HTML_BUDGET_BYTES:
+        _LOGGER.warning(
+            "HTML do jogo com %d bytes, acima do teto de %d (HTML_BUDGET_BYTES).",
+            manifest["bytes"], HTML_BUDGET_BYTES,
+        )
+    return manifest
+
+
+def read_html(manifest, out_dir=BUNDLE_DIR):
+    """O HTML pronto, direto do disco: nenhum trabalho de template."""
+    return (Path(out_dir) / manifest["html"]).read_text(encoding="utf-8")
@@ -0,0 +1,80 @@
+"""Categorias e cores — fonte única da verdade (o Python injeta no JS)."""
+
+# Categorias oficiais AWS 2026. Os slugs vêm do aws-tetris-pro e são a chave
+# canônica no servicos.json; a tradução abaixo é só para exibir na legenda.
+#
+# A paleta é a oficial da AWS, com uma ressalva: a AWS reusa o mesmo hex em até
+# 3 categorias (Analytics/Networking/Games são todas #8C4FFF). Como aqui a cor
+# da plataforma É o sinal da categoria, as colisões foram desfeitas deslocando a
+# luminosidade — mesmo matiz, tom distinto. O hex oficial fica com a categoria
+# mais populosa de cada grupo.
+CATEGORY_COLORS = {
+    "Analytics": "#8C4FFF",
+    "App-Integration": "#F05DA5",
+    "Artificial-Intelligence": "#01A88D",
+    "Blockchain": "#EF924D",
+    "Business-Applications": "#C7131F",
+    "Cloud-Financial-Management": "#3FB523",
+    "Compute": "#ED7100",
+    "Containers": "#FF9B40",
+    "Customer-Enablement": "#5A30B5",
+    "Database": "#527FFF",
+    "Developer-Tools": "#437ABA",
+    "End-User-Computing": "#01F9D1",
+    "Front-End-Web-Mobile": "#ED3F4B",
+    "Games": "#5700FC",
+    "General-Icons": "#232F3E",
+    "Internet-of-Things": "#1B660F",
+    "Management-Governance": "#E7157B",
+    "Media-Services": "#D86613",
+    "Migration-Modernization": "#2EAD19",
+    "Networking-Content-Delivery": "#B68FFF",
+    "Quantum-Technologies": "#9B4A00",
+    "Satellite": "#1A3C6E",
+    "Security-Identity-Compliance": "#DD344C",
+    "Storage": "#277116",
+    # A plataforma-chão. Não confundir com a plataforma FINAL, que também era
+    # dourada, mas é pintada por outro caminho (Platform.style, isFinal).
+    "Start": "#000000",
+}
+
+CATEGORY_LABELS = {
+    "Analytics": "Análise",
+    "App-Integration": "Integração de Aplicações",
+    "Artificial-Intelligence": "Inteligência Artificial",
+    "Blockchain": "Blockchain",
+    "Business-Applications": "Aplicações Empresariais",
+    "Cloud-Financial-Management": "Gestão Financeira na Nuvem",
+    "Compute": "Computação",
+    "Containers": "Contêineres",
+    "Customer-Enablement": "Capacitação do Cliente",
+    "Database": "Banco de Dados",
+    "Developer-Tools": "Ferramentas de Desenvolvedor",
+    "End-User-Computing": "Computação do Usuário Final",
+    "Front-End-Web-Mobile": "Front-End Web e Mobile",
+    "Games": "Jogos",
+    "General-Icons": "Geral",
+    "Internet-of-Things": "Internet das Coisas",
+    "Management-Governance": "Gerenciamento e Governança",
+    "Media-Services": "Serviços de Mídia",
+    "Migration-Modernization": "Migração e Modernização",
+    "Networking-Content-Delivery": "Redes e Entrega de Conteúdo",
+    "Quantum-Technologies": "Tecnologias Quânticas",
+    "Satellite": "Satélite",
+    "Security-Identity-Compliance": "Segurança, Identidade e Conformidade",
+    "Storage": "Armazenamento",
+}
+
+FALLBACK_COLOR = "#666666"
+
+
+def _darken(hex_color, amount=50):
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return "#%02X%02X%02X" % (max(0, r - amount), max(0, g - amount), max(0, b - amount))
+
+
+# Bordas pré-calculadas: o JS não precisa mais parsear hex a cada quadro.
+CATEGORY_STYLES = {
+    name: {"color": color, "border": _darken(color)}
+    for name, color in CATEGORY_COLORS.items()
+}
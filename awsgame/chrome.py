@@ -0,0 +1,214 @@
+"""As partes fixas da página: CSS, injetor de tema, cabeçalho, rodapé e legenda.
+
+Cada execução do script mandava tudo isso de novo ao navegador — o bloco de
+CSS, a meta de tema, o iframe do injetor e 25 st.markdown na sidebar, um por
+categoria —, embora nada mude durante a vida do processo. Agora cada parte é
+montada uma vez (as constantes, no import; a legenda, que sai do dataset, em
+awsgame.store) e vai num elemento só.
+
+Um elemento que o navegador já tem não volta pelo fio: o Streamlit manda só o
+hash dele, se o elemento passar de global.minCachedMessageSize. O padrão é
+10 KB, grande demais para estes blocos; o .streamlit/config.toml baixa para
+MIN_CACHED_MESSAGE_BYTES. Um st.fragment não ajudaria: ele só poupa os reruns
+disparados por widgets dentro dele, e o app não tem widget nenhum — todo rerun
+é completo, e o corpo de cada fragment roda junto.
+"""
+
+from collections import Counter
+from html import escape
+
+from awsgame.categories import CATEGORY_COLORS, CATEGORY_LABELS, FALLBACK_COLOR
+
+# Tem de bater com o .streamlit/config.toml. Um bloco daqui abaixo disso volta
+# a ir inteiro a cada rerun — o "deltas (rerun, navegador com cache)" do bench
+# acusa.
+MIN_CACHED_MESSAGE_BYTES = 1024
+
+# O azul-marinho do próprio jogo: é o tom médio do degradê do canvas e do card.
+NAVY = "#003366"
+SCROLL_TRACK = "#E6EAF0"
+
+# Mesma técnica do app-live: mantém o <header> no DOM porque é dentro do
+# stToolbar que o Streamlit renderiza a seta de expandir a sidebar
+# (stExpandSidebarButton). Esconder o header inteiro trava a sidebar fechada.
+#
+# O <meta theme-color> via st.markdown NÃO funciona sozinho: o Streamlit
+# renderiza o markdown dentro de um contêiner, e o navegador só lê essa meta no
+# <head> do documento de topo. Por isso o THEME_INJECTOR roda num iframe e
+# escreve no parent/top document. A meta aqui é só um reforço para o caso simples.
+#
+# A meta vem depois do </style>: o bloco <style> do markdown só termina no
+# </style>, mas um que começasse pela meta terminaria na primeira linha em
+# branco do CSS, e o resto viraria texto.
+PAGE_STYLE = """
+<style>
+    header[data-testid="stHeader"] {
+        background: transparent !important;
+        box-shadow: none !important;
+    }
+    [data-testid="stToolbarActions"],
+    [data-testid="stAppDeployButton"],
+    [data-testid="stMainMenu"],
+    [data-testid="stStatusWidget"],
+    [data-testid="stDecoration"],
+    #MainMenu,
+    footer { display: none !important; }
+
+    /* O padding-top padrão do bloco principal é 96px e comia a área útil acima
+       do jogo. O Streamlit renomeou esse contêiner (era stAppViewBlockContainer),
+       então miramos nos dois nomes + na classe .block-container, estável entre
+       versões. Mesma abordagem do app-live.
+
+       NÃO zerar padding/margin do h1/h4: o Streamlit reserva o espaço do bloco
+       via flex-basis fixado no mount, e encolher os headings faz o conteúdo
+       transbordar o container — o jogo sobe por cima do subtítulo. */
+    [data-testid="stMainBlockContainer"],
+    [data-testid="stAppViewBlockContainer"],
+    .block-container {
+        padding-top: 1rem !important;
+        padding-bottom: 0 !important;
+    }
+    div[data-testid="stVerticalBlock"] { gap: 0 !important; }
+    .element-container { margin-top: 0 !important; margin-bottom: 0 !important; }
+
+    /* Aproxima o subtítulo do título: são 24px de vão (padding-bottom do h1 +
+       padding-top do h4). O padding-BOTTOM do h4 fica intacto de propósito —
+       ele é o colchão que impede o jogo de encostar no texto. */
+    .stMarkdown h1 { padding-bottom: 0 !important; }
+    .stMarkdown h4 { padding-top: 0 !important; }
+
+    /* O injetor de tema roda num components.html de altura 0. Sem isto, esse
+       iframe invisível ainda reserva espaço e abre um vão no topo da página. */
+    iframe[height="0"] { display: none !important; margin: 0 !important; padding: 0 !important; }
+    .element-container:has(iframe[height="0"]) {
+        margin: 0 !important;
+        padding: 0 !important;
+        min-height: 0 !important;
+    }
+
+    /* Ranking da sidebar (awsgame.leaderboard). O HTML dele muda a cada
+       partida; o estilo fica aqui, no bloco que o navegador já tem. */
+    .aws-ranking { margin-top: 20px; }
+    .aws-ranking h4 { color: #333; font-size: 16px; }
+    .aws-ranking p { font-size: 12px; color: #444; margin: 0 0 4px; }
+</style>
+""" + f'<meta name="theme-color" content="{NAVY}">'
+
+# Barra de status (mobile) e barra de rolagem — mesma técnica do AryRoot.
+# Vai num components.html de altura 0.
+THEME_INJECTOR = f"""
+<script>
+(function() {{
+    const doc = window.parent.document;
+
+    // theme-color em TODOS os níveis: o iframe, o pai e o topo. Qual deles o
+    // navegador móvel lê depende de como a página está embutida.
+    function aplicarThemeColor(d) {{
+        try {{
+            d.querySelectorAll('meta[name="theme-color"]').forEach(el => el.remove());
+            const meta = d.createElement('meta');
+            meta.name = 'theme-color';
+            meta.content = '{NAVY}';
+            d.head.insertBefore(meta, d.head.firstChild);
+        }} catch (e) {{}}
+    }}
+    [document, doc].forEach(aplicarThemeColor);
+    try {{
+        const topDoc = window.top.document;
+        if (topDoc !== doc && topDoc !== document) aplicarThemeColor(topDoc);
+    }} catch (e) {{}}
+
+    // Barra de rolagem: as duas sintaxes cobrem todos os navegadores —
+    // ::-webkit-scrollbar (Chrome, Edge, Safari, Android) e scrollbar-color /
+    // scrollbar-width (Firefox, padrão CSS). Desktop e móvel.
+    if (!doc.getElementById('aws-game-scrollbar')) {{
+        const style = doc.createElement('style');
+        style.id = 'aws-game-scrollbar';
+        style.textContent = `
+            * {{
+                scrollbar-color: {NAVY} {SCROLL_TRACK} !important;
+                scrollbar-width: thin !important;
+            }}
+            *::-webkit-scrollbar {{ width: 9px !important; height: 9px !important; }}
+            *::-webkit-scrollbar-thumb {{
+                background-color: {NAVY} !important;
+                border-radius: 5px !important;
+            }}
+            *::-webkit-scrollbar-thumb:hover {{ background-color: #004488 !important; }}
+            *::-webkit-scrollbar-track {{
+                background: {SCROLL_TRACK} !important;
+                border-radius: 5px !important;
+            }}
+        `;
+        doc.head.appendChild(style);
+    }}
+}})();
+</script>
+"""
+
+HEADER = """
+<div style="text-align: center;">
+    <h1>☁️ AWS Game 🎮</h1>
+    <h4>S3 Climbing Adventure</h4>
+</div>
+"""
+
+FOOTER = """
+<div style="text-align: center;">
+    🧠 Memorize os serviços AWS enquanto escala com o S3!<br>
+    Por <strong>Ary Ribeiro</strong> — <a href="https://linkedin.com/in/aryribeiro" target="_blank">linkedin.com/in/aryribeiro</a>
+</div>
+"""
+
+# A legenda era um st.markdown por categoria, cada um com o estilo inteiro
+# inline. Num bloco só, o estilo vai uma vez, em classes.
+LEGEND_STYLE = """<style>
+    .aws-legend-item {
+        display: flex;
+        align-items: center;
+        background: rgba(255,255,255,0.9);
+        padding: 6px 10px;
+        border-radius: 20px;
+        border: 2px solid;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        margin-bottom: 8px;
+    }
+    .aws-legend-dot {
+        width: 16px;
+        height: 16px;
+        border-radius: 50%;
+        margin-right: 8px;
+        border: 1px solid rgba(0,0,0,0.2);
+        flex-shrink: 0;
+    }
+    .aws-legend-label { font-size: 11px; font-weight: 600; color: #333; text-align: left; }
+    .aws-legend-count { margin-left: auto; font-size: 10px; color: #888; }
+</style>"""
+
+
+def legend_html(services):
+    """A legenda da sidebar inteira, num bloco: total e uma linha por categoria.
+
+    Sai dos dados, não de uma lista paralela que envelhece sozinha. Sem linhas
+    em branco: no markdown, uma linha em branco encerra o bloco de HTML.
+    """
+    counts = Counter(service["category"] for service in services)
+    lines = [
+        LEGEND_STYLE,
+        '<div style="text-align: center; margin-bottom: 20px;">',
+        '<h3 style="color: #333; font-size: 18px;">🎨 Categorias & Cores</h3>',
+        '<p style="font-size: 12px; color: #666; margin-bottom: 15px;">',
+        f"📊 Total: {len(services)} serviços AWS",
+        "</p>",
+        "</div>",
+    ]
+    for category, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+        color = CATEGORY_COLORS.get(category, FALLBACK_COLOR)
+        label = escape(CATEGORY_LABELS.get(category, category))
+        lines.append(
+            f'<div class="aws-legend-item" style="border-color: {color};">'
+            f'<div class="aws-legend-dot" style="background: {color};"></div>'
+            f'<span class="aws-legend-label">{label}</span>'
+            f'<span class="aws-legend-count">{count}</span></div>'
+        )
+    return "\n".join(lines)
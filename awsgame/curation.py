@@ -0,0 +1,190 @@
+"""As etapas da curadoria, para o executor de awsgame.pipeline.
+
+A curadoria edita duas fontes: curadoria/merged_wip.json (nome, categoria e
+descrição de cada serviço, pela chave normalizada de awsgame.matching) e
+curadoria/ordem.json (as chaves na ordem da escalada). O servicos.json, que o
+jogo lê, passou a ser saída: `python -m awsgame curate` o regera e refaz os
+relatórios que dependem do que mudou.
+
+    JSON de curadoria/            -> build/curadoria/curadoria.sqlite3
+    banco                         -> servicos.json, 3_, 5_, 7_, 9_
+    servicos.json + comandos.json -> build/curadoria/cruzamento.json
+    cruzamento.json               -> 1_, 2_, 4_
+
+O banco (awsgame.curation_db) responde às perguntas de junção — em ambos,
+falta descrição, falta fonte — por consultas indexadas. O cruzamento fica com
+o que o banco não faz: os quase casamentos por trigramas, que também tiram
+nomes do "só no tetris". Ele só guarda nomes e categorias: trocar uma
+descrição refaz o servicos.json e o cruzamento, mas o cruzamento sai igual e
+os relatórios que só leem dele ficam como estão.
+
+Os relatórios saem em build/curadoria/, no formato dos de curadoria/, que são
+o retrato de quando a lista do jogo foi montada: 6_ e 8_ têm julgamento
+escrito à mão, e 10_ e 11_ saíram de listas que não estão no repositório.
+"""
+
+import json
+from contextlib import closing
+from pathlib import Path
+
+from awsgame import categories, curation_db, dataset, matching, services
+from awsgame.assets import BUILD_DIR
+from awsgame.pipeline import Stage
+
+CURATION_DIR = matching.CURATION_DIR
+COMMANDS_PATH = CURATION_DIR / "comandos.json"
+DB_PATH = curation_db.DB_PATH
+
+# O código de que cada etapa depende, além do módulo da própria função: quem lê
+# o banco depende das consultas; o servicos.json, do dump e da validação.
+DB_CODE = (Path(curation_db.__file__),)
+SERVICES_CODE = DB_CODE + (Path(services.__file__), Path(dataset.__file__))
+CROSSING_CODE = (Path(matching.__file__), Path(services.__file__))
+REMOVAL_CODE = (Path(categories.__file__),)
+
+REPORT_DIR = BUILD_DIR / "curadoria"
+CROSSING_PATH = REPORT_DIR / "cruzamento.json"
+
+
+def _read(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _text(lines):
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _title(text):
+    return [text, "=" * len(text), ""]
+
+
+def _query(query, *args):
+    with closing(curation_db.connect()) as db:
+        return query(db, *args)
+
+
+def build_services():
+    """O servicos.json exportado do banco. DatasetError deixa o arquivo como estava."""
+    with closing(curation_db.connect()) as db:
+        return {services.SERVICES_PATH: curation_db.export_services(db)}
+
+
+def build_crossing():
+    """Tetris (comandos.json) x jogo, só com nomes e categorias."""
+    game = {node["name"]: node["category"] for node in services.read_nodes()}
+    tetris = [item["comando"] for item in _read(COMMANDS_PATH)]
+    result = matching.reconcile(tetris, list(game))
+    crossing = {
+        "both": [[name, match] for name, match in result["both"]],
+        "near": [[name, match, round(score, 3)] for name, match, score in result["near"]],
+        "only_tetris": result["only_left"],
+        "only_game": [[name, game[name]] for name in result["only_right"]],
+    }
+    return {CROSSING_PATH: json.dumps(crossing, indent=1, ensure_ascii=False).encode("utf-8")}
+
+
+def _crossing():
+    return _read(CROSSING_PATH)
+
+
+def _tetris_descriptions():
+    return {item["comando"]: item["descricao"] for item in _read(COMMANDS_PATH)}
+
+
+def report_add():
+    names = _crossing()["only_tetris"]
+    descriptions = _tetris_descriptions()
+    lines = _title(f"NOVOS — so no tetris, faltam no game ({len(names)})")
+    for name in names:
+        lines += [name, f"    {descriptions[name][:150]}...", ""]
+    return {REPORT_DIR / "1_adicionar_do_tetris.txt": _text(lines)}
+
+
+def report_removal():
+    entries = _crossing()["only_game"]
+    lines = _title(f"SO NO GAME — candidatos a remocao ({len(entries)})")
+    for name, category in sorted(entries, key=lambda entry: entry[0].lower()):
+        label = categories.CATEGORY_LABELS.get(category, category)
+        lines.append(f"[revisar       ] {name}  |  {label}")
+    return {REPORT_DIR / "2_revisar_remocao.txt": _text(lines)}
+
+
+def report_both():
+    pairs = _query(curation_db.in_both, "tetris")
+    lines = _title(f"EM AMBOS — trocar descricao curta pela rica do tetris ({len(pairs)})")
+    for name, match, text, description in pairs:
+        lines += [
+            f"{match}  ->  {name}",
+            f"    game  : {description[:90]}",
+            f"    tetris: {text[:90]} ...",
+            "",
+        ]
+    return {REPORT_DIR / "3_em_ambos.txt": _text(lines)}
+
+
+def report_near():
+    near = _crossing()["near"]
+    lines = _title(f"QUASE-CASAMENTOS — conferir se sao o mesmo servico ({len(near)})")
+    for name, match, _ in near:
+        lines.append(f"tetris: {name:<45} ~~ game: {match}")
+    return {REPORT_DIR / "4_quase_casamentos.txt": _text(lines)}
+
+
+def report_uncategorized():
+    entries = _query(curation_db.missing_category)
+    lines = [f"{len(entries)} servicos ainda precisam de categoria", ""]
+    for name, description in entries:
+        lines += [name, f"    {description[:150]}", ""]
+    return {REPORT_DIR / "5_sem_categoria.txt": _text(lines)}
+
+
+def report_missing_description():
+    grouped = {}
+    for name, category, description in _query(curation_db.missing_description):
+        grouped.setdefault(category, []).append((name, description))
+    lines = []
+    for category, entries in sorted(grouped.items(), key=lambda item: -len(item[1])):
+        lines.append(f"--- {category} ({len(entries)}) ---")
+        lines += [f"  {name:<42} | {description[:58]}" for name, description in entries]
+        lines.append("")
+    lines.append(f"TOTAL: {sum(map(len, grouped.values()))}")
+    return {REPORT_DIR / "7_faltam_descricao.txt": _text(lines)}
+
+
+def report_missing_source():
+    entries = _query(curation_db.missing_source)
+    lines = [f"AINDA SEM FONTE OFICIAL ({len(entries)})", ""]
+    for name, category, description in entries:
+        lines += [f"  {name:<42} [{category}]", f"       atual: {description[:70]}"]
+    return {REPORT_DIR / "9_sem_fonte_final.txt": _text(lines)}
+
+
+STAGES = (
+    Stage(
+        "banco", tuple(CURATION_DIR / name for name in curation_db.SOURCE_FILES),
+        (DB_PATH,), curation_db.build_database, curation_db.CODE_FILES,
+    ),
+    Stage("servicos", (DB_PATH,), (services.SERVICES_PATH,), build_services, SERVICES_CODE),
+    Stage(
+        "cruzamento", (services.SERVICES_PATH, COMMANDS_PATH), (CROSSING_PATH,), build_crossing, CROSSING_CODE,
+    ),
+    Stage(
+        "1_adicionar_do_tetris", (CROSSING_PATH, COMMANDS_PATH),
+        (REPORT_DIR / "1_adicionar_do_tetris.txt",), report_add,
+    ),
+    Stage(
+        "2_revisar_remocao", (CROSSING_PATH,),
+        (REPORT_DIR / "2_revisar_remocao.txt",), report_removal, REMOVAL_CODE,
+    ),
+    Stage("3_em_ambos", (DB_PATH,), (REPORT_DIR / "3_em_ambos.txt",), report_both, DB_CODE),
+    Stage("4_quase_casamentos", (CROSSING_PATH,), (REPORT_DIR / "4_quase_casamentos.txt",), report_near),
+    Stage("5_sem_categoria", (DB_PATH,), (REPORT_DIR / "5_sem_categoria.txt",), report_uncategorized, DB_CODE),
+    Stage(
+        "7_faltam_descricao", (DB_PATH,),
+        (REPORT_DIR / "7_faltam_descricao.txt",), report_missing_description, DB_CODE,
+    ),
+    Stage(
+        "9_sem_fonte_final", (DB_PATH,),
+        (REPORT_DIR / "9_sem_fonte_final.txt",), report_missing_source, DB_CODE,
+    ),
+)
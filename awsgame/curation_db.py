@@ -0,0 +1,273 @@
+"""Banco SQLite da curadoria: serviços, fontes, apelidos e procedência.
+
+Os JSON de curadoria/ guardam registros que se sobrepõem, cada um com a sua
+grafia do nome: "Key Management Service" no tetris (comandos.json), "AWS Key
+Management Service (AWS KMS)" no catálogo oficial, "kms key management service
+kms" como chave do merged_wip.json. Cada passada da curadoria relia os cinco e
+cruzava tudo em memória. Aqui os importadores resolvem cada registro para a
+chave do serviço uma vez só, e as perguntas da curadoria viram consultas
+indexadas:
+
+    services    um por chave do merged_wip, com a posição na escalada
+    aliases     (tipo, apelido) -> chave: as chaves e a sigla de
+                matching.aliases() e os nomes do oficial_coletado.json
+    sources     um por registro de catálogo, com a chave resolvida ou NULL
+    provenance  de onde veio cada campo de cada serviço (origem e fonte)
+
+"em ambos" é um JOIN pelo índice (catalog, key) de sources; "só no catálogo",
+key IS NULL no mesmo índice; "falta descrição" e "falta fonte" leem índices
+parciais que só têm as linhas que faltam.
+
+Os JSON continuam sendo a fonte versionada — o diff de um .sqlite3 não se lê
+no review. O banco é saída da etapa "banco" do `python -m awsgame curate`
+(build/curadoria/curadoria.sqlite3), e o servicos.json sai dele por
+export_services().
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from awsgame import dataset, matching, services
+from awsgame.assets import BUILD_DIR
+
+CURATION_DIR = matching.CURATION_DIR
+DB_PATH = BUILD_DIR / "curadoria" / "curadoria.sqlite3"
+
+SCHEMA = """
+CREATE TABLE services (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    rich INTEGER NOT NULL,
+    position INTEGER
+);
+CREATE INDEX services_position ON services (position);
+CREATE INDEX services_poor ON services (category) WHERE rich = 0;
+CREATE INDEX services_uncategorized ON services (key) WHERE category = '';
+
+CREATE TABLE aliases (
+    kind TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    key TEXT NOT NULL REFERENCES services (key),
+    PRIMARY KEY (kind, alias)
+) WITHOUT ROWID;
+CREATE INDEX aliases_key ON aliases (key);
+
+CREATE TABLE sources (
+    id INTEGER PRIMARY KEY,
+    catalog TEXT NOT NULL,
+    name TEXT NOT NULL,
+    key TEXT REFERENCES services (key),
+    category TEXT,
+    text TEXT,
+    url TEXT,
+    error TEXT
+);
+CREATE INDEX sources_catalog_key ON sources (catalog, key);
+CREATE INDEX sources_key ON sources (key) WHERE key IS NOT NULL;
+
+CREATE TABLE provenance (
+    key TEXT NOT NULL REFERENCES services (key),
+    field TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    source TEXT,
+    PRIMARY KEY (key, field)
+) WITHOUT ROWID;
+CREATE INDEX provenance_unsourced ON provenance (field, key) WHERE source IS NULL;
+"""
+
+# Catálogo -> (arquivo, campo do nome). O tetris e o oficial só têm o nome: a
+# chave sai de resolve(). O coletado e o docs já vêm com a chave do merged_wip.
+CATALOG_FILES = {
+    "tetris": ("comandos.json", "comando"),
+    "oficial": ("aws_catalogo_oficial.json", "name"),
+    "coletado": ("oficial_coletado.json", "name_oficial"),
+    "docs": ("oficial_docs.json", "key"),
+}
+SOURCE_FILES = ("merged_wip.json", "ordem.json") + tuple(name for name, _ in CATALOG_FILES.values())
+
+# Código de que a etapa "banco" depende, além da própria função.
+CODE_FILES = (Path(__file__), Path(matching.__file__))
+
+# Campos de services que têm procedência registrada.
+FIELDS = ("name", "category", "description")
+
+
+def connect(path=DB_PATH):
+    """Abre um banco já importado. FileNotFoundError se ele não existe."""
+    if not path.exists():
+        raise FileNotFoundError(f"{path} não existe: rode `python -m awsgame curate`")
+    return sqlite3.connect(path)
+
+
+def _read(directory, name):
+    return json.loads((directory / name).read_text(encoding="utf-8"))
+
+
+def import_services(db, directory=CURATION_DIR):
+    """merged_wip.json e ordem.json -> services, aliases e provenance."""
+    merged, order = _read(directory, "merged_wip.json"), _read(directory, "ordem.json")
+    db.executemany(
+        "INSERT INTO services (key, name, category, description, rich) VALUES (?, ?, ?, ?, ?)",
+        ((key, entry["name"], entry["cat"], entry["desc"], entry["rica"]) for key, entry in merged.items()),
+    )
+    db.executemany(
+        "UPDATE services SET position = ? WHERE key = ?",
+        ((position, key) for position, key in enumerate(order) if key in merged),
+    )
+    # O fonte vale para a descrição: nome e categoria vêm da origem do registro.
+    db.executemany(
+        "INSERT INTO provenance (key, field, origin, source) VALUES (?, ?, ?, ?)",
+        (
+            (key, field, entry["origem"], entry.get("fonte") if field == "description" else None)
+            for key, entry in merged.items() for field in FIELDS
+        ),
+    )
+    # Na ordem da escalada e o primeiro leva, como o TrigramIndex do jogo.
+    rows = db.execute("SELECT key, name FROM services ORDER BY position IS NULL, position, rowid").fetchall()
+    for key, name in rows:
+        keys, acronym = matching.aliases(name)
+        db.executemany("INSERT OR IGNORE INTO aliases VALUES ('key', ?, ?)", ((alias, key) for alias in keys))
+        if acronym:
+            db.execute("INSERT OR IGNORE INTO aliases VALUES ('acronym', ?, ?)", (acronym, key))
+
+
+def resolve(db, name):
+    """A chave do serviço com esse nome, pela mesma regra de TrigramIndex.exact(), ou None."""
+    keys, acronym = matching.aliases(name)
+    lookups = [("key", key) for key in keys] + [("acronym", key) for key in keys]
+    if acronym:
+        lookups.append(("key", acronym))
+    for kind, alias in lookups:
+        row = db.execute("SELECT key FROM aliases WHERE kind = ? AND alias = ?", (kind, alias)).fetchone()
+        if row:
+            return row[0]
+    return None
+
+
+def _known(db, key):
+    return db.execute("SELECT 1 FROM services WHERE key = ?", (key,)).fetchone() is not None
+
+
+def import_catalog(db, catalog, directory=CURATION_DIR):
+    """Um arquivo de CATALOG_FILES -> sources, com a chave de cada registro resolvida."""
+    filename, name_field = CATALOG_FILES[catalog]
+    rows = []
+    for item in _read(directory, filename):
+        name = item[name_field]
+        key = item.get("key")
+        key = key if key is not None and _known(db, key) else resolve(db, name)
+        if catalog == "coletado" and key:
+            # O nome oficial também é um jeito de chamar o serviço.
+            for alias in matching.aliases(name)[0]:
+                db.execute("INSERT OR IGNORE INTO aliases VALUES ('key', ?, ?)", (alias, key))
+        error = item.get("erro")
+        rows.append((
+            catalog, name, key,
+            item.get("category") or item.get("cat_oficial"),
+            item.get("descricao") or item.get("summary") or item.get("texto"),
+            item.get("url"),
+            None if error in (None, "None") else error,
+        ))
+    db.executemany(
+        "INSERT INTO sources (catalog, name, key, category, text, url, error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def build_database():
+    """A etapa "banco" do curate: os JSON importados, como bytes do arquivo SQLite."""
+    return {DB_PATH: import_all().serialize()}
+
+
+def import_all(directory=CURATION_DIR):
+    """Um banco em memória com todos os JSON da curadoria importados."""
+    db = sqlite3.connect(":memory:")
+    db.executescript(SCHEMA)
+    with db:
+        import_services(db, directory)
+        for catalog in CATALOG_FILES:
+            import_catalog(db, catalog, directory)
+    db.execute("ANALYZE")
+    return db
+
+
+def in_both(db, catalog):
+    """[(nome no catálogo, nome no jogo, texto do catálogo, descrição do jogo)] dos
+    registros que casam com um serviço, na ordem da escalada.
+    """
+    return db.execute(
+        "SELECT src.name, s.name, src.text, s.description"
+        " FROM sources src JOIN services s ON s.key = src.key"
+        " WHERE src.catalog = ? ORDER BY s.position IS NULL, s.position",
+        (catalog,),
+    ).fetchall()
+
+
+def only_in_catalog(db, catalog):
+    """Nomes do catálogo que não casam com nenhum serviço."""
+    rows = db.execute(
+        "SELECT name FROM sources WHERE catalog = ? AND key IS NULL ORDER BY id", (catalog,),
+    )
+    return [name for name, in rows]
+
+
+def only_in_game(db, catalog):
+    """[(nome, categoria)] dos serviços que o catálogo não tem, na ordem da escalada."""
+    return db.execute(
+        "SELECT name, category FROM services s WHERE NOT EXISTS"
+        " (SELECT 1 FROM sources WHERE catalog = ? AND key = s.key)"
+        " ORDER BY position IS NULL, position",
+        (catalog,),
+    ).fetchall()
+
+
+def missing_description(db):
+    """[(nome, categoria, descrição)] dos serviços ainda sem a descrição rica."""
+    return db.execute(
+        "SELECT name, category, description FROM services WHERE rich = 0 ORDER BY category, name"
+    ).fetchall()
+
+
+def missing_category(db):
+    return db.execute(
+        "SELECT name, description FROM services WHERE category = '' ORDER BY name"
+    ).fetchall()
+
+
+def missing_source(db):
+    """[(nome, categoria, descrição)] dos serviços cuja descrição não tem fonte oficial."""
+    return db.execute(
+        "SELECT s.name, s.category, s.description FROM provenance p JOIN services s ON s.key = p.key"
+        " WHERE p.field = 'description' AND p.source IS NULL ORDER BY s.name COLLATE NOCASE"
+    ).fetchall()
+
+
+def export_services(db):
+    """O servicos.json: os serviços na ordem da escalada, os novos no fim.
+
+    DatasetError se o resultado não passar em dataset.validate().
+    """
+    catalog = [
+        {"name": name, "category": category, "description": description}
+        for name, category, description in db.execute(
+            "SELECT name, category, description FROM services"
+            " ORDER BY position IS NULL, position, rowid"
+        )
+    ]
+    dataset.validate([{field: value.strip() for field, value in entry.items()} for entry in catalog])
+    return services.dump_nodes(catalog)
+
+
+QUERIES = {
+    "both": in_both,
+    "only-catalog": only_in_catalog,
+    "only-game": only_in_game,
+    "missing-description": missing_description,
+    "missing-category": missing_category,
+    "missing-source": missing_source,
+}
+# As consultas que recebem o catálogo.
+CATALOG_QUERIES = ("both", "only-catalog", "only-game")
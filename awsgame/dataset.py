@@ -0,0 +1,240 @@
+"""O dataset compilado: servicos.json validado e gravado em binário.
+
+O app parseava os ~194 KB do servicos.json a cada processo, limpava campo por
+campo e descartava repetidos em silêncio. Uma categoria fora de
+CATEGORY_COLORS só aparecia na tela, como plataforma cinza (FALLBACK_COLOR).
+Agora o JSON é a fonte e o app lê um artefato compilado:
+`python -m awsgame dataset` (e o build do bundle) valida nomes, categorias e
+tamanho das descrições e grava build/dataset/servicos.bin. Dado ruim derruba o
+build com a lista de problemas; não chega ao navegador.
+
+Formato (little-endian, como o pacote de fases de awsgame.layouts):
+
+    cabeçalho     4s magia b"AWSD", u16 versão, u16 categorias, u32 serviços,
+                  u32 strings, u32 bytes das strings, u32 bytes das descrições,
+                  16s impressão das entradas
+    offsets       u32[strings + 1]     início de cada string, em caracteres
+    desc_offsets  u32[serviços + 1]    início de cada descrição, em caracteres
+    categories    u32[categorias]      string de cada categoria
+    names         u32[serviços]        string do nome
+    category      u8[serviços]         índice em categories
+    strings       UTF-8, nomes e categorias, cada um uma vez só
+    descrições    UTF-8, na ordem da escalada
+
+Os offsets contam caracteres, não bytes: o loader decodifica cada bloco de
+uma vez e fatia a str, sem decodificar string por string. A tabela de strings
+é internada — cada categoria vira um único objeto str, compartilhado por todos
+os serviços dela.
+
+As descrições ficam num bloco à parte porque o app não as usa: elas vão ao
+navegador em trechos do bundle (game.description_chunks). São ~90% do texto, e
+decodificar e fatiar esse bloco custa mais que todo o resto da carga; com
+descriptions=False ele nem é lido.
+"""
+
+import hashlib
+import struct
+from array import array
+from pathlib import Path
+from sys import byteorder
+
+from awsgame import categories, services
+from awsgame.assets import BUILD_DIR
+
+MAGIC = b"AWSD"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII16s")
+
+DATASET_DIR = BUILD_DIR / "dataset"
+DATASET_PATH = DATASET_DIR / "servicos.bin"
+
+# O nome é quebrado em até 3 linhas dentro da plataforma (Platform.draw) e
+# ganha "..." se passar disso. Acima de 48 caracteres ele não cabe nem na mais
+# larga; hoje o mais longo tem 41.
+NAME_MAX_CHARS = 48
+# O card tem altura fixa (game.CARD_HEIGHT), medida para a descrição mais
+# longa do dataset, com 560 caracteres. Mais que isso é cortado na tela.
+DESCRIPTION_MAX_CHARS = 560
+# Menos que uma frase é sinal de descrição faltando ou truncada na curadoria.
+DESCRIPTION_MIN_CHARS = 80
+
+# Fora da paleta: a plataforma-chão é pintada à parte.
+RESERVED_CATEGORIES = ("Start",)
+
+SOURCE_FILES = tuple(Path(m.__file__) for m in (categories, services)) + (Path(__file__),)
+
+
+class DatasetError(ValueError):
+    """Dataset que não passa na validação. `problems` lista cada um."""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__(f"{len(self.problems)} problema(s) no dataset:\n" + "\n".join(self.problems))
+
+
+def fingerprint(source=services.SERVICES_PATH):
+    """Hash do JSON e do código que o valida e compila."""
+    digest = hashlib.sha256(Path(source).read_bytes())
+    for path in SOURCE_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16].encode("ascii")
+
+
+def validate(entries):
+    """Devolve o catálogo na ordem da escalada ou levanta DatasetError."""
+    problems, seen = [], {}
+    allowed = set(categories.CATEGORY_COLORS) - set(RESERVED_CATEGORIES)
+    if not entries:
+        problems.append("nenhum serviço em 'nodes'")
+    for number, entry in enumerate(entries, 1):
+        name = entry["name"]
+        where = f"#{number} {name!r}"
+        if not name:
+            problems.append(f"#{number}: sem nome")
+        elif len(name) > NAME_MAX_CHARS:
+            problems.append(f"{where}: nome com {len(name)} caracteres (máximo {NAME_MAX_CHARS})")
+        if name in seen:
+            problems.append(f"{where}: nome repetido (já é o #{seen[name]})")
+        seen.setdefault(name, number)
+
+        category = entry["category"]
+        if not category:
+            problems.append(f"{where}: sem categoria")
+        elif category not in allowed:
+            problems.append(f"{where}: categoria {category!r} fora de CATEGORY_COLORS")
+
+        size = len(entry["description"])
+        if not DESCRIPTION_MIN_CHARS <= size <= DESCRIPTION_MAX_CHARS:
+            problems.append(
+                f"{where}: descrição com {size} caracteres "
+                f"(esperado de {DESCRIPTION_MIN_CHARS} a {DESCRIPTION_MAX_CHARS})"
+            )
+    if problems:
+        raise DatasetError(problems)
+    return entries
+
+
+def _u32(values):
+    values = array("I", values)
+    if byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode_dataset(catalog, inputs=b"\0" * 16):
+    """Empacota um catálogo já validado no formato descrito no topo do módulo."""
+    strings, index = [], {}
+
+    def intern(text):
+        if text not in index:
+            index[text] = len(strings)
+            strings.append(text)
+        return index[text]
+
+    category_names = list(dict.fromkeys(service["category"] for service in catalog))
+    category_ids = [intern(name) for name in category_names]
+    category_index = {name: i for i, name in enumerate(category_names)}
+    names = [intern(service["name"]) for service in catalog]
+    descriptions = [service["description"] for service in catalog]
+
+    text = "".join(strings).encode("utf-8")
+    description_text = "".join(descriptions).encode("utf-8")
+    return b"".join((
+        HEADER.pack(
+            MAGIC, VERSION, len(category_names), len(catalog), len(strings),
+            len(text), len(description_text), inputs,
+        ),
+        _u32(_offsets(strings)),
+        _u32(_offsets(descriptions)),
+        _u32(category_ids),
+        _u32(names),
+        bytes(category_index[service["category"]] for service in catalog),
+        text,
+        description_text,
+    ))
+
+
+def _offsets(strings):
+    offsets = [0]
+    for text in strings:
+        offsets.append(offsets[-1] + len(text))
+    return offsets
+
+
+def _slices(text, offsets):
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def decode_dataset(data, descriptions=True):
+    """O inverso de encode_dataset(): (impressão, lista de {name, description, category}).
+
+    Com descriptions=False, os serviços saem só com name e category.
+    """
+    (magic, version, category_count, count, string_count,
+     text_bytes, description_bytes, inputs) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("dataset compilado em formato desconhecido")
+
+    view, offset = memoryview(data), HEADER.size
+
+    def take(code, length):
+        nonlocal offset
+        values = array(code)
+        values.frombytes(view[offset:offset + values.itemsize * length])
+        if byteorder != "little" and values.itemsize > 1:
+            values.byteswap()
+        offset += values.itemsize * length
+        return values
+
+    offsets = take("I", string_count + 1)
+    description_offsets = take("I", count + 1)
+    category_ids = take("I", category_count)
+    names = take("I", count)
+    category = take("B", count)
+
+    strings = _slices(str(view[offset:offset + text_bytes], "utf-8"), offsets)
+    category_names = [strings[i] for i in category_ids]
+    catalog = [{"name": strings[n], "category": category_names[c]} for n, c in zip(names, category)]
+    if descriptions:
+        offset += text_bytes
+        texts = _slices(str(view[offset:offset + description_bytes], "utf-8"), description_offsets)
+        for service, text in zip(catalog, texts):
+            service["description"] = text
+    return inputs, catalog
+
+
+def compile_dataset(source=services.SERVICES_PATH, out=DATASET_PATH):
+    """Valida o JSON e grava o artefato. Devolve o catálogo.
+
+    DatasetError se o dado não passar; FileNotFoundError e
+    json.JSONDecodeError sobem como em services.read_nodes().
+    """
+    catalog = validate(services.read_nodes(source))
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(encode_dataset(catalog, fingerprint(source)))
+    tmp.replace(out)
+    return catalog
+
+
+def load_dataset(path=DATASET_PATH, descriptions=True):
+    """O catálogo do artefato, sem conferir se está em dia com o JSON."""
+    return decode_dataset(Path(path).read_bytes(), descriptions)[1]
+
+
+def ensure_dataset(source=services.SERVICES_PATH, out=DATASET_PATH, descriptions=True):
+    """O catálogo do artefato em dia, recompilando se o JSON ou o código mudou.
+
+    O Streamlit Cloud não roda passo de build: lá a primeira execução compila
+    e as seguintes só leem, como em bundle.ensure_bundle().
+    """
+    try:
+        inputs, catalog = decode_dataset(Path(out).read_bytes(), descriptions)
+    except (FileNotFoundError, ValueError, struct.error):
+        inputs, catalog = None, None
+    if inputs != fingerprint(source):
+        catalog = compile_dataset(source, out)
+        if not descriptions:
+            catalog = [{"name": s["name"], "category": s["category"]} for s in catalog]
+    return catalog
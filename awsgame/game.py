@@ -0,0 +1,2177 @@
+"""O jogo em si: um único HTML com CSS e JS, montado a partir dos dados."""
+
+import json
+
+from awsgame.categories import CATEGORY_STYLES, FALLBACK_COLOR
+
+# Altura do card de descrição. É fixa de propósito: se acompanhasse o tamanho do
+# texto, o layout pularia a cada plataforma. O valor foi medido para caber a mais
+# longa das 374 descrições (VPC, 560 caracteres) — ver o teste em curadoria/.
+GAME_WIDTH = 700
+GAME_HEIGHT = 650
+CARD_HEIGHT = 200
+CARD_GAP = 12
+
+# Altura do iframe que hospeda o jogo: canvas + vão + card + bordas.
+FRAME_HEIGHT = GAME_HEIGHT + CARD_GAP + CARD_HEIGHT + 14
+
+# As descrições não vão no HTML: só o card precisa delas, e só a da plataforma
+# em que o jogador está. Saem em trechos de tantas plataformas, buscados à
+# frente da câmera. 16 plataformas dão ~8 KB por trecho e ~1 trecho a cada
+# meio minuto de escalada.
+DESCRIPTION_CHUNK = 16
+
+# Física (por tick de 1/60 s) e geração da fase. Ficam aqui, e não soltas no
+# JS, porque o analisador de alcançabilidade (awsgame.levels) precisa
+# exatamente dos mesmos números que o jogo usa.
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 50
+PLAYER_SPEED = 6
+JUMP_POWER = 25
+GRAVITY = 0.8
+FRICTION = 0.85
+PLATFORM_SPACING = 220
+PLATFORM_HEIGHT = 30
+PLATFORM_MIN_WIDTH = 200
+PLATFORM_WIDTH_SPREAD = 80
+MOVING_EVERY = 35        # a cada tantas plataformas, uma móvel...
+BREAKABLE_EVERY = 25     # ...senão, a cada tantas, uma quebrável
+MOVING_RANGE = 90
+MOVING_SPEED = 1.2
+BREAK_TICKS = 90         # 1,5 s entre pisar e a quebrável sumir
+
+# Pontos de cada coisa que a partida conta, e pixels por metro de altura. O
+# placar (awsgame.leaderboard) recusa o resultado que a plataforma alcançada
+# não explica, então os dois lados leem daqui.
+POINTS_PLATFORM = 75
+POINTS_BREAKABLE = 150
+POINTS_ENEMY = 250
+POINTS_COIN = 100
+POINTS_LIFE = 500
+POINTS_SCORE = 1000
+POINTS_POWER = 300
+PIXELS_PER_METER = 15
+
+# O que pode aparecer sobre uma plataforma. As fases (awsgame.layouts) guardam
+# só o índice nestas listas.
+ENEMY_EMOJIS = ("🔥", "🦑", "🦨", "🐀", "🐓", "🦆", "🐖", "💩")
+POWER_UP_TYPES = ("life", "score", "power")
+
+# Passo fixo: num quadro atrasado, a física recupera até tantos ticks; o resto
+# do atraso é descartado (e o jogo fica mais lento). awsgame.telemetry conta
+# quantas vezes isso acontece nos aparelhos dos jogadores.
+MAX_TICKS_PER_FRAME = 5
+
+# Tempos de quadro: limites superiores (ms) dos baldes do histograma de
+# update() e draw() — o último balde é "acima de 33 ms", dois quadros a 60 Hz.
+# O jogo manda um resumo a cada tantos segundos de jogo.
+DURATION_BINS_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33)
+FRAME_STATS_FLUSH_SECONDS = 30
+
+
+def to_js(value):
+    """json.dumps seguro para injetar dentro de <script>."""
+    return json.dumps(value, ensure_ascii=True).replace("</", "<\\/")
+
+
+def description_chunks(services):
+    """As descrições em ordem de plataforma, DESCRIPTION_CHUNK por trecho."""
+    return [
+        [service["description"] for service in services[start:start + DESCRIPTION_CHUNK]]
+        for start in range(0, len(services), DESCRIPTION_CHUNK)
+    ]
+
+
+def render_game_html(services, assets, description_urls, levels_url, frames_url, results_url):
+    """Monta o HTML do jogo.
+
+    `assets` é o {chave: URL} de awsgame.assets: o mascote e os áudios entram
+    só como URL, os bytes são servidos à parte. Das descrições também só vão as
+    URLs, uma por trecho de description_chunks(), e das fases, a URL do pacote
+    binário de awsgame.layouts. `frames_url` é para onde o jogo manda os
+    resumos de tempo de quadro (awsgame.telemetry), e `results_url`, o
+    resultado de cada partida (awsgame.leaderboard). Cada serviço vira nome +
+    índice de categoria. Não há cache aqui — quem chama é o build do bundle
+    (awsgame.bundle), que grava o resultado em disco.
+    """
+    # Categorias na ordem em que aparecem; a que estiver fora da paleta vai como
+    # null e cai no FALLBACK_STYLE do lado do JS.
+    categories = list(dict.fromkeys(service["category"] for service in services))
+    category_index = {name: i for i, name in enumerate(categories)}
+    names = [service["name"] for service in services]
+    service_categories = [category_index[service["category"]] for service in services]
+    styles = [CATEGORY_STYLES.get(name) for name in categories]
+    start_style = CATEGORY_STYLES["Start"]
+    fallback_color = FALLBACK_COLOR
+    assets = dict(assets)
+    mascot = assets.pop("mascote")
+    audio = assets
+    return f'''
+<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>S3 Climbing Adventure</title>
+    <style>
+        * {{ box-sizing: border-box; }}
+        body {{
+            margin: 0;
+            padding: 0;
+            background: transparent;
+            font-family: 'Arial', sans-serif;
+            overflow: hidden;
+        }}
+        #gameContainer {{
+            position: relative;
+            width: 700px;
+            height: 650px;
+            max-width: 100%;
+            margin: 0 auto;
+            border: 3px solid #2E8B57;
+            border-radius: 10px;
+            overflow: hidden;
+        }}
+        canvas {{
+            display: block;
+            background: transparent;
+            outline: none;
+            max-width: 100%;
+        }}
+        /* Camadas de desenho (ver "Camadas", no script): céu atrás, HUD na
+           frente. Acompanham a escala do canvas do jogo em telas estreitas. */
+        .layer {{
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            pointer-events: none;
+        }}
+        #skyCanvas {{ z-index: 0; }}
+        #gameCanvas {{ position: relative; z-index: 1; }}
+        #hudCanvas {{ z-index: 2; }}
+        #ui {{
+            position: absolute;
+            top: 12px;
+            left: 10px;
+            color: white;
+            font-weight: bold;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.8);
+            z-index: 100;
+            font-size: 18px;
+            pointer-events: none;
+        }}
+        #gameOver, #gameWin, #startOverlay {{
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            background: rgba(0,0,0,0.9);
+            color: white;
+            padding: 30px;
+            border-radius: 15px;
+            text-align: center;
+            z-index: 200;
+            border: 3px solid #FFD700;
+        }}
+        #gameOver, #gameWin {{ display: none; }}
+        .rank {{ font-size: 14px; opacity: .85; }}
+        #startOverlay p {{ font-size: 14px; color: #CFCFCF; }}
+        button {{
+            background: #228B22;
+            color: white;
+            border: none;
+            padding: 10px 20px;
+            border-radius: 5px;
+            cursor: pointer;
+            font-size: 16px;
+            margin-top: 10px;
+        }}
+        button:hover {{ background: #32CD32; }}
+        button:disabled {{ background: #555; cursor: wait; }}
+
+        /* Card da descrição do serviço da plataforma atual. Altura FIXA: se ele
+           crescesse conforme o texto, o layout pularia a cada plataforma. */
+        #serviceCard {{
+            width: 700px;
+            max-width: 100%;
+            height: {CARD_HEIGHT}px;
+            margin: {CARD_GAP}px auto 0;
+            padding: 14px 22px;
+            /* Mesmas cores do degradê do canvas (#001122 -> #003366 -> #004488),
+               para o card ler como continuação do jogo. Não vai até o #87CEEB do
+               fundo da tela — sobre aquele azul claro o texto branco cairia para
+               2,5:1 de contraste. Nesta faixa fica em ~10:1. */
+            background: linear-gradient(180deg, #001122 0%, #003366 45%, #004488 100%);
+            border: 3px solid #2E8B57;
+            border-radius: 14px;
+            box-shadow: 0 4px 14px rgba(0,0,0,0.25);
+            overflow: hidden;
+            /* Centraliza nos dois eixos. A altura é fixa para caber a maior
+               descrição (VPC, 560 chars); as curtas sobrariam espaço embaixo e a
+               caixa pareceria cortada. Centralizada, a sobra fica simétrica. */
+            display: flex;
+            flex-direction: column;
+            justify-content: center;
+            align-items: center;
+        }}
+        #cardDescription {{
+            color: #FFFFFF;
+            font-size: 15px;
+            line-height: 1.55;
+            text-align: center;
+            margin: 0;
+        }}
+    </style>
+</head>
+<body>
+    <div id="gameContainer">
+        <canvas id="skyCanvas" class="layer" width="{GAME_WIDTH}" height="{GAME_HEIGHT}"></canvas>
+        <canvas id="gameCanvas" width="{GAME_WIDTH}" height="{GAME_HEIGHT}" tabindex="0"></canvas>
+        <canvas id="hudCanvas" class="layer" width="{GAME_WIDTH}" height="{GAME_HEIGHT}"></canvas>
+
+        <div id="ui">
+            <div>Pontos: <span id="score">0</span></div>
+            <div>Vidas: <span id="lives">5</span></div>
+            <div>Altura: <span id="height">0</span>m</div>
+            <div>Fase: <span id="level">—</span></div>
+        </div>
+
+        <div id="startOverlay">
+            <h2>☁️ S3 Climbing Adventure</h2>
+            <p>← → mover &nbsp;•&nbsp; ↑ ou espaço para pular</p>
+            <button id="startBtn" disabled>Carregando fases…</button>
+            <button id="dailyBtn" disabled>📅 Escalada do dia</button>
+        </div>
+
+        <div id="gameOver">
+            <h2>💀 Game Over!</h2>
+            <p>Você parou no: <span id="finalService">Início</span></p>
+            <p>Altura alcançada: <span id="finalHeight">0</span>m</p>
+            <p>Pontuação Final: <span id="finalScore">0</span></p>
+            <p class="rank" id="finalRank"></p>
+            <button onclick="restartGame()">🔄 Jogar Novamente</button>
+        </div>
+
+        <div id="gameWin">
+            <h2>🏆 PARABÉNS!</h2>
+            <p>Você escalou os {len(services)} serviços AWS!</p>
+            <p>Pontuação Final: <span id="winScore">0</span></p>
+            <p class="rank" id="winRank"></p>
+            <button onclick="restartGame()">🔄 Jogar Novamente</button>
+        </div>
+    </div>
+
+    <div id="serviceCard">
+        <p id="cardDescription">Comece sua aventura pelos serviços AWS! A cada plataforma que você pisar, a descrição do serviço correspondente aparece aqui.</p>
+    </div>
+
+    <script id="gameCore">
+        // --- Núcleo ------------------------------------------------------------
+        // Simulação e desenho, sem DOM: o que este script precisa de fora chega
+        // por `core` e sai por `host` (ver o script de baixo). Por isso ele
+        // roda igual nesta thread ou, no modo worker, dentro de um Web Worker.
+
+        // Só o que a camada de plataformas usa: nome e categoria. As descrições
+        // chegam sob demanda (ver "Descrições sob demanda", mais abaixo).
+        const FALLBACK_STYLE = {{ color: {to_js(fallback_color)}, border: '#444444' }};
+        const START_STYLE = {to_js(start_style)};
+        const CATEGORY_STYLES = {to_js(styles)}.map(style => style || FALLBACK_STYLE);
+        const serviceCategories = {to_js(service_categories)};
+        const awsServices = {to_js(names)}.map((name, i) => ({{
+            id: i + 1,
+            name,
+            categoryIndex: serviceCategories[i]
+        }}));
+        // URLs com hash de conteúdo (ou null, se o arquivo não existe).
+        const audioSources = {to_js(audio)};
+        const mascotUrl = {to_js(mascot)};
+
+        const TOTAL_SERVICES = awsServices.length;
+        const START_NAME = 'Início da Escalada AWS';
+        const PLATFORM_SPACING = {PLATFORM_SPACING};
+        const PLATFORM_HEIGHT = {PLATFORM_HEIGHT};
+        const GROUND_HEIGHT = 60;
+        const WORLD_HEIGHT = TOTAL_SERVICES * PLATFORM_SPACING;
+        const GROUND_TOP = WORLD_HEIGHT - GROUND_HEIGHT;
+
+        // --- Passo fixo -----------------------------------------------------
+        // A física conta TICKS, nunca quadros. requestAnimationFrame dispara na
+        // taxa do monitor (60/120/144Hz), então amarrar a física a ele fazia o
+        // jogo acelerar junto com o refresh rate. 1 tick == 1 quadro dos 60fps
+        // originais, o que mantém todas as constantes de ajuste válidas.
+        const TICK_MS = 1000 / 60;
+        const MAX_FRAME_MS = 250;   // teto após aba em segundo plano
+        const MAX_TICKS_PER_FRAME = {MAX_TICKS_PER_FRAME};
+        let accumulator = 0;
+        let lastFrameTime = null;
+
+        // --- Camadas --------------------------------------------------------
+        // Três canvases empilhados: céu, mundo e HUD. O céu não muda e é
+        // pintado uma vez; o HUD, só quando muda (os dois ficam no shell, no
+        // script de baixo). O mundo é este `canvas`, limpo e redesenhado a cada
+        // quadro só com o que está na câmera. Ele chega por core.init(): o
+        // elemento mesmo ou, no modo worker, um OffscreenCanvas transferido.
+        // Antes, todo quadro criava um gradiente e pintava os 700x650 do céu.
+        let canvas = null;
+        let ctx = null;
+
+        // HTMLImageElement aqui, ImageBitmap no worker: só chega já carregado.
+        let mascotImage = null;
+
+        function newGameState() {{
+            return {{
+                score: 0,
+                lives: 5,
+                currentPlatform: 0,
+                started: false,
+                gameRunning: true,
+                keys: {{}},
+                cameraY: 0
+            }};
+        }}
+        let gameState = newGameState();
+
+        class Player {{
+            constructor(x, y) {{
+                this.x = x;
+                this.y = y;
+                this.width = {PLAYER_WIDTH};
+                this.height = {PLAYER_HEIGHT};
+                this.velocityX = 0;
+                this.velocityY = 0;
+                this.speed = {PLAYER_SPEED};
+                this.jumpPower = {JUMP_POWER};
+                this.onGround = false;
+                this.standingOn = null;
+                this.direction = 1;
+                this.invulnerable = false;
+                this.invulnerabilityTimer = 0;
+                this.maxFallDistance = 700;
+                this.lastGroundY = y;
+            }}
+
+            update() {{
+                if (gameState.keys['ArrowLeft']) {{
+                    this.velocityX = -this.speed;
+                    this.direction = -1;
+                }}
+                if (gameState.keys['ArrowRight']) {{
+                    this.velocityX = this.speed;
+                    this.direction = 1;
+                }}
+                if (gameState.keys['ArrowUp'] || gameState.keys[' ']) this.jump();
+
+                this.velocityY += {GRAVITY};
+                this.x += this.velocityX;
+                this.y += this.velocityY;
+                this.velocityX *= {FRICTION};
+
+                if (this.x < -this.width) this.x = canvas.width;
+                if (this.x > canvas.width) this.x = -this.width;
+
+                // Consome o estado de "no chão": checkPlatformCollisions() o
+                // restaura ainda neste tick se ainda houver plataforma embaixo.
+                // Sem isso, andar para fora da borda dava um pulo grátis no ar.
+                this.onGround = false;
+                this.standingOn = null;
+
+                if (this.y > this.lastGroundY + this.maxFallDistance) {{
+                    this.takeDamage();
+                }}
+
+                if (this.invulnerable && --this.invulnerabilityTimer <= 0) {{
+                    this.invulnerable = false;
+                }}
+
+                centerCameraOnPlayer();
+            }}
+
+            draw() {{
+                const blink = this.invulnerable && Math.floor(this.invulnerabilityTimer / 10) % 2;
+
+                if (spritesEnabled && mascotImage) {{
+                    // Já no tamanho e na direção certos: um blit do atlas.
+                    if (blink) ctx.globalAlpha = 0.5;
+                    blit(atlasCells[mascotCells + (this.direction === -1 ? 1 : 0)], this.x, this.y - gameState.cameraY);
+                    if (blink) ctx.globalAlpha = 1;
+                    return;
+                }}
+
+                ctx.save();
+                ctx.translate(0, -gameState.cameraY);
+                if (blink) ctx.globalAlpha = 0.5;
+
+                if (mascotImage) {{
+                    ctx.save();
+                    if (this.direction === -1) {{
+                        ctx.scale(-1, 1);
+                        ctx.drawImage(mascotImage, -(this.x + this.width), this.y, this.width, this.height);
+                    }} else {{
+                        ctx.drawImage(mascotImage, this.x, this.y, this.width, this.height);
+                    }}
+                    ctx.restore();
+                }} else {{
+                    ctx.fillStyle = '#228B22';
+                    ctx.fillRect(this.x, this.y, this.width, this.height);
+                    ctx.fillStyle = 'white';
+                    ctx.fillRect(this.x + 8, this.y + 10, 6, 6);
+                    ctx.fillRect(this.x + 26, this.y + 10, 6, 6);
+                    ctx.fillStyle = 'black';
+                    ctx.fillRect(this.x + 10, this.y + 12, 2, 2);
+                    ctx.fillRect(this.x + 28, this.y + 12, 2, 2);
+                    ctx.fillRect(this.x + 18, this.y + 20, 4, 2);
+                }}
+
+                ctx.restore();
+            }}
+
+            takeDamage() {{
+                if (this.invulnerable) return;
+
+                gameState.lives--;
+                this.invulnerable = true;
+                this.invulnerabilityTimer = 180;
+
+                if (gameState.lives <= 0) {{
+                    gameOver();
+                }} else {{
+                    this.respawn();
+                }}
+            }}
+
+            respawn() {{
+                // A mais alta já alcançada que ainda existe (a quebrável some).
+                let target = null;
+                for (let n = Math.min(gameState.currentPlatform, rowCount - 1); n >= 0; n--) {{
+                    if (!platforms[n].gone) {{
+                        target = platforms[n];
+                        break;
+                    }}
+                }}
+
+                if (target) {{
+                    this.x = target.x + target.width / 2 - this.width / 2;
+                    this.y = target.y - this.height;
+                    this.lastGroundY = target.y;
+                }} else {{
+                    this.x = 150;
+                    this.y = GROUND_TOP - this.height;
+                    this.lastGroundY = GROUND_TOP;
+                }}
+
+                this.velocityX = 0;
+                this.velocityY = 0;
+                this.onGround = true;
+                this.standingOn = null;
+            }}
+
+            jump() {{
+                if (!this.onGround) return;
+                this.velocityY = -this.jumpPower;
+                this.onGround = false;
+                host.sound('pulo');
+            }}
+
+            setOnGround(platform) {{
+                this.onGround = true;
+                this.standingOn = platform;
+                this.lastGroundY = platform.y;
+            }}
+
+            heightInMeters() {{
+                return Math.max(0, Math.floor((GROUND_TOP - (this.y + this.height)) / {PIXELS_PER_METER}));
+            }}
+        }}
+
+        class Platform {{
+            // Uma por número, criada uma vez por página. O que muda de uma
+            // fase para outra (x, largura, tipo) entra por reset().
+            constructor(number) {{
+                this.number = number;
+                this.y = number === 0 ? GROUND_TOP : WORLD_HEIGHT - number * PLATFORM_SPACING;
+                this.height = number === 0 ? GROUND_HEIGHT : PLATFORM_HEIGHT;
+
+                const service = number === 0 ? null : awsServices[number - 1];
+                this.serviceName = number === 0 ? START_NAME : service.name;
+                this.categoryStyle = number === 0 ? START_STYLE : CATEGORY_STYLES[service.categoryIndex];
+
+                this.isFinal = number === TOTAL_SERVICES;
+
+                // Todos os campos nascem aqui, mesmo os que só as 'moving' usam:
+                // criar campos depois deoptimiza a classe na V8.
+                this.x = 0;
+                this.width = canvas.width;
+                this.type = 'normal';
+                this.breaking = false;
+                this.breakTimer = 0;
+                this.gone = false;
+                this.startX = 0;
+                this.range = {MOVING_RANGE};
+                this.velocityX = 0;
+                this.minX = 0;
+                this.maxX = 0;
+            }}
+
+            reset(x, width, type) {{
+                platformSprites.delete(this.number);
+                this.x = x;
+                this.width = width;
+                this.type = type;
+                this.breaking = false;
+                this.breakTimer = 0;
+                this.gone = false;
+                this.startX = x;
+                this.velocityX = this.number % 2 === 0 ? {MOVING_SPEED} : -{MOVING_SPEED};
+                this.minX = Math.max(0, x - this.range);
+                this.maxX = Math.min(canvas.width - width, x + this.range);
+            }}
+
+            update() {{
+                if (this.type !== 'moving' || this.minX >= this.maxX) return;
+
+                const previousX = this.x;
+                this.x += this.velocityX;
+
+                if (this.x <= this.minX) {{
+                    this.x = this.minX;
+                    this.velocityX = Math.abs(this.velocityX);
+                }} else if (this.x >= this.maxX) {{
+                    this.x = this.maxX;
+                    this.velocityX = -Math.abs(this.velocityX);
+                }}
+
+                // Carrega o jogador junto, senão ela desliza debaixo dos pés dele.
+                if (player.standingOn === this) {{
+                    player.x += this.x - previousX;
+                }}
+            }}
+
+            style() {{
+                if (this.isFinal) return {{ color: '#FFD700', border: '#CC9A00' }};
+                if (this.breaking) return {{ color: '#8B4513', border: '#5D2E0A' }};
+                if (this.type === 'breakable') return {{ color: '#8B4513', border: '#5D2E0A' }};
+                if (this.type === 'moving') return {{ color: '#4169E1', border: '#2E4BC7' }};
+                return this.categoryStyle;
+            }}
+
+            // Desenha a plataforma em `c`, nas coordenadas do mundo. Só roda
+            // quando o sprite dela não está no cache (ver platformSprite()).
+            paint(c) {{
+                const {{ color, border }} = this.style();
+
+                c.fillStyle = 'rgba(0,0,0,0.3)';
+                c.fillRect(this.x + 3, this.y + 3, this.width, this.height);
+
+                c.fillStyle = border;
+                c.fillRect(this.x - 2, this.y - 2, this.width + 4, this.height + 4);
+
+                c.fillStyle = color;
+                c.fillRect(this.x, this.y, this.width, this.height);
+
+                c.fillStyle = this.isFinal ? '#FFFF00' : 'rgba(255,255,255,0.4)';
+                c.fillRect(this.x, this.y, this.width, 4);
+
+                c.fillStyle = 'white';
+                c.font = 'bold 14px Arial';
+                c.textAlign = 'center';
+                c.strokeStyle = 'black';
+                c.lineWidth = 2;
+
+                const maxWidth = this.width - 15;
+                const words = this.serviceName.split(' ');
+                let line = '';
+                let lines = [];
+
+                for (let n = 0; n < words.length; n++) {{
+                    const testLine = line + words[n] + ' ';
+                    if (c.measureText(testLine).width > maxWidth && n > 0) {{
+                        lines.push(line.trim());
+                        line = words[n] + ' ';
+                    }} else {{
+                        line = testLine;
+                    }}
+                }}
+                lines.push(line.trim());
+
+                if (lines.length > 3) {{
+                    lines = lines.slice(0, 3);
+                    lines[2] += '...';
+                }}
+
+                const lineHeight = 13;
+                const startY = this.y + (this.height / 2) - ((lines.length - 1) * lineHeight / 2);
+                for (let i = 0; i < lines.length; i++) {{
+                    const yPos = startY + (i * lineHeight);
+                    c.strokeText(lines[i], this.x + this.width / 2, yPos);
+                    c.fillText(lines[i], this.x + this.width / 2, yPos);
+                }}
+
+                // O número fica no canto superior, discreto. Antes era desenhado na
+                // MESMA linha de base do nome e no meio da margem esquerda: o nome
+                // ficava centralizado de fato (52px x 53px de folga), mas o olho lia
+                // o vão entre o número e o texto como margem, e a composição parecia
+                // deslocada. Recuando o número, o nome lê como o que é — centralizado.
+                c.save();
+                c.globalAlpha = 0.7;
+                c.font = 'bold 9px Arial';
+                c.fillStyle = '#FFE680';
+                c.textAlign = 'left';
+                c.fillText(this.number.toString(), this.x + 4, this.y + 10);
+                c.restore();
+
+                if (this.isFinal) {{
+                    c.fillStyle = '#FF0000';
+                    c.font = 'bold 14px Arial';
+                    c.textAlign = 'center';
+                    c.strokeStyle = 'white';
+                    c.lineWidth = 2;
+                    c.strokeText('FINAL!', this.x + this.width / 2, this.y - 15);
+                    c.fillText('FINAL!', this.x + this.width / 2, this.y - 15);
+                }}
+            }}
+
+            draw() {{
+                if (!spritesEnabled) {{
+                    ctx.save();
+                    ctx.translate(0, -gameState.cameraY);
+                    this.paint(ctx);
+                    ctx.restore();
+                    return;
+                }}
+                // x inteiro: a móvel anda em frações de px, e um drawImage fora
+                // da grade borra o texto.
+                const sprite = platformSprite(this);
+                ctx.drawImage(
+                    sprite,
+                    Math.round(this.x) - SPRITE_LEFT,
+                    Math.round(this.y - gameState.cameraY) - (this.isFinal ? SPRITE_FINAL_TOP : SPRITE_TOP)
+                );
+            }}
+        }}
+
+        // --- Sprites das plataformas ------------------------------------------
+        // Nome quebrado em linhas com measureText, sombra, borda e brilho: nada
+        // disso muda enquanto a plataforma vive, mas era refeito a cada quadro.
+        // Agora cada plataforma é pintada uma vez num canvas fora da tela e o
+        // draw() vira um drawImage. O cache é LRU do tamanho da janela da
+        // câmera com folga; o reset() de uma fase nova descarta o sprite.
+        const SPRITE_LEFT = 2;        // borda
+        const SPRITE_RIGHT = 3;       // sombra
+        const SPRITE_TOP = 2;
+        const SPRITE_BOTTOM = 3;
+        const SPRITE_FINAL_TOP = 32;  // o "FINAL!" fica acima da plataforma
+        const PLATFORM_SPRITE_CACHE = 16;
+        const platformSprites = new Map();
+        const spriteUsedAt = new Float64Array(TOTAL_SERVICES + 1);
+        let spriteClock = 0;
+        let spritesEnabled = true;   // false: pinta tudo a cada quadro, como antes
+
+        function newCanvas(width, height) {{
+            if (typeof OffscreenCanvas !== 'undefined') return new OffscreenCanvas(width, height);
+            const element = document.createElement('canvas');
+            element.width = width;
+            element.height = height;
+            return element;
+        }}
+
+        function platformSprite(platform) {{
+            let sprite = platformSprites.get(platform.number);
+            if (sprite) {{
+                // LRU por contador, não por ordem do Map: reinserir a chave a
+                // cada acerto fazia o Map realocar a tabela, lixo todo quadro.
+                spriteUsedAt[platform.number] = ++spriteClock;
+                return sprite;
+            }}
+
+            if (platformSprites.size >= PLATFORM_SPRITE_CACHE) {{
+                let oldest = -1;
+                for (const number of platformSprites.keys()) {{
+                    if (oldest < 0 || spriteUsedAt[number] < spriteUsedAt[oldest]) oldest = number;
+                }}
+                platformSprites.delete(oldest);
+            }}
+
+            const top = platform.isFinal ? SPRITE_FINAL_TOP : SPRITE_TOP;
+            sprite = newCanvas(
+                Math.ceil(platform.width) + SPRITE_LEFT + SPRITE_RIGHT,
+                platform.height + top + SPRITE_BOTTOM
+            );
+            const c = sprite.getContext('2d');
+            c.translate(SPRITE_LEFT - platform.x, top - platform.y);
+            platform.paint(c);
+
+            platformSprites.set(platform.number, sprite);
+            spriteUsedAt[platform.number] = ++spriteClock;
+            return sprite;
+        }}
+
+        let player = new Player(150, GROUND_TOP - 50);
+
+        // --- Índice espacial -------------------------------------------------
+        // As plataformas ficam em alturas fixas (WORLD_HEIGHT - n * SPACING), e
+        // inimigo, power-up e moeda nascem sempre em cima de uma delas. Então a
+        // linha n guarda a plataforma n e o que está sobre ela, e a altura de
+        // qualquer coisa diz a linha: as colisões olham só as 2-3 linhas em
+        // volta do jogador, e o custo por tick não cresce com o mundo.
+        // A quebrável que some só é marcada como `gone`.
+        const platforms = [];   // platforms[n]: a plataforma da linha n
+        let rowCount = 0;       // linhas em uso: a fase inteira, ou só o chão
+        const breakingPlatforms = [];
+
+        function rowAt(y) {{
+            return Math.round((WORLD_HEIGHT - y) / PLATFORM_SPACING);
+        }}
+
+        // Primeira e última linha que podem ter algo entre as alturas `top` e
+        // `bottom`. A margem de uma linha cobre a altura da plataforma e o que
+        // fica sobre ela (até 40px acima). Dois números, não um par [lo, hi]:
+        // isto roda várias vezes por tick, e cada array seria lixo para o GC.
+        function firstRow(bottom) {{
+            return Math.max(0, rowAt(bottom) - 1);
+        }}
+
+        function lastRow(top) {{
+            return Math.min(rowCount - 1, rowAt(top) + 1);
+        }}
+
+        // --- Atlas ---------------------------------------------------------------
+        // Emoji colorido é dos glifos mais caros de rasterizar no Canvas 2D,
+        // sobretudo no Android, e cada inimigo, power-up e moeda era um
+        // fillText por quadro; o mascote era reescalado do PNG inteiro e
+        // espelhado com scale(-1, 1). Agora tudo é pintado uma vez, no tamanho
+        // final, numa faixa fora da tela — os emoji no core.init(), o mascote
+        // (as duas direções) quando ele chega — e o quadro só faz drawImage.
+        // Cada emoji ganha uma célula de 1,5x a fonte, com a linha de base no
+        // mesmo lugar do fillText antigo, então a posição na tela não muda.
+        const GLYPH_CELL = 1.5;
+        const GLYPH_BASELINE = 1.15;
+        const COIN_EMOJIS = ['🪙', '💰'];
+        const POWER_UP_EMOJIS = {{ life: '💖', score: '⭐', power: '🍄' }};
+
+        let atlas = null;
+        const atlasCells = [];   // {{ x, w, h, baseline, text, font }}
+        // Índice da primeira célula de cada grupo (ficam prontos em buildAtlas()).
+        let enemyCells = 0;
+        let powerUpCells = 0;
+        let coinCells = 0;
+        let mascotCells = 0;
+
+        function buildAtlas() {{
+            let x = 0;
+            const group = (texts, size) => {{
+                const first = atlasCells.length;
+                for (const text of texts) {{
+                    const w = Math.ceil(size * GLYPH_CELL);
+                    atlasCells.push({{ x, w, h: w, baseline: Math.ceil(size * GLYPH_BASELINE), text, font: size + 'px Arial' }});
+                    x += w;
+                }}
+                return first;
+            }};
+            enemyCells = group(ENEMY_EMOJIS, 24);
+            powerUpCells = group(POWER_UP_TYPES.map(type => POWER_UP_EMOJIS[type]), 20);
+            coinCells = group(COIN_EMOJIS, 16);
+            mascotCells = atlasCells.length;
+            for (let i = 0; i < 2; i++) {{   // direita, esquerda
+                atlasCells.push({{ x, w: {PLAYER_WIDTH}, h: {PLAYER_HEIGHT}, baseline: 0, text: null, font: null }});
+                x += {PLAYER_WIDTH};
+            }}
+
+            atlas = newCanvas(x, Math.max(...atlasCells.map(cell => cell.h)));
+            const c = atlas.getContext('2d');
+            c.textAlign = 'center';
+            for (const cell of atlasCells) {{
+                if (!cell.text) continue;
+                c.font = cell.font;
+                c.fillText(cell.text, cell.x + cell.w / 2, cell.baseline);
+            }}
+            paintMascotCells();
+        }}
+
+        function paintMascotCells() {{
+            if (!atlas || !mascotImage) return;
+            const right = atlasCells[mascotCells];
+            const left = atlasCells[mascotCells + 1];
+            const c = atlas.getContext('2d');
+            c.clearRect(right.x, 0, right.w + left.w, atlas.height);
+            c.imageSmoothingQuality = 'high';
+            c.drawImage(mascotImage, right.x, 0, right.w, right.h);
+            c.save();
+            c.scale(-1, 1);
+            c.drawImage(mascotImage, -(left.x + left.w), 0, left.w, left.h);
+            c.restore();
+        }}
+
+        // x e y inteiros: fora da grade de pixels o drawImage borra.
+        function blit(cell, x, y) {{
+            ctx.drawImage(atlas, cell.x, 0, cell.w, cell.h, Math.round(x), Math.round(y), cell.w, cell.h);
+        }}
+
+        // Um emoji centrado em `centerX` com a linha de base em `baselineY`,
+        // como o fillText com textAlign = 'center' fazia.
+        function drawGlyph(cell, centerX, baselineY) {{
+            if (spritesEnabled) {{
+                blit(cell, centerX - cell.w / 2, baselineY - cell.baseline);
+            }} else {{
+                ctx.font = cell.font;
+                ctx.fillText(cell.text, centerX, baselineY);
+            }}
+        }}
+
+        // --- Entidades ---------------------------------------------------------
+        // Inimigos, power-ups e moedas não são objetos: cada campo é um typed
+        // array alocado uma vez por página (struct-of-arrays). O pacote de
+        // fases põe no máximo um de cada sobre cada plataforma, então a vaga
+        // é o número da linha — nascer é preencher a vaga e ligar `alive`,
+        // morrer é desligar. Nenhum splice na jogada, nenhum objeto novo no
+        // restart, e update/draw viram laços sobre números. O brilho da moeda
+        // e o balanço do power-up saem de um relógio só, `animationTicks`.
+        const ROW_SLOTS = TOTAL_SERVICES + 1;
+        const ENEMY_SIZE = 30;
+        const POWER_UP_SIZE = 25;
+        const COIN_SIZE = 20;
+
+        const enemies = {{
+            alive: new Uint8Array(ROW_SLOTS),
+            emoji: new Uint8Array(ROW_SLOTS),       // índice em ENEMY_EMOJIS
+            x: new Float32Array(ROW_SLOTS),
+            y: new Float32Array(ROW_SLOTS),
+            velocityX: new Float32Array(ROW_SLOTS),
+            startX: new Float32Array(ROW_SLOTS),
+            patrol: new Float32Array(ROW_SLOTS)
+        }};
+        const powerUps = {{
+            alive: new Uint8Array(ROW_SLOTS),
+            type: new Uint8Array(ROW_SLOTS),        // índice em POWER_UP_TYPES
+            x: new Float32Array(ROW_SLOTS),
+            y: new Float32Array(ROW_SLOTS)
+        }};
+        const coins = {{
+            alive: new Uint8Array(ROW_SLOTS),
+            x: new Float32Array(ROW_SLOTS),
+            y: new Float32Array(ROW_SLOTS)
+        }};
+        let animationTicks = 0;
+
+        // As linhas que andam sozinhas — plataformas móveis e inimigos —, listadas
+        // uma vez por fase em initLevel(). update() move todas a cada tick, longe
+        // da câmera ou não; percorrer só estas é o que mantém o tick barato.
+        const movingRows = new Uint32Array(ROW_SLOTS);
+        const enemyRows = new Uint32Array(ROW_SLOTS);
+        let movingCount = 0;
+        let enemyCount = 0;
+
+        function touchesPlayer(x, y, size) {{
+            return player.x < x + size &&
+                   player.x + player.width > x &&
+                   player.y < y + size &&
+                   player.y + player.height > y;
+        }}
+
+        function updateEnemies() {{
+            const {{ alive, x, velocityX, startX, patrol }} = enemies;
+            for (let i = 0; i < enemyCount; i++) {{
+                const n = enemyRows[i];
+                if (!alive[n]) continue;
+                x[n] += velocityX[n];
+                if (Math.abs(x[n] - startX[n]) > patrol[n]) velocityX[n] = -velocityX[n];
+            }}
+        }}
+
+        // Um tipo por vez, cada emoji um blit do atlas, e sem
+        // save/translate/restore — a câmera entra direto no y.
+        function drawEntities(lo, hi) {{
+            const cameraY = gameState.cameraY;
+            let drawn = 0;
+            ctx.textAlign = 'center';   // para o caminho sem atlas
+
+            for (let n = lo; n <= hi; n++) {{
+                if (!enemies.alive[n]) continue;
+                drawGlyph(
+                    atlasCells[enemyCells + enemies.emoji[n]],
+                    enemies.x[n] + ENEMY_SIZE / 2,
+                    enemies.y[n] - cameraY + ENEMY_SIZE - 5
+                );
+                drawn++;
+            }}
+
+            const bob = Math.sin(animationTicks * 0.1) * 5;
+            for (let n = lo; n <= hi; n++) {{
+                if (!powerUps.alive[n]) continue;
+                drawGlyph(
+                    atlasCells[powerUpCells + powerUps.type[n]],
+                    powerUps.x[n] + POWER_UP_SIZE / 2,
+                    powerUps.y[n] + bob - cameraY + POWER_UP_SIZE - 5
+                );
+                drawn++;
+            }}
+
+            const coin = atlasCells[coinCells + Math.floor(animationTicks * 0.4) % 2];
+            for (let n = lo; n <= hi; n++) {{
+                if (!coins.alive[n]) continue;
+                drawGlyph(coin, coins.x[n] + COIN_SIZE / 2, coins.y[n] - cameraY + COIN_SIZE - 2);
+                drawn++;
+            }}
+            return drawn;
+        }}
+
+        // --- Fases ------------------------------------------------------------
+        // As fases vêm prontas do build (awsgame.layouts): LEVEL_POOL sementes
+        // num só arquivo binário, lido em typed arrays sobre o mesmo buffer.
+        // Reiniciar não sorteia nada — relê os números da fase e reposiciona
+        // as mesmas Platform. A escalada do dia escolhe a fase pelo dia (UTC)
+        // que o servidor manda — ou, sem ele, pelo relógio do aparelho —, então
+        // todo mundo joga a mesma naquele dia.
+        const LEVELS_URL = {to_js(levels_url)};
+        const LEVELS_MAGIC = 'AWSL';
+        const LEVELS_VERSION = 1;
+        const LEVELS_HEADER_BYTES = 12;
+        const DAY_MS = 24 * 60 * 60 * 1000;
+        // O formato é o de awsgame.layouts. Tipo: índice = código de lá (chão,
+        // normal, quebrável, móvel, final); chão e final agem como normais.
+        const PLATFORM_TYPES = ['normal', 'normal', 'breakable', 'moving', 'normal'];
+        const ENEMY_EMOJIS = {to_js(ENEMY_EMOJIS)};
+        const ENEMY_LEFT = 0x80;
+        const POWER_UP_TYPES = {to_js(POWER_UP_TYPES)};
+        const NO_COIN = 0xFFFF;
+
+        let levelPack = null;
+        let levelIndex = 0;
+        let dailyMode = false;
+        let serverDay = null;
+
+        function decodeLevelPack(buffer) {{
+            const header = new DataView(buffer);
+            const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+            if (magic !== LEVELS_MAGIC || header.getUint16(4, true) !== LEVELS_VERSION) {{
+                throw new Error('pacote de fases em formato desconhecido');
+            }}
+            const count = header.getUint16(6, true);
+            const size = header.getUint16(8, true);
+            if (size !== TOTAL_SERVICES + 1) throw new Error('pacote de fases de outro dataset');
+
+            // Views, não cópias. Uint16Array lê na ordem do processador —
+            // little-endian em todo navegador, a mesma do arquivo.
+            const length = count * size;
+            let offset = LEVELS_HEADER_BYTES;
+            const take = (Type) => {{
+                const view = new Type(buffer, offset, length);
+                offset += view.byteLength;
+                return view;
+            }};
+            return {{
+                count,
+                size,
+                x: take(Uint16Array),
+                width: take(Uint16Array),
+                coin: take(Uint16Array),
+                type: take(Uint8Array),
+                enemy: take(Uint8Array),
+                powerUp: take(Uint8Array)
+            }};
+        }}
+
+        function dailyDay() {{
+            return serverDay === null ? Math.floor(Date.now() / DAY_MS) : serverDay;
+        }}
+
+        function dailyLevel() {{
+            return dailyDay() % levelPack.count;
+        }}
+
+        function pickLevel() {{
+            if (!levelPack) return;
+            levelIndex = dailyMode ? dailyLevel() : Math.floor(Math.random() * levelPack.count);
+            host.level(dailyMode ? 'do dia' : '#' + (levelIndex + 1));
+        }}
+
+        function initLevel() {{
+            enemies.alive.fill(0);
+            powerUps.alive.fill(0);
+            coins.alive.fill(0);
+            breakingPlatforms.length = 0;
+            movingCount = 0;
+            enemyCount = 0;
+
+            // Sem o pacote (ainda carregando), só o chão.
+            rowCount = levelPack ? levelPack.size : 1;
+            if (!levelPack) platforms[0].reset(0, canvas.width, 'normal');
+
+            const base = levelIndex * rowCount;
+            for (let n = 0; levelPack && n < rowCount; n++) {{
+                const platform = platforms[n];
+                const k = base + n;
+                const x = levelPack.x[k];
+                const width = levelPack.width[k];
+                platform.reset(x, width, PLATFORM_TYPES[levelPack.type[k]]);
+                if (platform.type === 'moving') movingRows[movingCount++] = n;
+
+                const enemy = levelPack.enemy[k];
+                if (enemy) {{
+                    enemyRows[enemyCount++] = n;
+                    // Patrulha limitada à plataforma: antes eles flutuavam no vazio.
+                    enemies.alive[n] = 1;
+                    enemies.emoji[n] = (enemy & ~ENEMY_LEFT) - 1;
+                    enemies.x[n] = enemies.startX[n] = x + width / 2 - ENEMY_SIZE / 2;
+                    enemies.y[n] = platform.y - 35;
+                    enemies.velocityX[n] = enemy & ENEMY_LEFT ? -2 : 2;
+                    enemies.patrol[n] = Math.max(10, (width - ENEMY_SIZE) / 2 - 5);
+                }}
+
+                const powerUp = levelPack.powerUp[k];
+                if (powerUp) {{
+                    powerUps.alive[n] = 1;
+                    powerUps.type[n] = powerUp - 1;
+                    powerUps.x[n] = x + width / 2;
+                    powerUps.y[n] = platform.y - 35;
+                }}
+
+                if (levelPack.coin[k] !== NO_COIN) {{
+                    coins.alive[n] = 1;
+                    coins.x[n] = levelPack.coin[k];
+                    coins.y[n] = platform.y - 30;
+                }}
+            }}
+
+            player.x = 150;
+            player.y = GROUND_TOP - player.height;
+            player.velocityX = 0;
+            player.velocityY = 0;
+            player.onGround = true;
+            player.standingOn = null;
+            player.lastGroundY = GROUND_TOP;
+
+            // A câmera só é ajustada dentro de player.update(), que não roda
+            // enquanto o jogo não começou. Sem isto, a tela de início mostrava
+            // o topo do mundo (a última plataforma) em vez do mascote no chão.
+            centerCameraOnPlayer();
+        }}
+
+        let viewTop = -1;
+
+        function centerCameraOnPlayer() {{
+            gameState.cameraY = Math.max(
+                0,
+                Math.min(player.y - canvas.height / 2, WORLD_HEIGHT - canvas.height)
+            );
+            // Plataforma no topo da tela: o shell busca as descrições em volta.
+            const top = Math.max(1, Math.min(
+                TOTAL_SERVICES,
+                Math.floor((WORLD_HEIGHT - gameState.cameraY) / PLATFORM_SPACING)
+            ));
+            if (top !== viewTop) {{
+                viewTop = top;
+                host.viewTop(top);
+            }}
+        }}
+
+        function checkCollision(a, b) {{
+            return a.x < b.x + b.width &&
+                   a.x + a.width > b.x &&
+                   a.y < b.y + b.height &&
+                   a.y + a.height > b.y;
+        }}
+
+        // A quebrável some BREAK_TICKS depois de pisada. Poucas quebram ao mesmo
+        // tempo, então a lista é pequena e o splice não pesa.
+        function tickBreakingPlatforms() {{
+            for (let i = breakingPlatforms.length - 1; i >= 0; i--) {{
+                const platform = breakingPlatforms[i];
+                if (--platform.breakTimer <= 0) {{
+                    platform.gone = true;
+                    breakingPlatforms.splice(i, 1);
+                }}
+            }}
+        }}
+
+        function checkPlatformCollisions() {{
+            const lo = firstRow(player.y + player.height);
+            for (let n = lastRow(player.y); n >= lo; n--) {{
+                const platform = platforms[n];
+                if (platform.gone) continue;
+
+                if (!checkCollision(player, platform)) continue;
+                if (player.velocityY <= 0 || player.y >= platform.y) continue;
+
+                player.y = platform.y - player.height;
+                player.velocityY = 0;
+                player.setOnGround(platform);
+
+                // O card segue a plataforma em que o jogador está PISANDO — não a
+                // mais alta já alcançada. Descer para uma plataforma anterior traz
+                // a descrição dela de volta.
+                showService(platform);
+
+                if (platform.number > gameState.currentPlatform) {{
+                    gameState.currentPlatform = platform.number;
+                    gameState.score += {POINTS_PLATFORM};
+
+                    if (platform.isFinal) {{
+                        gameWin();
+                        return;
+                    }}
+                }}
+
+                if (platform.type === 'breakable' && !platform.breaking) {{
+                    platform.breaking = true;
+                    platform.breakTimer = {BREAK_TICKS};   // 1,5s em ticks — não setTimeout,
+                    breakingPlatforms.push(platform);      // que ignora pausa e restart.
+                    gameState.score += {POINTS_BREAKABLE};
+                }}
+            }}
+        }}
+
+        // Qual plataforma o card está exibindo. Sem isto, a colisão reescreveria
+        // o DOM a cada quadro enquanto o jogador estivesse parado em cima dela.
+        let displayedPlatform = -1;
+
+        function showService(platform) {{
+            if (!platform || platform.number === displayedPlatform) return;
+            displayedPlatform = platform.number;
+            host.card(platform.number);
+        }}
+
+        function checkEnemyCollisions() {{
+            const hi = lastRow(player.y);
+            for (let n = firstRow(player.y + player.height); n <= hi; n++) {{
+                if (!enemies.alive[n] || !touchesPlayer(enemies.x[n], enemies.y[n], ENEMY_SIZE)) continue;
+
+                if (player.velocityY > 0 && player.y < enemies.y[n]) {{
+                    enemies.alive[n] = 0;
+                    player.velocityY = -12;
+                    gameState.score += {POINTS_ENEMY};
+                }} else {{
+                    player.takeDamage();
+                }}
+            }}
+        }}
+
+        function checkPowerUpCollisions() {{
+            const hi = lastRow(player.y);
+            for (let n = firstRow(player.y + player.height); n <= hi; n++) {{
+                if (!powerUps.alive[n] || !touchesPlayer(powerUps.x[n], powerUps.y[n], POWER_UP_SIZE)) continue;
+
+                const type = POWER_UP_TYPES[powerUps.type[n]];
+                if (type === 'life') {{
+                    gameState.lives++;
+                    gameState.score += {POINTS_LIFE};
+                }} else if (type === 'score') {{
+                    gameState.score += {POINTS_SCORE};
+                }} else {{
+                    gameState.score += {POINTS_POWER};
+                }}
+                powerUps.alive[n] = 0;
+            }}
+        }}
+
+        function checkCollectibleCollisions() {{
+            const hi = lastRow(player.y);
+            for (let n = firstRow(player.y + player.height); n <= hi; n++) {{
+                if (!coins.alive[n] || !touchesPlayer(coins.x[n], coins.y[n], COIN_SIZE)) continue;
+                coins.alive[n] = 0;
+                gameState.score += {POINTS_COIN};
+            }}
+        }}
+
+        // Tudo o que anda sozinho anda a cada tick, na tela ou fora dela: quem
+        // sobe encontra a plataforma e o inimigo onde o tempo os levou, não onde
+        // pararam quando saíram da tela. Só o draw() se limita à câmera.
+        function update() {{
+            if (!gameState.gameRunning) return;
+
+            tickBreakingPlatforms();
+            for (let i = 0; i < movingCount; i++) platforms[movingRows[i]].update();
+
+            player.update();
+            updateEnemies();
+            animationTicks++;
+
+            checkPlatformCollisions();
+            checkEnemyCollisions();
+            checkPowerUpCollisions();
+            checkCollectibleCollisions();
+        }}
+
+        // Entidades visitadas pelo último draw(). Só a janela da câmera é
+        // percorrida, então o número fica o mesmo no chão ou no topo, com 374
+        // plataformas ou 50.000. drawStats() no console do iframe mostra.
+        let drawVisited = 0;
+        let drawRows = 0;
+
+        function drawStats() {{
+            return {{ visited: drawVisited, rows: drawRows, worldRows: rowCount }};
+        }}
+        self.drawStats = drawStats;
+
+        // Custo médio de um draw(), em ms, com e sem o cache de sprites. Rode
+        // no console do iframe com a CPU estrangulada no DevTools (Performance
+        // > CPU: 6x) para ver o que um celular fraco sente.
+        function benchDraw(frames = 300) {{
+            const result = {{}};
+            for (const enabled of [false, true]) {{
+                spritesEnabled = enabled;
+                platformSprites.clear();
+                draw();   // aquece: o primeiro quadro com cache pinta os sprites
+                const start = performance.now();
+                for (let i = 0; i < frames; i++) draw();
+                result[enabled ? 'sprites' : 'semCache'] = (performance.now() - start) / frames;
+            }}
+            spritesEnabled = true;
+            return result;
+        }}
+        self.benchDraw = benchDraw;
+
+        // Bytes que a jogada aloca: por tick (update + draw) e por initLevel(),
+        // que é o que um restart faz com as entidades. Usa o performance.memory
+        // do Chrome — abra-o com --enable-precise-memory-info, senão o número
+        // vem arredondado em blocos. Um GC no meio da medida dá número negativo:
+        // rode de novo. A partida em curso recomeça.
+        function benchAlloc(ticks = 3000, restarts = 200) {{
+            if (!performance.memory) return 'performance.memory só existe no Chrome';
+            const heap = () => performance.memory.usedJSHeapSize;
+            const started = gameState.started;
+
+            for (let i = 0; i < 1000; i++) {{ update(); draw(); }}   // aquece o JIT
+            for (let i = 0; i < 50; i++) initLevel();
+            let start = heap();
+            for (let i = 0; i < ticks; i++) {{ update(); draw(); }}
+            const perTick = (heap() - start) / ticks;
+
+            start = heap();
+            for (let i = 0; i < restarts; i++) initLevel();
+            const perRestart = (heap() - start) / restarts;
+
+            core.restart();
+            gameState.started = started;
+            return {{ bytesPorTick: perTick, bytesPorRestart: perRestart }};
+        }}
+        self.benchAlloc = benchAlloc;
+
+        function draw() {{
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+            // As linhas já estão em ordem de altura: a janela da câmera é um
+            // intervalo de índices, sem testar o mundo entidade por entidade.
+            // Fora da tela por poucos px, o canvas recorta sozinho.
+            const lo = firstRow(gameState.cameraY + canvas.height);
+            const hi = lastRow(gameState.cameraY);
+            let visited = 0;
+            for (let n = lo; n <= hi; n++) {{
+                if (platforms[n].gone) continue;
+                platforms[n].draw();
+                visited++;
+            }}
+            visited += drawEntities(lo, hi);
+            drawVisited = visited;
+            drawRows = hi - lo + 1;
+
+            player.draw();
+            updateHud();
+        }}
+
+        // O que o HUD mostra agora. O shell só ouve falar dele quando algo
+        // muda — no modo worker, cada aviso é uma mensagem.
+        const hud = {{ score: null, lives: null, height: null, platform: null }};
+
+        function updateHud() {{
+            const height = player.heightInMeters();
+            if (gameState.score === hud.score && gameState.lives === hud.lives &&
+                height === hud.height && gameState.currentPlatform === hud.platform) return;
+            hud.score = gameState.score;
+            hud.lives = gameState.lives;
+            hud.height = height;
+            hud.platform = gameState.currentPlatform;
+            host.hud(hud.score, hud.lives, hud.height, hud.platform);
+        }}
+
+        // requestAnimationFrame existe em workers nos navegadores que têm
+        // OffscreenCanvas; o setTimeout é só a rede de segurança.
+        const nextFrame = typeof requestAnimationFrame === 'function'
+            ? requestAnimationFrame
+            : (callback) => setTimeout(() => callback(performance.now()), TICK_MS);
+
+        // --- Tempos de quadro ---------------------------------------------------
+        // Por quadro: quantos ticks a física rodou, se o acumulador foi zerado
+        // (descarte: o atraso além de MAX_TICKS_PER_FRAME some, e o jogo anda
+        // mais devagar que o relógio) e quanto levaram update() e draw(). Vai
+        // para histogramas de tamanho fixo — contar não aloca — e, a cada
+        // FRAME_STATS_FLUSH_MS de jogo ou no fim da partida, um resumo vai ao
+        // shell, que o manda ao servidor (awsgame.telemetry). Os últimos
+        // TRACE_FRAMES quadros ficam num anel para exportTrace().
+        const DURATION_BINS_MS = {to_js(DURATION_BINS_MS)};
+        const FRAME_STATS_FLUSH_MS = {FRAME_STATS_FLUSH_SECONDS} * 1000;
+        const TRACE_FRAMES = 3600;   // ~1 min a 60 Hz
+        const TRACE_FIELDS = 5;      // início, ms de update, ms de draw, ticks, ms descartados (-1: nenhum)
+
+        const frameStats = {{
+            since: 0,
+            frames: 0,
+            ticks: new Uint32Array(MAX_TICKS_PER_FRAME + 1),
+            dropped: 0,
+            droppedMs: 0,
+            update: new Uint32Array(DURATION_BINS_MS.length + 1),
+            draw: new Uint32Array(DURATION_BINS_MS.length + 1)
+        }};
+        const trace = new Float64Array(TRACE_FRAMES * TRACE_FIELDS);
+        let traceNext = 0;
+        let traceSize = 0;
+
+        function durationBin(ms) {{
+            let bin = 0;
+            while (bin < DURATION_BINS_MS.length && ms > DURATION_BINS_MS[bin]) bin++;
+            return bin;
+        }}
+
+        function recordFrame(start, updateMs, drawMs, ticks, droppedMs) {{
+            if (frameStats.frames === 0) frameStats.since = start;
+            frameStats.frames++;
+            frameStats.ticks[ticks]++;
+            frameStats.update[durationBin(updateMs)]++;
+            frameStats.draw[durationBin(drawMs)]++;
+            if (droppedMs >= 0) {{
+                frameStats.dropped++;
+                frameStats.droppedMs += droppedMs;
+            }}
+
+            const i = traceNext * TRACE_FIELDS;
+            trace[i] = start;
+            trace[i + 1] = updateMs;
+            trace[i + 2] = drawMs;
+            trace[i + 3] = ticks;
+            trace[i + 4] = droppedMs;
+            traceNext = (traceNext + 1) % TRACE_FRAMES;
+            if (traceSize < TRACE_FRAMES) traceSize++;
+
+            if (start - frameStats.since >= FRAME_STATS_FLUSH_MS) flushFrameStats(start);
+        }}
+
+        function flushFrameStats(now) {{
+            if (frameStats.frames === 0) return;
+            host.frameStats({{
+                seconds: (now - frameStats.since) / 1000,
+                frames: frameStats.frames,
+                ticks: Array.from(frameStats.ticks),
+                dropped: frameStats.dropped,
+                droppedMs: frameStats.droppedMs,
+                update: Array.from(frameStats.update),
+                draw: Array.from(frameStats.draw)
+            }});
+            frameStats.frames = 0;
+            frameStats.ticks.fill(0);
+            frameStats.dropped = 0;
+            frameStats.droppedMs = 0;
+            frameStats.update.fill(0);
+            frameStats.draw.fill(0);
+        }}
+
+        // Percentil do histograma, como o limite do balde (Infinity no último).
+        function binPercentile(counts, fraction) {{
+            let total = 0;
+            for (const count of counts) total += count;
+            let seen = 0;
+            for (let bin = 0; bin < counts.length; bin++) {{
+                seen += counts[bin];
+                if (seen >= fraction * total) return bin < DURATION_BINS_MS.length ? DURATION_BINS_MS[bin] : Infinity;
+            }}
+            return 0;
+        }}
+
+        // Formato do chrome://tracing e do painel Performance do DevTools
+        // (Load profile): um evento por update() e draw(), e um instantâneo
+        // em cada descarte.
+        function traceJson() {{
+            const events = [{{ name: 'thread_name', ph: 'M', pid: 1, tid: 1, args: {{ name: 'awsgame gameLoop' }} }}];
+            const first = traceSize < TRACE_FRAMES ? 0 : traceNext;
+            for (let k = 0; k < traceSize; k++) {{
+                const i = ((first + k) % TRACE_FRAMES) * TRACE_FIELDS;
+                const start = trace[i] * 1000;   // µs
+                const update = trace[i + 1] * 1000;
+                const drawn = trace[i + 2] * 1000;
+                events.push({{ name: 'frame', ph: 'X', pid: 1, tid: 1, ts: start, dur: update + drawn, args: {{ ticks: trace[i + 3] }} }});
+                events.push({{ name: 'update', ph: 'X', pid: 1, tid: 1, ts: start, dur: update }});
+                events.push({{ name: 'draw', ph: 'X', pid: 1, tid: 1, ts: start + update, dur: drawn }});
+                if (trace[i + 4] >= 0) {{
+                    events.push({{ name: 'dropped ticks', ph: 'i', s: 't', pid: 1, tid: 1, ts: start + update, args: {{ lostMs: trace[i + 4] }} }});
+                }}
+            }}
+            return JSON.stringify({{ traceEvents: events, displayTimeUnit: 'ms' }});
+        }}
+
+        // Overlay opcional no canto do mundo: a janela atual do resumo. O texto
+        // só é remontado a cada OVERLAY_REFRESH quadros.
+        const OVERLAY_REFRESH = 30;
+        let overlayEnabled = false;
+        let overlayLines = ['', ''];
+        let overlayAge = OVERLAY_REFRESH;
+
+        function drawOverlay() {{
+            if (++overlayAge >= OVERLAY_REFRESH) {{
+                overlayAge = 0;
+                const frames = frameStats.frames;
+                const seconds = frames ? (performance.now() - frameStats.since) / 1000 : 0;
+                let ticks = 0;
+                for (let n = 0; n < frameStats.ticks.length; n++) ticks += n * frameStats.ticks[n];
+                const bound = (ms) => (ms === Infinity ? '>' + DURATION_BINS_MS[DURATION_BINS_MS.length - 1] : '≤' + ms);
+                overlayLines = [
+                    (seconds ? Math.round(frames / seconds) : 0) + ' fps · ' +
+                        (frames ? (ticks / frames).toFixed(2) : '0') + ' ticks/quadro · ' +
+                        frameStats.dropped + ' descartes',
+                    'p95 update ' + bound(binPercentile(frameStats.update, 0.95)) + ' ms · draw ' +
+                        bound(binPercentile(frameStats.draw, 0.95)) + ' ms'
+                ];
+            }}
+            ctx.fillStyle = 'rgba(0,0,0,0.6)';
+            ctx.fillRect(8, canvas.height - 46, 300, 38);
+            ctx.fillStyle = '#7CFC00';
+            ctx.font = '12px monospace';
+            ctx.textAlign = 'left';
+            ctx.fillText(overlayLines[0], 14, canvas.height - 31);
+            ctx.fillText(overlayLines[1], 14, canvas.height - 15);
+        }}
+
+        function gameLoop(now) {{
+            nextFrame(gameLoop);
+
+            if (lastFrameTime === null) lastFrameTime = now;
+            const elapsed = Math.min(now - lastFrameTime, MAX_FRAME_MS);
+            lastFrameTime = now;
+
+            const measured = gameState.started && gameState.gameRunning;
+            const start = measured ? performance.now() : 0;
+            let ticks = 0;
+            let droppedMs = -1;
+            if (gameState.started) {{
+                accumulator += elapsed;
+                while (accumulator >= TICK_MS && ticks < MAX_TICKS_PER_FRAME) {{
+                    update();
+                    accumulator -= TICK_MS;
+                    ticks++;
+                }}
+                // Não deixa a dívida acumular se a máquina não deu conta.
+                if (ticks === MAX_TICKS_PER_FRAME) {{
+                    droppedMs = accumulator;
+                    accumulator = 0;
+                }}
+            }}
+
+            const updated = measured ? performance.now() : 0;
+            draw();
+            if (overlayEnabled) drawOverlay();
+            // O quadro que acabou a partida fica de fora: o resumo já foi.
+            if (measured && gameState.gameRunning) recordFrame(start, updated - start, performance.now() - updated, ticks, droppedMs);
+        }}
+
+        function endRound(screenId, sound, stats) {{
+            gameState.gameRunning = false;
+            // O resultado vai para o placar (awsgame.leaderboard) pelo shell.
+            stats.score = gameState.score;
+            stats.height = player.heightInMeters();
+            stats.platform = gameState.currentPlatform;
+            stats.won = screenId === 'gameWin';
+            stats.dailyDay = dailyMode ? dailyDay() : null;
+            stats.level = levelIndex;
+            flushFrameStats(performance.now());
+            host.endRound(screenId, sound, stats);
+        }}
+
+        function gameOver() {{
+            const service = gameState.currentPlatform > 0
+                ? awsServices[gameState.currentPlatform - 1]
+                : null;
+            endRound('gameOver', 'gameover', {{ service: service ? service.name : START_NAME }});
+        }}
+
+        function gameWin() {{
+            endRound('gameWin', 'aplausos', {{}});
+        }}
+
+        // --- Interface do núcleo ----------------------------------------------
+        // Tudo o que o shell pede ao jogo passa por aqui, e tudo o que o jogo
+        // conta ao shell passa por `host`. Argumentos e retornos são dados
+        // simples, para que o mesmo núcleo rode do outro lado de um postMessage.
+        const core = {{
+            init(target) {{
+                canvas = target;
+                ctx = canvas.getContext('2d');
+                buildAtlas();
+                for (let n = 0; n <= TOTAL_SERVICES; n++) {{
+                    platforms.push(new Platform(n));
+                }}
+                initLevel();
+                showService(platforms[0]);
+                nextFrame(gameLoop);
+            }},
+
+            loadLevels(buffer) {{
+                try {{
+                    levelPack = decodeLevelPack(buffer);
+                }} catch (e) {{
+                    console.log('Level pack decode failed:', e);
+                    host.levelsLoaded(false);
+                    return;
+                }}
+                pickLevel();
+                initLevel();
+                host.levelsLoaded(true);
+            }},
+
+            setMascot(image) {{
+                mascotImage = image;
+                paintMascotCells();
+            }},
+
+            start(daily) {{
+                dailyMode = daily;
+                pickLevel();
+                initLevel();
+                gameState.started = true;
+                accumulator = 0;
+                lastFrameTime = null;
+            }},
+
+            restart() {{
+                gameState = newGameState();
+                gameState.started = true;
+                accumulator = 0;
+                lastFrameTime = null;
+
+                player = new Player(150, GROUND_TOP - 50);
+                displayedPlatform = -1;   // força o card a reescrever
+                pickLevel();              // a do dia se repete; a avulsa, não
+                initLevel();
+                showService(platforms[0]);
+            }},
+
+            key(name, down) {{
+                gameState.keys[name] = down;
+            }},
+
+            jump() {{
+                player.jump();
+            }},
+
+            setDailySeed(day) {{
+                serverDay = day;
+            }},
+
+            setOverlay(on) {{
+                overlayEnabled = on;
+                overlayAge = OVERLAY_REFRESH;
+            }},
+
+            exportTrace() {{
+                host.saveTrace(traceJson());
+            }}
+        }};
+    </script>
+    <script>
+        // --- Shell -------------------------------------------------------------
+        // O script de cima é o núcleo do jogo: simulação e desenho, sem tocar
+        // no DOM. Este aqui é o resto — céu, HUD, card, som, telas e entrada —
+        // mais o `host`, por onde o núcleo conta o que aconteceu. O núcleo roda
+        // nesta mesma thread ou num Web Worker (ver "Modo worker").
+
+        function paintSky() {{
+            const element = document.getElementById('skyCanvas');
+            const sky = element.getContext('2d');
+            const gradient = sky.createLinearGradient(0, 0, 0, element.height);
+            gradient.addColorStop(0, '#001122');
+            gradient.addColorStop(0.3, '#003366');
+            gradient.addColorStop(0.7, '#004488');
+            gradient.addColorStop(1, '#87CEEB');
+            sky.fillStyle = gradient;
+            sky.fillRect(0, 0, element.width, element.height);
+        }}
+
+        // --- HUD -------------------------------------------------------------
+        // Só o que mudou é reescrito: o texto do DOM custa layout, e a barra de
+        // progresso, uma repintura do canvas do HUD.
+        const hudCanvas = document.getElementById('hudCanvas');
+        const hudCtx = hudCanvas.getContext('2d');
+        const shownHud = {{ score: null, lives: null, height: null, platform: null }};
+
+        function showHud(score, lives, height, platform) {{
+            for (const [id, value] of [['score', score], ['lives', lives], ['height', height]]) {{
+                if (shownHud[id] === value) continue;
+                shownHud[id] = value;
+                document.getElementById(id).textContent = value;
+            }}
+            if (shownHud.platform !== platform) {{
+                shownHud.platform = platform;
+                drawProgressIndicator(platform);
+            }}
+        }}
+
+        function drawProgressIndicator(platform) {{
+            const width = 200;
+            const height = 20;
+            const x = hudCanvas.width - width - 20;
+            const y = 20;
+
+            hudCtx.clearRect(x - 5, y - 5, width + 10, height + 10);
+            hudCtx.fillStyle = 'rgba(0,0,0,0.5)';
+            hudCtx.fillRect(x - 5, y - 5, width + 10, height + 10);
+
+            hudCtx.fillStyle = '#333';
+            hudCtx.fillRect(x, y, width, height);
+
+            const progress = platform / TOTAL_SERVICES;
+            hudCtx.fillStyle = progress < 0.5 ? '#FF6B35' : progress < 0.8 ? '#FFA502' : '#32CD32';
+            hudCtx.fillRect(x, y, width * progress, height);
+
+            hudCtx.fillStyle = 'white';
+            hudCtx.font = 'bold 12px Arial';
+            hudCtx.textAlign = 'center';
+            hudCtx.fillText(platform + '/' + TOTAL_SERVICES, x + width / 2, y + 15);
+        }}
+
+        // --- Som -------------------------------------------------------------
+        // Web Audio, não <audio>. Um elemento por efeito obrigava a zerar o
+        // currentTime a cada play(): pulos seguidos cortavam um ao outro, e cada
+        // um pagava decode + seek. Aqui cada efeito é decodificado UMA vez num
+        // AudioBuffer, e tocar é criar um BufferSource — descartável, barato, e
+        // quantos quiser ao mesmo tempo. A trilha é a exceção: com 658 KB, ela
+        // continua num <audio> (que toca por streaming, sem esperar o download)
+        // ligado ao grafo por um MediaElementSource, para o volume valer também
+        // no iOS, que ignora o .volume do elemento.
+        const MUSIC_KEY = 'sonora';
+        const MUSIC_VOLUME = 0.3;
+        let audioContext = null;
+        let musicElement = null;
+        const audioBuffers = {{}};
+        const activeSources = new Set();
+
+        function decodeAudio(data) {{
+            // Forma com callbacks: o Safari antigo não devolve Promise aqui.
+            return new Promise((resolve, reject) => audioContext.decodeAudioData(data, resolve, reject));
+        }}
+
+        function initAudio() {{
+            // Só no clique de início: o navegador só libera o AudioContext dentro
+            // de um gesto do usuário, e é aqui que os MP3 são baixados.
+            const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+            if (audioContext || !AudioContextClass) return;
+            audioContext = new AudioContextClass();
+
+            for (const [key, url] of Object.entries(audioSources)) {{
+                if (!url) continue;
+                if (key === MUSIC_KEY) {{
+                    musicElement = new Audio(url);
+                    musicElement.loop = true;
+                    const gain = audioContext.createGain();
+                    gain.gain.value = MUSIC_VOLUME;
+                    audioContext.createMediaElementSource(musicElement).connect(gain);
+                    gain.connect(audioContext.destination);
+                    continue;
+                }}
+                fetch(url)
+                    .then(response => response.arrayBuffer())
+                    .then(decodeAudio)
+                    .then(buffer => {{ audioBuffers[key] = buffer; }})
+                    .catch(e => console.log('Audio decode failed:', key, e));
+            }}
+        }}
+
+        function playAudio(key) {{
+            if (!audioContext) return;
+            if (audioContext.state === 'suspended') audioContext.resume();
+
+            if (key === MUSIC_KEY) {{
+                if (!musicElement) return;
+                musicElement.currentTime = 0;
+                musicElement.play().catch(e => console.log('Audio play failed:', e));
+                return;
+            }}
+
+            const buffer = audioBuffers[key];
+            if (!buffer) return;   // ainda decodificando: melhor mudo que atrasado
+            const source = audioContext.createBufferSource();
+            source.buffer = buffer;
+            source.connect(audioContext.destination);
+            source.onended = () => activeSources.delete(source);
+            activeSources.add(source);
+            source.start();
+        }}
+
+        function stopMusic() {{
+            if (!musicElement) return;
+            musicElement.pause();
+            musicElement.currentTime = 0;
+        }}
+
+        function stopAllAudio() {{
+            stopMusic();
+            for (const source of activeSources) source.stop();
+            activeSources.clear();
+        }}
+
+        // Sonda de latência, para o console: `probeAudioLatency()`. baseLatency
+        // é o buffer do próprio AudioContext; outputLatency, o caminho até a
+        // saída de som; pipelineMs é a diferença medida agora entre o instante
+        // agendado (currentTime) e o que está de fato saindo no alto-falante.
+        function probeAudioLatency() {{
+            if (!audioContext) return null;
+            const stamp = audioContext.getOutputTimestamp ? audioContext.getOutputTimestamp() : null;
+            return {{
+                baseLatencyMs: (audioContext.baseLatency || 0) * 1000,
+                outputLatencyMs: (audioContext.outputLatency || 0) * 1000,
+                pipelineMs: stamp && stamp.contextTime > 0
+                    ? (audioContext.currentTime - stamp.contextTime) * 1000
+                    : null,
+                decoded: Object.keys(audioBuffers)
+            }};
+        }}
+        window.probeAudioLatency = probeAudioLatency;
+
+        // --- Card ------------------------------------------------------------
+        const START_DESC = 'Comece sua aventura pelos serviços AWS! A cada plataforma que você ' +
+                           'pisar, a descrição do serviço correspondente aparece aqui.';
+
+        // A plataforma cujo card está na tela (o núcleo só avisa quando muda).
+        let cardPlatform = -1;
+
+        function renderCard(number) {{
+            let text = number === 0 ? START_DESC : description(number);
+            if (text === null) {{
+                // O trecho ainda não chegou: mostra o nome até requestChunk()
+                // chamar renderCard() de novo.
+                requestChunk(chunkOf(number));
+                text = awsServices[number - 1].name + '…';
+            }}
+            // textContent, nunca innerHTML: a descrição vem do JSON e não deve
+            // ser interpretada como marcação.
+            document.getElementById('cardDescription').textContent = text;
+        }}
+
+        // --- Descrições sob demanda -------------------------------------------
+        // Cada URL é um trecho de DESCRIPTION_CHUNK descrições, com hash no nome
+        // (o navegador cacheia para sempre). Os trechos em volta da câmera são
+        // buscados antes de o jogador chegar lá, e só os últimos
+        // DESCRIPTION_CACHE_SIZE ficam na memória. Assim a carga inicial não
+        // cresce com o tamanho das descrições.
+        const DESCRIPTION_CHUNK = {DESCRIPTION_CHUNK};
+        const DESCRIPTION_URLS = {to_js(description_urls)};
+        const DESCRIPTION_CACHE_SIZE = 6;
+        const DESCRIPTION_PREFETCH = 2;   // trechos acima do que está na tela
+
+        // Map guarda a ordem de inserção: o primeiro é o usado há mais tempo.
+        const descriptionChunks = new Map();
+        const pendingChunks = new Set();
+        let prefetchedChunk = -1;
+
+        function chunkOf(number) {{
+            return Math.floor((number - 1) / DESCRIPTION_CHUNK);
+        }}
+
+        function description(number) {{
+            const chunk = chunkOf(number);
+            const texts = descriptionChunks.get(chunk);
+            if (!texts) return null;
+            descriptionChunks.delete(chunk);   // reinsere no fim: usado agora
+            descriptionChunks.set(chunk, texts);
+            return texts[(number - 1) % DESCRIPTION_CHUNK];
+        }}
+
+        function requestChunk(chunk) {{
+            if (chunk < 0 || chunk >= DESCRIPTION_URLS.length) return;
+            if (descriptionChunks.has(chunk) || pendingChunks.has(chunk)) return;
+
+            pendingChunks.add(chunk);
+            fetch(DESCRIPTION_URLS[chunk])
+                .then(response => {{
+                    if (!response.ok) throw new Error('HTTP ' + response.status);
+                    return response.json();
+                }})
+                .then(texts => {{
+                    descriptionChunks.set(chunk, texts);
+                    while (descriptionChunks.size > DESCRIPTION_CACHE_SIZE) {{
+                        descriptionChunks.delete(descriptionChunks.keys().next().value);
+                    }}
+                    if (cardPlatform > 0 && chunkOf(cardPlatform) === chunk) {{
+                        renderCard(cardPlatform);
+                    }}
+                }})
+                // Sem retry aqui: o próximo prefetch ou showService tenta de novo.
+                .catch(e => console.log('Description fetch failed:', e))
+                .finally(() => pendingChunks.delete(chunk));
+        }}
+
+        // `top`: a plataforma no topo da tela, que o núcleo avisa quando muda.
+        function prefetchDescriptions(top) {{
+            const chunk = chunkOf(top);
+            if (chunk === prefetchedChunk) return;
+            prefetchedChunk = chunk;
+            for (let c = chunk - 1; c <= chunk + DESCRIPTION_PREFETCH; c++) requestChunk(c);
+        }}
+
+        // --- Tempos de quadro ---------------------------------------------------
+        // O núcleo conta; aqui o resumo ganha o aparelho e vai para o servidor
+        // (awsgame.telemetry), que agrega por classe de aparelho. O POST leva
+        // o token XSRF do Streamlit: o iframe é da mesma origem e lê o cookie.
+        const FRAME_STATS_URL = {to_js(frames_url)};
+        const RESULTS_URL = {to_js(results_url)};
+
+        function xsrfToken() {{
+            const match = document.cookie.match(/(?:^|;\\s*)_streamlit_xsrf=([^;]*)/);
+            return match ? decodeURIComponent(match[1]) : null;
+        }}
+
+        function sendFrameStats(summary) {{
+            summary.mode = game === core ? 'thread' : 'worker';
+            summary.device = {{
+                cores: navigator.hardwareConcurrency || 0,
+                memory: navigator.deviceMemory || 0,
+                touch: matchMedia('(pointer: coarse)').matches,
+                dpr: window.devicePixelRatio || 1
+            }};
+            // keepalive: o resumo do fim da partida sai mesmo se a aba fechar.
+            postJson(FRAME_STATS_URL, summary).catch(e => console.log('Frame stats not sent:', e));
+        }}
+
+        function postJson(url, body) {{
+            const headers = {{ 'Content-Type': 'application/json' }};
+            const token = xsrfToken();
+            if (token) headers['X-Xsrftoken'] = token;
+            return fetch(url, {{ method: 'POST', headers, body: JSON.stringify(body), keepalive: true }});
+        }}
+
+        // A posição chega depois da tela final; se o placar não responder
+        // (fora do Streamlit, 405), a linha fica vazia.
+        function sendResult(stats, rankId) {{
+            const line = document.getElementById(rankId);
+            line.textContent = '';
+            postJson(RESULTS_URL, stats)
+                .then(r => r.ok ? r.json() : null)
+                .then(r => {{
+                    if (r) line.textContent = `Posição ${{r.rank}} de ${{r.total}} — melhor que ${{r.percentile}}% das partidas`;
+                }})
+                .catch(e => console.log('Result not sent:', e));
+        }}
+
+        // No console do iframe, nos dois modos: frameOverlay() liga o overlay
+        // (frameOverlay(false) desliga) e exportTrace() baixa o último minuto.
+        self.frameOverlay = (on = true) => game.setOverlay(on);
+        self.exportTrace = () => game.exportTrace();
+
+        // --- Host --------------------------------------------------------------
+        // O que o núcleo pode pedir. Só dados simples nos argumentos: no modo
+        // worker, cada chamada chega aqui como uma mensagem.
+        const host = {{
+            hud: showHud,
+
+            card(number) {{
+                cardPlatform = number;
+                renderCard(number);
+            }},
+
+            viewTop: prefetchDescriptions,
+
+            level(label) {{
+                document.getElementById('level').textContent = label;
+            }},
+
+            sound: playAudio,
+
+            endRound(screenId, sound, stats) {{
+                stopMusic();
+                playAudio(sound);
+                if (screenId === 'gameOver') {{
+                    document.getElementById('finalScore').textContent = stats.score;
+                    document.getElementById('finalHeight').textContent = stats.height;
+                    document.getElementById('finalService').textContent = stats.service;
+                }} else {{
+                    document.getElementById('winScore').textContent = stats.score;
+                }}
+                sendResult(stats, screenId === 'gameOver' ? 'finalRank' : 'winRank');
+                document.getElementById(screenId).style.display = 'block';
+            }},
+
+            frameStats: sendFrameStats,
+
+            saveTrace(json) {{
+                const link = document.createElement('a');
+                link.href = URL.createObjectURL(new Blob([json], {{ type: 'application/json' }}));
+                link.download = 'awsgame-trace.json';
+                link.click();
+                setTimeout(() => URL.revokeObjectURL(link.href), 1000);
+            }},
+
+            levelsLoaded(ok) {{
+                if (!ok) {{
+                    startButtons[0].textContent = 'Falha ao carregar as fases — recarregue a página';
+                    return;
+                }}
+                startButtons[0].textContent = '▶ Clique para jogar';
+                for (const button of startButtons) button.disabled = false;
+            }}
+        }};
+
+        // --- Modo worker -------------------------------------------------------
+        // Opcional: ?render=worker na URL do app, ou localStorage
+        // 'awsgame.render' = 'worker'. O canvas do mundo é transferido para um
+        // Web Worker que roda o núcleo inteiro, física e desenho, longe desta
+        // thread — que o iframe divide com o DOM e com os reruns do Streamlit.
+        // Aqui ficam a entrada, o som e o DOM, movidos por mensagens curtas.
+        // Sem OffscreenCanvas, ou se o worker falhar, o núcleo roda aqui mesmo.
+        let game = core;
+        let levelBuffer = null;
+        let mascot = null;
+
+        // ?nome=valor na URL do app (chega nos argumentos do componente) ou,
+        // senão, localStorage 'awsgame.nome'.
+        function pageOption(name) {{
+            const settings = componentArgs.settings || {{}};
+            if (settings[name] != null) return settings[name];
+            try {{
+                return localStorage.getItem('awsgame.' + name);
+            }} catch (e) {{
+                return null;
+            }}
+        }}
+
+        function wantsWorker() {{
+            return pageOption('render') === 'worker';
+        }}
+
+        // Roda DENTRO do worker, logo depois do código do núcleo.
+        function workerMain() {{
+            self.host = new Proxy({{}}, {{
+                get: (_, name) => (...args) => self.postMessage([name, ...args])
+            }});
+            self.onmessage = (e) => core[e.data[0]](...e.data.slice(1));
+        }}
+
+        function startWorker(element) {{
+            const source = document.getElementById('gameCore').textContent + '\\n;(' + workerMain + ')();';
+            const worker = new Worker(URL.createObjectURL(new Blob([source], {{ type: 'text/javascript' }})));
+            worker.onmessage = (e) => host[e.data[0]](...e.data.slice(1));
+            worker.onerror = (e) => {{
+                console.log('Game worker failed, running on the main thread:', e.message);
+                worker.terminate();
+                runOnMainThread();
+            }};
+            const offscreen = element.transferControlToOffscreen();
+            element.dataset.transferred = 'true';
+            worker.postMessage(['init', offscreen], [offscreen]);
+            return new Proxy({{}}, {{
+                get: (_, name) => (...args) => worker.postMessage([name, ...args])
+            }});
+        }}
+
+        function runOnMainThread() {{
+            // Um canvas transferido não volta: o fallback troca por um novo.
+            let element = document.getElementById('gameCanvas');
+            if (element.dataset.transferred) {{
+                const fresh = element.cloneNode(false);
+                delete fresh.dataset.transferred;
+                element.replaceWith(fresh);
+                element = fresh;
+                bindCanvas(element);
+                // A partida em curso morreu com o worker.
+                document.getElementById('startOverlay').style.display = 'block';
+            }}
+            game = core;
+            core.init(element);
+            if (levelBuffer) core.loadLevels(levelBuffer);
+            if (mascot) core.setMascot(mascot);
+        }}
+
+        function startGameCore() {{
+            const element = document.getElementById('gameCanvas');
+            if (wantsWorker() && typeof Worker === 'function' &&
+                typeof element.transferControlToOffscreen === 'function') {{
+                try {{
+                    game = startWorker(element);
+                    if (levelBuffer) game.loadLevels(levelBuffer);
+                    if (mascot) sendMascot();
+                    return;
+                }} catch (e) {{
+                    console.log('Game worker unavailable:', e);
+                }}
+            }}
+            runOnMainThread();
+        }}
+
+        function sendMascot() {{
+            if (game === core) {{
+                core.setMascot(mascot);
+                return;
+            }}
+            // No worker, o <img> não serve: vai como ImageBitmap.
+            createImageBitmap(mascot)
+                .then(bitmap => game.setMascot(bitmap))
+                .catch(e => console.log('Mascot bitmap failed:', e));
+        }}
+
+        // --- Telas -------------------------------------------------------------
+        function focusGame() {{
+            document.getElementById('gameCanvas').focus();
+        }}
+
+        function startGame(daily) {{
+            roundStarted = true;
+            initAudio();
+            document.getElementById('startOverlay').style.display = 'none';
+            // play() aqui dentro do clique: é o único momento em que o navegador
+            // libera o áudio. Fora do handler ele bloqueia por autoplay policy.
+            playAudio(MUSIC_KEY);
+            focusGame();
+            game.start(daily);
+        }}
+
+        function restartGame() {{
+            stopAllAudio();
+            document.getElementById('gameOver').style.display = 'none';
+            document.getElementById('gameWin').style.display = 'none';
+            playAudio(MUSIC_KEY);
+            focusGame();
+            game.restart();
+        }}
+
+        const startButtons = [document.getElementById('startBtn'), document.getElementById('dailyBtn')];
+        startButtons[0].addEventListener('click', () => startGame(false));
+        startButtons[1].addEventListener('click', () => startGame(true));
+
+        // --- Entrada -----------------------------------------------------------
+        window.addEventListener('keydown', (e) => {{
+            if (e.key === ' ' || e.key.startsWith('Arrow')) e.preventDefault();
+            if (!e.repeat) game.key(e.key, true);   // repetição: já está apertada
+        }});
+
+        window.addEventListener('keyup', (e) => {{
+            game.key(e.key, false);
+        }});
+
+        let touchStartX = 0;
+        let touchStartY = 0;
+
+        function bindCanvas(element) {{
+            // O jogo vive num iframe. Sem isso, as setas iam para a página do
+            // Streamlit (que rolava a tela) e o jogo não respondia ao teclado.
+            element.addEventListener('mousedown', () => element.focus());
+
+            element.addEventListener('touchstart', (e) => {{
+                e.preventDefault();
+                touchStartX = e.touches[0].clientX;
+                touchStartY = e.touches[0].clientY;
+            }}, {{ passive: false }});
+
+            element.addEventListener('touchend', (e) => {{
+                e.preventDefault();
+                const touch = e.changedTouches[0];
+                const deltaX = touch.clientX - touchStartX;
+                const deltaY = touch.clientY - touchStartY;
+
+                if (Math.abs(deltaY) > Math.abs(deltaX)) {{
+                    if (deltaY < -30) game.jump();
+                }} else if (Math.abs(deltaX) > 30) {{
+                    const key = deltaX > 0 ? 'ArrowRight' : 'ArrowLeft';
+                    game.key(key, true);
+                    setTimeout(() => game.key(key, false), 200);
+                }}
+            }}, {{ passive: false }});
+        }}
+
+        // --- Componente --------------------------------------------------------
+        // O jogo é um componente declarado do Streamlit (ver awsgame.assets):
+        // este HTML vem do cache do navegador, e pelo websocket só passam os
+        // argumentos — o nome do bundle atual, o dia da escalada do dia e as
+        // opções da URL do app. O núcleo só sobe com eles em mãos (o modo
+        // worker depende das opções); fora do Streamlit, ou se a mensagem não
+        // vier, sobe sem eles depois de BOOT_TIMEOUT_MS.
+        const BOOT_TIMEOUT_MS = 1000;
+        const inStreamlit = window.parent !== window;
+        let componentArgs = {{}};
+        let booted = false;
+        let roundStarted = false;
+
+        function toStreamlit(type, data) {{
+            window.parent.postMessage(Object.assign({{ isStreamlitMessage: true, type }}, data), '*');
+        }}
+
+        function boot() {{
+            if (booted) return;
+            booted = true;
+            startGameCore();
+            if (pageOption('frames') === 'overlay') game.setOverlay(true);
+        }}
+
+        window.addEventListener('message', (e) => {{
+            if (e.source !== window.parent || !e.data || e.data.type !== 'streamlit:render') return;
+            componentArgs = e.data.args || {{}};
+            // Deploy novo com a aba aberta: o rerun traz o nome do bundle novo.
+            // Só troca antes da primeira partida, para não derrubar ninguém.
+            const bundle = componentArgs.bundle;
+            if (bundle && bundle !== location.pathname.split('/').pop() && !roundStarted) {{
+                location.replace(bundle);
+                return;
+            }}
+            boot();
+            if (componentArgs.day != null) game.setDailySeed(componentArgs.day);
+        }});
+
+        // --- Início ------------------------------------------------------------
+        paintSky();
+        bindCanvas(document.getElementById('gameCanvas'));
+        if (inStreamlit) {{
+            toStreamlit('streamlit:componentReady', {{ apiVersion: 1 }});
+            toStreamlit('streamlit:setFrameHeight', {{ height: {FRAME_HEIGHT} }});
+            setTimeout(boot, BOOT_TIMEOUT_MS);
+        }} else {{
+            boot();
+        }}
+
+        // O jogo só começa com o pacote de fases em mãos: até lá a tela mostra
+        // o chão e os botões ficam desabilitados.
+        fetch(LEVELS_URL)
+            .then(response => {{
+                if (!response.ok) throw new Error('HTTP ' + response.status);
+                return response.arrayBuffer();
+            }})
+            .then(buffer => {{
+                levelBuffer = buffer;
+                if (booted) game.loadLevels(buffer);
+            }})
+            .catch(e => {{
+                console.log('Level pack fetch failed:', e);
+                host.levelsLoaded(false);
+            }});
+
+        if (mascotUrl) {{
+            const image = new Image();
+            image.onload = () => {{
+                mascot = image;
+                if (booted) sendMascot();
+            }};
+            image.src = mascotUrl;
+        }}
+    </script>
+</body>
+</html>
+'''
+
+
+def render_entry_html(game_file):
+    """O index.html do componente: só aponta para o HTML com hash.
+
+    O Streamlit carrega o componente sempre por index.html, um nome fixo — que
+    por isso não pode ser imutável. Ele é minúsculo e revalidado a cada visita
+    (ETag, 304); o jogo de verdade fica em `game_file`, com hash, cacheado de
+    vez. O aviso de pronto sai antes da troca de página: sem ele o Streamlit
+    ignora o setFrameHeight e o iframe fica com altura zero até o jogo subir.
+    """
+    return f'''<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <script>
+        function toStreamlit(type, data) {{
+            window.parent.postMessage(Object.assign({{ isStreamlitMessage: true, type }}, data), '*');
+        }}
+        toStreamlit('streamlit:componentReady', {{ apiVersion: 1 }});
+        toStreamlit('streamlit:setFrameHeight', {{ height: {FRAME_HEIGHT} }});
+        location.replace({to_js(game_file)});
+    </script>
+</head>
+</html>
+'''
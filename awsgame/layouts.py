@@ -0,0 +1,140 @@
+"""Fases pré-geradas a partir de uma semente, empacotadas em binário.
+
+O initLevel() sorteava tudo com Math.random() a cada restart e alocava ~375
+Platform mais inimigos, power-ups e moedas. Agora as fases saem do build: cada
+semente gera uma fase, e LEVEL_POOL fases vão num único arquivo binário que o
+jogo busca por URL e lê direto em typed arrays. Reiniciar é copiar números de
+um array, não sortear de novo — e a mesma semente dá a mesma fase para todo
+mundo, o que viabiliza a "escalada do dia".
+
+Formato (little-endian, o de todo navegador):
+
+    cabeçalho   4s magia b"AWSL", u16 versão, u16 fases, u16 plataformas, u16 0
+    x           u16[fases * plataformas]   borda esquerda, px
+    width       u16[fases * plataformas]   largura, px
+    coin        u16[fases * plataformas]   x da moeda, NO_COIN se não tem
+    type        u8[fases * plataformas]    GROUND..FINAL
+    enemy       u8[fases * plataformas]    0 = nenhum; senão 1 + emoji, ENEMY_LEFT = vai para a esquerda
+    power_up    u8[fases * plataformas]    0 = nenhum; senão 1 + POWER_UP_TYPES
+
+Os arrays de 16 bits vêm antes dos de 8 para que todos comecem alinhados e o
+JS possa abrir cada um como view sobre o mesmo ArrayBuffer, sem copiar.
+"""
+
+import random
+import struct
+from array import array
+from sys import byteorder
+
+from awsgame import game
+
+MAGIC = b"AWSL"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHH")
+
+# Sementes 0..LEVEL_POOL-1. 16 fases dão ~55 KB (sem compressão) e uma fase do
+# dia diferente por duas semanas antes de repetir.
+LEVEL_POOL = 16
+
+TYPE_NAMES = ("chão", "normal", "quebrável", "móvel", "final")
+GROUND, NORMAL, BREAKABLE, MOVING, FINAL = range(len(TYPE_NAMES))
+
+ENEMY_CHANCE = 0.25
+ENEMY_FROM = 6           # as primeiras plataformas ficam livres
+ENEMY_LEFT = 0x80
+POWER_UP_CHANCE = 0.12
+COIN_CHANCE = 0.35
+NO_COIN = 0xFFFF
+
+FIELDS_16 = ("x", "width", "coin")
+FIELDS_8 = ("type", "enemy", "power_up")
+
+
+def platform_type(number, count):
+    # else-if: 175 e 350 são múltiplos de 25 E de 35 — a móvel vence.
+    if number == 0:
+        return GROUND
+    if number == count:
+        return FINAL
+    if number % game.MOVING_EVERY == 0:
+        return MOVING
+    if number % game.BREAKABLE_EVERY == 0:
+        return BREAKABLE
+    return NORMAL
+
+
+def generate_level(seed, count):
+    """A fase da semente `seed`: um dict de campo -> lista, plataforma 0 = chão."""
+    rng = random.Random(seed)
+    level = {name: [] for name in FIELDS_16 + FIELDS_8}
+
+    def add(x, width, coin=NO_COIN, enemy=0, power_up=0):
+        number = len(level["x"])
+        level["x"].append(x)
+        level["width"].append(width)
+        level["coin"].append(coin)
+        level["type"].append(platform_type(number, count))
+        level["enemy"].append(enemy)
+        level["power_up"].append(power_up)
+
+    add(0, game.GAME_WIDTH)
+    for number in range(1, count + 1):
+        # A largura entra na conta: senão a plataforma vaza pela direita.
+        width = game.PLATFORM_MIN_WIDTH + int(rng.random() * (game.PLATFORM_WIDTH_SPREAD + 1))
+        x = int(rng.random() * (game.GAME_WIDTH - width + 1))
+
+        enemy = 0
+        if number >= ENEMY_FROM and rng.random() < ENEMY_CHANCE:
+            enemy = 1 + rng.randrange(len(game.ENEMY_EMOJIS))
+            if rng.random() < 0.5:
+                enemy |= ENEMY_LEFT
+
+        power_up = 0
+        if rng.random() < POWER_UP_CHANCE:
+            power_up = 1 + rng.randrange(len(game.POWER_UP_TYPES))
+
+        coin = NO_COIN
+        if rng.random() < COIN_CHANCE:
+            coin = x + 20 + int(rng.random() * (width - 40))
+
+        add(x, width, coin, enemy, power_up)
+    return level
+
+
+def encode_pack(levels):
+    """Empacota fases do mesmo tamanho no formato descrito no topo do módulo."""
+    platforms = len(levels[0]["x"])
+    if any(len(level["x"]) != platforms for level in levels):
+        raise ValueError("todas as fases do pacote precisam ter o mesmo número de plataformas")
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(levels), platforms, 0)]
+    for names, code in ((FIELDS_16, "H"), (FIELDS_8, "B")):
+        for name in names:
+            values = array(code, (v for level in levels for v in level[name]))
+            if byteorder != "little":
+                values.byteswap()
+            parts.append(values.tobytes())
+    return b"".join(parts)
+
+
+def decode_pack(data):
+    """O inverso de encode_pack(): (fases, plataformas, {campo: array})."""
+    magic, version, count, platforms, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("pacote de fases em formato desconhecido")
+
+    fields, offset = {}, HEADER.size
+    for names, code in ((FIELDS_16, "H"), (FIELDS_8, "B")):
+        for name in names:
+            values = array(code)
+            size = values.itemsize * count * platforms
+            values.frombytes(data[offset:offset + size])
+            if byteorder != "little":
+                values.byteswap()
+            fields[name] = values
+            offset += size
+    return count, platforms, fields
+
+
+def build_pack(count, pool=LEVEL_POOL):
+    return encode_pack([generate_level(seed, count) for seed in range(pool)])
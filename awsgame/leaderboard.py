@@ -0,0 +1,337 @@
+"""Placar: o resultado de cada partida, gravado em SQLite e ranqueado.
+
+Pontos, altura e o último serviço alcançado eram calculados no gameOver() e
+jogados fora. Agora o jogo manda o resultado por POST (ver awsgame.routes) e
+recebe de volta a posição e o percentil da partida, que mostra na tela final.
+
+Num workshop, centenas de partidas acabam no mesmo minuto. Nenhuma requisição
+espera o disco: o resultado entra numa fila e uma thread grava em lote, uma
+transação por lote, num banco em modo WAL — quem lê (o app, montando o
+ranking) não bloqueia quem escreve. Posição e percentil saem de memória, de
+uma árvore de Fenwick com a contagem de partidas por pontuação: O(log n) por
+consulta, sem varrer a tabela. O top N também fica em memória; o índice por
+pontuação só é lido uma vez por processo, para carregar as duas coisas.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from html import escape
+
+from awsgame import game, routes
+from awsgame.assets import BUILD_DIR
+
+LEADERBOARD_DIR = BUILD_DIR / "leaderboard"
+DB_PATH = LEADERBOARD_DIR / "leaderboard.sqlite3"
+
+ENDPOINT = "awsgame.leaderboard/results"
+ENDPOINT_URL = routes.route_url(ENDPOINT)
+
+# Toda pontuação do jogo sobe de 25 em 25 (plataforma 75, moeda 100, inimigo
+# 250...), então a árvore conta por degrau de 25 — exata e 25 vezes menor. Uma
+# escalada completa fica longe de 200 mil pontos; MAX_SCORE só barra lixo.
+SCORE_STEP = 25
+MAX_SCORE = 1 << 20
+MAX_HEIGHT_M = 100_000
+
+# O que uma partida pode ganhar. Cada pouso numa plataforma mais alta vale
+# POINTS_PLATFORM, e ela pode ter sido quebrável. Do chão, o pulo alcança a
+# plataforma 2 direto; de uma plataforma, só a seguinte — por isso chegar à p
+# vale entre (p - ROWS_ABOVE) e p pousos. Inimigo, power-up e moeda ficam um de
+# cada por plataforma, e o pulo alcança os de até ROWS_ABOVE plataformas acima
+# da mais alta, sem pousar nelas.
+ROWS_ABOVE = 2
+POINTS_PER_REACHED = game.POINTS_PLATFORM + game.POINTS_BREAKABLE
+POINTS_PER_ROW = game.POINTS_ENEMY + game.POINTS_COIN + max(
+    game.POINTS_LIFE, game.POINTS_SCORE, game.POINTS_POWER,
+)
+
+TOP_KEEP = 50          # quantos do topo ficam em memória
+BATCH_MAX = 500        # resultados por transação
+BATCH_WAIT_SECONDS = 0.05   # espera por mais resultados antes de gravar um lote
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    platform INTEGER NOT NULL,
+    service TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    daily_day INTEGER,
+    level INTEGER,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_score ON results (score DESC, id);
+CREATE INDEX IF NOT EXISTS results_daily ON results (daily_day, score DESC) WHERE daily_day IS NOT NULL;
+"""
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScoreCounts:
+    """Árvore de Fenwick: quantas partidas fizeram cada pontuação."""
+
+    def __init__(self, max_score=MAX_SCORE, step=SCORE_STEP):
+        self.step = step
+        self.size = max_score // step + 1
+        self.tree = array("q", bytes(8 * (self.size + 1)))
+        self.total = 0
+
+    def _slot(self, score):
+        return min(score // self.step, self.size - 1) + 1
+
+    def add(self, score, count=1):
+        self.total += count
+        slot = self._slot(score)
+        while slot <= self.size:
+            self.tree[slot] += count
+            slot += slot & -slot
+
+    def at_most(self, score):
+        """Partidas com pontuação <= score."""
+        slot = self._slot(score)
+        count = 0
+        while slot > 0:
+            count += self.tree[slot]
+            slot -= slot & -slot
+        return count
+
+    def rank(self, score):
+        """Posição de quem fez `score`: 1 + quantas fizeram mais."""
+        return 1 + self.total - self.at_most(score)
+
+    def percentile(self, score):
+        """Percentual de partidas que ficaram abaixo de `score` (0 a 100)."""
+        if not self.total:
+            return 0.0
+        return 100 * self.at_most(score - self.step) / self.total
+
+
+def score_range(platform, platforms):
+    """(mínimo, máximo) de pontos de uma partida que chegou à plataforma `platform`.
+
+    `platforms` é quantas a fase tem além do chão: perto do topo, não há
+    ROWS_ABOVE linhas acima para contar.
+    """
+    rows = min(platform + 1 + ROWS_ABOVE, platforms + 1)
+    low = max(0, platform - ROWS_ABOVE) * game.POINTS_PLATFORM
+    return low, platform * POINTS_PER_REACHED + rows * POINTS_PER_ROW
+
+
+def max_height(platform):
+    """Altura máxima, em metros, de quem não passou da plataforma `platform`."""
+    return (platform + ROWS_ABOVE) * game.PLATFORM_SPACING // game.PIXELS_PER_METER
+
+
+def parse_result(body, catalog):
+    """Valida o resultado que o jogo manda e resolve o serviço pelo catálogo.
+
+    O nome do serviço não vem do navegador: vem da plataforma, que tem de
+    existir. Pontos e altura têm de caber no que essa plataforma permite
+    (score_range() e max_height()) — é o que barra um POST forjado com a
+    pontuação que quiser. ValueError se não for um resultado.
+    """
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"JSON inválido: {exc}") from None
+    if not isinstance(data, dict):
+        raise ValueError("esperava um objeto")
+
+    def integer(name, high, required=True):
+        value = data.get(name)
+        if value is None and not required:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= high:
+            raise ValueError(f"{name}: esperava um inteiro entre 0 e {high}")
+        return value
+
+    score = integer("score", MAX_SCORE)
+    if score % SCORE_STEP:
+        raise ValueError(f"score: esperava um múltiplo de {SCORE_STEP}")
+    platform = integer("platform", len(catalog))
+    won = data.get("won") is True
+    if won and platform != len(catalog):
+        raise ValueError("vitória sem chegar ao topo")
+    low, high = score_range(platform, len(catalog))
+    if not low <= score <= high:
+        raise ValueError(f"score: com a plataforma {platform}, esperava entre {low} e {high}")
+    height = integer("height", MAX_HEIGHT_M)
+    if height > max_height(platform):
+        raise ValueError(f"height: acima do que a plataforma {platform} alcança")
+    return {
+        "score": score,
+        "height": height,
+        "platform": platform,
+        "service": catalog[platform - 1]["name"] if platform else "Início",
+        "won": won,
+        "daily_day": integer("dailyDay", 1_000_000, required=False),
+        "level": integer("level", 1_000, required=False),
+    }
+
+
+class Leaderboard:
+    """O placar de um processo: fila de escrita, contagens e topo em memória."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self.counts = ScoreCounts()
+        self._top = []
+        self._daily_top = {}
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            # Uma vez por processo, e só pelo índice: nem a linha é lida.
+            for score, count in db.execute("SELECT score, COUNT(*) FROM results GROUP BY score"):
+                self.counts.add(score, count)
+            self._top = [
+                _entry(*row) for row in db.execute(
+                    "SELECT score, height, service, won FROM results ORDER BY score DESC, id LIMIT ?",
+                    (TOP_KEEP,),
+                )
+            ]
+        self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        # Em WAL, NORMAL só arrisca a última transação se a MÁQUINA cair.
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def submit(self, result):
+        """Enfileira o resultado e devolve posição e percentil dele, na hora."""
+        result = dict(result, created=time.time())
+        entry = _entry(result["score"], result["height"], result["service"], result["won"])
+        with self._lock:
+            self.counts.add(result["score"])
+            rank = self.counts.rank(result["score"])
+            percentile = self.counts.percentile(result["score"])
+            _insert_top(self._top, entry)
+            day = result["daily_day"]
+            if day is not None and day in self._daily_top:
+                _insert_top(self._daily_top[day], entry)
+            total = self.counts.total
+            # Na fila ainda sob o lock: o flush() de daily_top() não pode ver
+            # a lista do dia sem este resultado e o índice também sem ele.
+            self._queue.put(result)
+        return {"rank": rank, "total": total, "percentile": round(percentile, 1)}
+
+    def top(self, limit=10):
+        with self._lock:
+            return self._top[:limit]
+
+    def daily_top(self, day, limit=10):
+        """O topo da escalada do dia. Na primeira consulta do dia, lê o índice.
+
+        Até lá, submit() não mantém a lista do dia. O flush() e a leitura são
+        feitos sob o lock: um submit() no meio não entraria nem no índice lido
+        nem na lista, e espera — só nesta consulta, uma vez por dia.
+        """
+        with self._lock:
+            if day not in self._daily_top:
+                self.flush()
+                with self._connect() as db:
+                    rows = db.execute(
+                        "SELECT score, height, service, won FROM results WHERE daily_day = ?"
+                        " ORDER BY score DESC, id LIMIT ?",
+                        (day, TOP_KEEP),
+                    ).fetchall()
+                # Só o dia corrente importa: os anteriores saem da memória.
+                self._daily_top = {day: [_entry(*row) for row in rows]}
+            return self._daily_top[day][:limit]
+
+    def flush(self):
+        """Espera a fila esvaziar — para a linha de comando e para o atexit."""
+        self._queue.join()
+
+    def _write_loop(self):
+        db = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_WAIT_SECONDS
+            while len(batch) < BATCH_MAX:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO results (score, height, platform, service, won, daily_day, level, created)"
+                        " VALUES (:score, :height, :platform, :service, :won, :daily_day, :level, :created)",
+                        batch,
+                    )
+            except sqlite3.Error:
+                _LOGGER.exception("Falha ao gravar %d resultado(s) em %s", len(batch), self.path)
+            for _ in batch:
+                self._queue.task_done()
+
+
+def _entry(score, height, service, won):
+    return {"score": score, "height": height, "service": service, "won": bool(won)}
+
+
+def _insert_top(top, entry):
+    # Empate fica atrás de quem chegou antes, como no ORDER BY score DESC, id.
+    index = len(top)
+    while index and top[index - 1]["score"] < entry["score"]:
+        index -= 1
+    if index < TOP_KEEP:
+        top.insert(index, entry)
+        del top[TOP_KEEP:]
+
+
+_board = None
+_board_lock = threading.Lock()
+
+
+def board():
+    """O placar do processo, aberto na primeira chamada."""
+    global _board
+    with _board_lock:
+        if _board is None:
+            _board = Leaderboard()
+            atexit.register(_board.flush)
+        return _board
+
+
+def register_leaderboard(catalog):
+    """Aceita POST em component/awsgame.leaderboard/results (ver awsgame.routes)."""
+    routes.register_post(ENDPOINT, lambda body: board().submit(parse_result(body, catalog)))
+
+
+def ranking_html(entries, title):
+    """Um bloco de HTML com o ranking, para a sidebar do app."""
+    lines = [f'<div class="aws-ranking"><h4>{escape(title)}</h4>']
+    if not entries:
+        lines.append("<p>Ninguém ainda. Seja o primeiro!</p>")
+    for position, entry in enumerate(entries, 1):
+        trophy = " 🏆" if entry["won"] else ""
+        lines.append(
+            f"<p><b>{position}.</b> {entry['score']:,} pts · {entry['height']} m · "
+            f"{escape(entry['service'])}{trophy}</p>"
+        )
+    lines.append("</div>")
+    return "\n".join(lines)
+
+
+def format_top(entries):
+    if not entries:
+        return "Nenhum resultado ainda."
+    lines = [f"{'#':>3} {'pontos':>9} {'altura':>8}  serviço"]
+    for position, entry in enumerate(entries, 1):
+        won = " (venceu)" if entry["won"] else ""
+        lines.append(
+            f"{position:>3} {entry['score']:>9,} {entry['height']:>6} m  {entry['service']}{won}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,275 @@
+"""Analisador de alcançabilidade das fases, vetorizado com NumPy.
+
+O gerador de fases (awsgame.layouts) sorteia x e largura de cada plataforma;
+nada garantia que toda fase sorteada desse para escalar. Este módulo reproduz as regras de um tick do
+Player.update() e do checkPlatformCollisions() — gravidade, atrito, pulo de
+força fixa, pouso só descendo e com a cabeça acima do topo, volta pela borda —
+e responde, para milhões de fases sorteadas, se cada plataforma alcança a de
+cima.
+
+O pulo é sempre o mesmo (força fixa), então a parte vertical é simulada uma vez:
+ela diz em quais ticks dá para pousar na plataforma de cima e quanto o jogador
+anda na horizontal até lá segurando a seta. O resto é geometria de intervalos
+sobre o círculo de largura GAME_WIDTH + PLAYER_WIDTH (a volta pela borda):
+
+- normal: o jogador decola de qualquer ponto em que fica de pé;
+- móvel: ele pode esperar a fase certa, então vale todo o curso da plataforma,
+  tanto na decolagem quanto no pouso;
+- quebrável: ele só tem BREAK_TICKS para andar do ponto onde pousou até o ponto
+  de decolagem.
+
+`python -m awsgame levels` imprime o resumo. Os parâmetros de ajuste podem ser
+sobrescritos na linha de comando para testar uma mudança antes de fazê-la, e
+`--pack` troca o sorteio pelas fases que o build de fato empacotou.
+"""
+
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from awsgame import game, layouts
+from awsgame.layouts import BREAKABLE, FINAL, GROUND, MOVING, NORMAL, TYPE_NAMES
+
+
+@dataclass(frozen=True)
+class Tuning:
+    """Os números do jogo (awsgame.game), sobrescrevíveis para experimentos."""
+
+    world_width: float = game.GAME_WIDTH
+    player_width: float = game.PLAYER_WIDTH
+    player_height: float = game.PLAYER_HEIGHT
+    player_speed: float = game.PLAYER_SPEED
+    jump_power: float = game.JUMP_POWER
+    gravity: float = game.GRAVITY
+    friction: float = game.FRICTION
+    platform_spacing: float = game.PLATFORM_SPACING
+    platform_min_width: float = game.PLATFORM_MIN_WIDTH
+    platform_width_spread: float = game.PLATFORM_WIDTH_SPREAD
+    moving_every: int = game.MOVING_EVERY
+    breakable_every: int = game.BREAKABLE_EVERY
+    moving_range: float = game.MOVING_RANGE
+    break_ticks: int = game.BREAK_TICKS
+
+
+TUNING_FIELDS = tuple(field.name for field in fields(Tuning))
+
+
+def landing_ticks(tuning, rise):
+    """Ticks, contados da decolagem, em que o pulo pode pousar `rise` px acima.
+
+    Mesma ordem do Player.update(): gravidade, deslocamento, e só então a
+    colisão. O pouso exige velocidade descendo e o topo do jogador acima do topo
+    da plataforma (player.y < platform.y) com os pés abaixo dele. Devolve uma
+    lista vazia se o pulo não sobe tanto.
+    """
+    top = -tuning.player_height   # topo do jogador, com o topo da origem em 0
+    target = -rise
+    velocity = -tuning.jump_power
+    ticks, tick = [], 0
+    while True:
+        tick += 1
+        velocity += tuning.gravity
+        top += velocity
+        if velocity > 0 and top < target < top + tuning.player_height:
+            ticks.append(tick)
+        if velocity > 0 and top >= target:
+            return ticks
+
+
+def horizontal_reach(tuning, ticks):
+    """Deslocamento máximo após `ticks` ticks segurando a seta.
+
+    A tecla repõe velocityX = speed antes do deslocamento, e o atrito só age
+    depois dele — então, segurando, são exatamente `speed` px por tick.
+    """
+    x, velocity = 0.0, 0.0
+    for _ in range(ticks):
+        velocity = tuning.player_speed
+        x += velocity
+        velocity *= tuning.friction
+    return x
+
+
+def jump_reach(tuning, rise):
+    """Alcance horizontal do pulo que sobe `rise` px, ou None se não sobe."""
+    ticks = landing_ticks(tuning, rise)
+    return horizontal_reach(tuning, ticks[-1]) if ticks else None
+
+
+def platform_types(count, tuning):
+    """Tipo de cada índice 0..count, com a mesma regra de layouts.platform_type()."""
+    index = np.arange(count + 1)
+    types = np.full(count + 1, NORMAL, dtype=np.int8)
+    inner = (index > 0) & (index < count)
+    types[inner & (index % tuning.breakable_every == 0)] = BREAKABLE
+    types[inner & (index % tuning.moving_every == 0)] = MOVING   # else-if: móvel vence
+    types[0] = GROUND
+    types[count] = FINAL
+    return types
+
+
+def _stand_intervals(x, width, types, tuning):
+    """[lo, hi) das posições x do jogador em que ele fica de pé na plataforma.
+
+    checkCollision é estrito: de pé é player.x ∈ (x - player_width, x + width).
+    Nas móveis o intervalo cobre todo o curso (o jogador escolhe a fase).
+    """
+    lo = x - tuning.player_width
+    hi = x + width
+    moving = types == MOVING
+    if moving.any():
+        min_x = np.maximum(0, x[:, moving] - tuning.moving_range)
+        max_x = np.minimum(tuning.world_width - width[:, moving], x[:, moving] + tuning.moving_range)
+        # minX >= maxX: a plataforma não tem espaço e fica parada.
+        still = min_x >= max_x
+        lo[:, moving] = np.where(still, lo[:, moving], min_x - tuning.player_width)
+        hi[:, moving] = np.where(still, hi[:, moving], max_x + width[:, moving])
+    return lo, hi
+
+
+def _circular_gap(lo_a, hi_a, lo_b, hi_b, period):
+    """Menor distância entre dois intervalos no círculo (0 se eles se tocam)."""
+    right = lo_b - hi_a   # quanto falta andando para a direita
+    left = lo_a - hi_b    # ...ou para a esquerda
+    # Pela borda, a distância é a do outro lado do círculo.
+    around = np.minimum(right, left)
+    around += period
+    gap = np.maximum(right, left)
+    np.minimum(gap, around, out=gap)
+    np.maximum(gap, 0, out=gap)
+    return gap
+
+
+def sample_layouts(rng, layouts, count, tuning):
+    """x e largura de cada plataforma, sorteados como em layouts.generate_level()."""
+    width = (
+        tuning.platform_min_width
+        + rng.random((layouts, count + 1), dtype=np.float32) * tuning.platform_width_spread
+    )
+    x = rng.random((layouts, count + 1), dtype=np.float32) * (tuning.world_width - width)
+    # O chão ocupa a largura toda.
+    width[:, 0] = tuning.world_width
+    x[:, 0] = 0
+    return x, width
+
+
+def pack_layouts(path):
+    """x e largura das fases de um pacote do build, uma linha por fase."""
+    levels, platforms, arrays = layouts.decode_pack(Path(path).read_bytes())
+    shape = (levels, platforms)
+    x = np.asarray(arrays["x"], dtype=np.float32).reshape(shape)
+    width = np.asarray(arrays["width"], dtype=np.float32).reshape(shape)
+    return x, width
+
+
+def analyze(layouts=1_000_000, count=None, tuning=Tuning(), seed=0, batch=20_000, pack=None):
+    """Sorteia `layouts` fases de `count` plataformas e mede cada pulo.
+
+    Com `pack` = (x, width) de pack_layouts(), mede aquelas fases em vez de
+    sortear. Devolve um dict com, para cada pulo i -> i + 1 (i = 0..count-1), a
+    probabilidade de ele ser impossível e a folga (alcance - distância
+    necessária) média e mínima; mais as checagens que não dependem do sorteio.
+    """
+    if pack is not None:
+        layouts, count = pack[0].shape[0], pack[0].shape[1] - 1
+        batch = layouts
+    if count is None:
+        # As mesmas plataformas que o build empacota: uma por serviço.
+        from awsgame.dataset import ensure_dataset
+        count = len(ensure_dataset())
+
+    reach = jump_reach(tuning, tuning.platform_spacing)
+    types = platform_types(count, tuning)
+    period = tuning.world_width + tuning.player_width
+    walk = tuning.player_speed * tuning.break_ticks
+    breakable = np.flatnonzero(types == BREAKABLE)
+
+    failures = np.zeros(count, dtype=np.int64)
+    slack_sum = np.zeros(count, dtype=np.float64)
+    slack_min = np.full(count, np.inf)
+    rng = np.random.default_rng(seed)
+
+    done = 0
+    while reach is not None and done < layouts:
+        size = min(batch, layouts - done)
+        x, width = pack if pack is not None else sample_layouts(rng, size, count, tuning)
+        lo, hi = _stand_intervals(x, width, types, tuning)
+
+        gap = _circular_gap(lo[:, :-1], hi[:, :-1], lo[:, 1:], hi[:, 1:], period)
+
+        # Na quebrável, a decolagem só pode ser até `walk` px do ponto de pouso,
+        # e o pouso só cai onde o pulo anterior alcança. Aqui a volta pela borda
+        # fica de fora: com o ajuste atual `walk` cobre a plataforma inteira.
+        if breakable.size:
+            src = breakable
+            land_lo = np.maximum(lo[:, src], lo[:, src - 1] - reach)
+            land_hi = np.minimum(hi[:, src], hi[:, src - 1] + reach)
+            takeoff_lo = np.maximum(lo[:, src], land_lo - walk)
+            takeoff_hi = np.minimum(hi[:, src], land_hi + walk)
+            gap[:, src] = _circular_gap(
+                takeoff_lo, takeoff_hi, lo[:, src + 1], hi[:, src + 1], period,
+            )
+
+        slack = reach - gap
+        failures += (slack <= 0).sum(axis=0)
+        slack_sum += slack.sum(axis=0, dtype=np.float64)
+        slack_min = np.minimum(slack_min, slack.min(axis=0))
+        done += size
+
+    if reach is None:   # o pulo nem chega à altura da próxima: tudo falha
+        failures[:] = layouts
+        slack_sum[:] = np.nan
+        slack_min[:] = np.nan
+
+    return {
+        "layouts": layouts,
+        "count": count,
+        "reach": reach,
+        "landing_ticks": landing_ticks(tuning, tuning.platform_spacing),
+        "skip_reach": jump_reach(tuning, 2 * tuning.platform_spacing),
+        "source_types": types[:-1],
+        "failure_probability": failures / layouts,
+        "slack_mean": slack_sum / layouts,
+        "slack_min": slack_min,
+    }
+
+
+def format_report(result, limit=10):
+    source_types = result["source_types"]
+    probability = result["failure_probability"]
+    lines = [
+        f"{result['layouts']:,} fases de {result['count']} plataformas",
+        f"pulo: pousa nos ticks {result['landing_ticks'] or '—'}, "
+        f"alcance horizontal {result['reach'] if result['reach'] is not None else '—'} px",
+    ]
+    if result["skip_reach"] is None:
+        lines.append(
+            "atenção: o pulo não alcança 2 plataformas acima. Se uma quebrável some "
+            "antes de o jogador chegar à seguinte (errou o pulo, levou dano), a "
+            "escalada trava na de baixo."
+        )
+
+    lines.append("")
+    # Agrupa pela ORIGEM do pulo: é nela que a quebrável e a móvel mudam algo.
+    lines.append(f"{'origem':<16} {'pulos':>6} {'P(falha)':>10} {'folga média':>12} {'folga mín':>10}")
+    for code, name in enumerate(TYPE_NAMES):
+        mask = source_types == code
+        if not mask.any():
+            continue
+        lines.append(
+            f"de {name:<13} {int(mask.sum()):>6} {probability[mask].mean():>10.2e} "
+            f"{np.nanmean(result['slack_mean'][mask]):>10.1f}px {np.nanmin(result['slack_min'][mask]):>8.1f}px"
+        )
+
+    worst = np.argsort(-probability, kind="stable")[:limit]
+    worst = [i for i in worst if probability[i] > 0]
+    lines.append("")
+    if not worst:
+        lines.append("nenhum pulo impossível nas fases sorteadas")
+    for i in worst:
+        lines.append(
+            f"plataforma {i:>3} -> {i + 1:>3} ({TYPE_NAMES[source_types[i]]}): "
+            f"P(falha) = {probability[i]:.2e}"
+        )
+    return "\n".join(lines)
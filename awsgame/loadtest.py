@@ -0,0 +1,338 @@
+"""Teste de carga: N sessões simultâneas contra o app.py, sem navegador.
+
+Em workshop, centenas de pessoas abrem a página no mesmo minuto, e não havia
+como prever CPU, memória ou quanto cada uma espera até o jogo aparecer. Aqui
+cada "navegador" é uma corrotina que fala o protocolo do Streamlit direto:
+abre o websocket /_stcore/stream, pede a execução do script (BackMsg
+rerun_script) e lê os ForwardMsg até o script_finished. Quando chega o delta
+do componente do jogo, busca por HTTP o que um navegador de primeira visita
+buscaria — o index.html do componente, o HTML com hash e o pacote de fases —,
+e só então o jogo pode desenhar o primeiro quadro com os botões liberados.
+
+A carga sobe em degraus (`--steps`). Cada degrau roda num servidor novo,
+aquecido por uma sessão que não entra na conta, e as sessões chegam
+espalhadas por `--ramp` segundos e ficam conectadas até o degrau acabar, como
+gente com a aba aberta. Do servidor, lido em /proc, sai a CPU e o pico de RSS;
+da diferença para o servidor ocioso, a memória por sessão. O degrau satura
+quando há erros, quando a CPU passa de SATURATION_CPU ou quando o p95 do
+script passa de SATURATION_FACTOR vezes o do primeiro degrau.
+
+O cliente também gasta CPU — protobuf de centenas de sessões numa thread.
+Numa máquina pequena ele disputa núcleo com o servidor; aí suba o app em outra
+máquina e aponte `--url` para ela. Sem o processo local, o relatório fica só
+com latências e bytes (`--pid` mede um servidor local que já esteja no ar).
+"""
+
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urljoin
+
+from awsgame.assets import BASE_DIR
+
+DEFAULT_STEPS = (1, 10, 50, 100, 200)
+DEFAULT_PORT = 8599
+RAMP_SECONDS = 5.0
+SESSION_TIMEOUT_SECONDS = 60.0
+SERVER_START_TIMEOUT_SECONDS = 30.0
+SAMPLE_SECONDS = 0.2
+
+SATURATION_FACTOR = 3.0
+SATURATION_CPU = 0.9   # fração de um núcleo: o script roda sob o GIL
+
+GAME_COMPONENT = "awsgame.assets.game"
+_LEVELS_URL = re.compile(r'const LEVELS_URL = "([^"]+)"')
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+_PAGE_BYTES = os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, fraction):
+    """Percentil por posição (sem interpolar); None se não há valores."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# --------------------------------------------------------------------------
+# Servidor
+# --------------------------------------------------------------------------
+
+def start_server(port):
+    """Sobe `streamlit run app.py` e espera o /_stcore/health responder."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(BASE_DIR / "app.py"),
+            "--server.port", str(port), "--server.headless", "true",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"o streamlit saiu com código {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"o streamlit não respondeu em {SERVER_START_TIMEOUT_SECONDS:g} s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def process_usage(pid):
+    """(segundos de CPU, RSS em bytes) do processo, lidos em /proc."""
+    with open(f"/proc/{pid}/stat") as stat:
+        # O nome do comando vem entre parênteses e pode ter espaços.
+        fields = stat.read().rpartition(")")[2].split()
+    with open(f"/proc/{pid}/statm") as statm:
+        rss_pages = int(statm.read().split()[1])
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS, rss_pages * _PAGE_BYTES
+
+
+async def _sample(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(process_usage(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+# --------------------------------------------------------------------------
+# Sessões
+# --------------------------------------------------------------------------
+
+async def _fetch_game(http, base_url, bundle_name):
+    """O que um navegador sem cache baixa até o primeiro quadro. Devolve os bytes."""
+    page = f"{base_url}/component/{GAME_COMPONENT}/{bundle_name}"
+    total = 0
+    for url in (urljoin(page, "index.html"), page):
+        response = await http.fetch(url, request_timeout=SESSION_TIMEOUT_SECONDS)
+        total += len(response.body)
+    levels = _LEVELS_URL.search(response.body.decode("utf-8"))
+    if levels:
+        # Relativa ao HTML do jogo, como o navegador a resolveria.
+        response = await http.fetch(urljoin(page, levels.group(1)), request_timeout=SESSION_TIMEOUT_SECONDS)
+        total += len(response.body)
+    return total
+
+
+async def run_session(base_url, http, release, measured):
+    """Uma sessão de navegador: conecta, roda o script, baixa o jogo e espera `release`.
+
+    Antes de esperar, põe o resultado em `measured`: quem roda o degrau sabe
+    assim que todas as sessões estão de pé.
+    """
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from tornado.websocket import websocket_connect
+
+    result = {"ok": False, "ws_bytes": 0, "http_bytes": 0}
+    start = time.perf_counter()
+    socket = await websocket_connect(base_url.replace("http", "ws", 1) + "/_stcore/stream")
+    try:
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        request.rerun_script.page_script_hash = ""
+        sent = time.perf_counter()
+        socket.write_message(request.SerializeToString(), binary=True)
+
+        game = None
+        while True:
+            raw = await socket.read_message()
+            if raw is None:
+                raise ConnectionError("o servidor fechou o websocket")
+            result["ws_bytes"] += len(raw)
+            message = ForwardMsg()
+            message.ParseFromString(raw)
+            kind = message.WhichOneof("type")
+            if kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    raise RuntimeError(element.exception.message)
+                if element.WhichOneof("type") == "component_instance" and game is None:
+                    bundle_name = json.loads(element.component_instance.json_args)["bundle"]
+                    # O navegador começa a baixar o jogo assim que o delta chega.
+                    game = asyncio.ensure_future(_fetch_game(http, base_url, bundle_name))
+            elif kind == "script_finished":
+                break
+        result["script_ms"] = (time.perf_counter() - sent) * 1000
+        if game is None:
+            raise RuntimeError("o script terminou sem o componente do jogo")
+        result["http_bytes"] = await game
+        result["first_frame_ms"] = (time.perf_counter() - start) * 1000
+        result["ok"] = True
+        measured.append(result)
+        await release.wait()
+    finally:
+        socket.close()
+    return result
+
+
+async def _run_step(base_url, sessions, ramp, pid):
+    from tornado.httpclient import AsyncHTTPClient
+
+    # Um cliente HTTP à parte para o degrau, sem o teto padrão de 10 conexões.
+    http = AsyncHTTPClient(force_instance=True, max_clients=max(10, sessions))
+    release = asyncio.Event()
+    measured = []
+    samples, stop = [], asyncio.Event()
+    idle = process_usage(pid) if pid else None
+    sampler = asyncio.ensure_future(_sample(pid, samples, stop)) if pid else None
+
+    async def delayed(index):
+        await asyncio.sleep(ramp * index / sessions)
+        try:
+            return await asyncio.wait_for(
+                run_session(base_url, http, release, measured), SESSION_TIMEOUT_SECONDS + ramp,
+            )
+        except Exception as exc:  # cada falha conta como erro do degrau
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(delayed(i)) for i in range(sessions)]
+    # Todas conectadas (ou falhas) antes de medir o pico: é quando o servidor
+    # segura mais estado.
+    while len(measured) + sum(t.done() for t in tasks) < sessions:
+        await asyncio.sleep(SAMPLE_SECONDS)
+    elapsed = time.perf_counter() - started
+    if pid:
+        samples.append(process_usage(pid))
+    release.set()
+    results = await asyncio.gather(*tasks)
+    if sampler:
+        stop.set()
+        await sampler
+    http.close()
+
+    ok = [r for r in results if r["ok"]]
+    step = {
+        "sessions": sessions,
+        "errors": len(results) - len(ok),
+        "error": next((r["error"] for r in results if "error" in r), None),
+        "script_ms": [r["script_ms"] for r in ok],
+        "first_frame_ms": [r["first_frame_ms"] for r in ok],
+        "ws_bytes": statistics.mean(r["ws_bytes"] for r in ok) if ok else 0,
+        "http_bytes": statistics.mean(r["http_bytes"] for r in ok) if ok else 0,
+    }
+    if pid:
+        cpu_seconds = samples[-1][0] - idle[0]
+        peak_rss = max(rss for _, rss in samples)
+        step.update({
+            "cpu": cpu_seconds / elapsed,
+            "idle_rss": idle[1],
+            "peak_rss": peak_rss,
+            "rss_per_session": (peak_rss - idle[1]) / sessions,
+        })
+    return step
+
+
+async def _warm_up(base_url):
+    from tornado.httpclient import AsyncHTTPClient
+
+    http = AsyncHTTPClient(force_instance=True)
+    release = asyncio.Event()
+    release.set()
+    try:
+        await run_session(base_url, http, release, [])
+    finally:
+        http.close()
+
+
+def run_load(steps=DEFAULT_STEPS, ramp=RAMP_SECONDS, port=DEFAULT_PORT, url=None, pid=None):
+    """Roda os degraus e devolve um resultado por degrau.
+
+    Sem `url`, cada degrau sobe o próprio servidor em `port` e mede o processo
+    dele. Com `url`, usa o servidor já no ar — e só mede CPU e memória se
+    `pid` vier junto.
+    """
+    results = []
+    for sessions in steps:
+        process = None
+        base_url = url.rstrip("/") if url else f"http://localhost:{port}"
+        if url is None:
+            process = start_server(port)
+            pid = process.pid
+        try:
+            asyncio.run(_warm_up(base_url))
+            results.append(asyncio.run(_run_step(base_url, sessions, ramp, pid)))
+        finally:
+            if process is not None:
+                stop_server(process)
+        print(format_step(results[-1]), file=sys.stderr, flush=True)
+    return results
+
+
+# --------------------------------------------------------------------------
+# Relatório
+# --------------------------------------------------------------------------
+
+def saturation(results):
+    """(sessões, motivo) do primeiro degrau saturado, ou None."""
+    if not results or not results[0]["script_ms"]:
+        return None
+    reference = percentile(results[0]["script_ms"], 0.95)
+    for step in results:
+        if step["errors"]:
+            return step["sessions"], f"{step['errors']} sessões falharam ({step['error']})"
+        if step.get("cpu", 0) >= SATURATION_CPU:
+            return step["sessions"], f"CPU do servidor em {step['cpu']:.0%} de um núcleo"
+        p95 = percentile(step["script_ms"], 0.95)
+        if p95 > SATURATION_FACTOR * reference:
+            return step["sessions"], f"p95 do script {p95 / reference:.1f}x o de {results[0]['sessions']} sessão(ões)"
+    return None
+
+
+def _ms(values, fraction):
+    value = percentile(values, fraction)
+    return "—" if value is None else f"{value:,.0f}"
+
+
+HEADER = (
+    f"{'sessões':>7} {'erros':>5} {'script p50/p95/p99 ms':>22} {'1º quadro p50/p95 ms':>21}"
+    f" {'ws KB':>7} {'http KB':>8} {'CPU':>5} {'RSS pico':>9} {'MB/sessão':>10}"
+)
+
+
+def format_step(step):
+    script = "/".join(_ms(step["script_ms"], f) for f in (0.5, 0.95, 0.99))
+    frame = "/".join(_ms(step["first_frame_ms"], f) for f in (0.5, 0.95))
+    line = (
+        f"{step['sessions']:>7} {step['errors']:>5} {script:>22} {frame:>21}"
+        f" {step['ws_bytes'] / 1024:>7.1f} {step['http_bytes'] / 1024:>8.1f}"
+    )
+    if "cpu" in step:
+        line += (
+            f" {step['cpu']:>5.0%} {step['peak_rss'] / 2**20:>6.0f} MB"
+            f" {step['rss_per_session'] / 2**20:>10.2f}"
+        )
+    return line
+
+
+def format_results(results):
+    lines = [HEADER, *(format_step(step) for step in results)]
+    if results and "idle_rss" in results[0]:
+        lines.append(f"Servidor aquecido e ocioso: {results[0]['idle_rss'] / 2**20:.0f} MB de RSS.")
+    saturated = saturation(results)
+    if saturated:
+        lines.append(f"Saturou em {saturated[0]} sessões: {saturated[1]}.")
+    elif results:
+        lines.append(f"Não saturou até {results[-1]['sessions']} sessões.")
+    return "\n".join(lines)
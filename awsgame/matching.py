@@ -0,0 +1,234 @@
+"""Casamento de nomes de serviço entre catálogos, para a curadoria.
+
+Os relatórios de curadoria/ (3_em_ambos, 4_quase_casamentos,
+1_adicionar_do_tetris...) saíram de cruzar os nomes do jogo com o tetris
+(comandos.json), o catálogo oficial e as páginas da documentação. Os nomes
+nunca batem de primeira — "Key Management Service" no tetris é "KMS Key
+Management Service (KMS)" no jogo —, e comparar todo nome com todo nome cresce
+com o produto dos catálogos.
+
+Aqui cada nome vira uma chave normalizada (a mesma das chaves do
+merged_wip.json: minúsculas, sem acento, sem pontuação, sem o "AWS"/"Amazon"
+do começo) e a chave vira trigramas, por palavra, como no pg_trgm. Um índice
+invertido trigrama -> itens responde:
+
+- casamento exato, pela chave, pelo nome sem o parêntese ("command line
+  interface (cli)" -> "command line interface") ou pela sigla das palavras
+  contra a chave do outro lado ("Key Management Service" ~ "AWS KMS"). Sigla
+  contra sigla não vale: "Lookout for Equipment" e "Lambda@Edge" são "le";
+- candidatos parecidos, por similaridade de Jaccard entre os trigramas.
+
+A busca de parecidos não varre o catálogo. Para um item passar do limiar
+`threshold`, ele precisa dividir com a consulta pelo menos um dos
+len(q) - ceil(threshold * len(q)) + 1 trigramas mais raros dela (filtro de
+prefixo). Só as listas desses trigramas são lidas, e só os itens que aparecem
+nelas têm a similaridade calculada, e só se passarem por dois filtros baratos:
+
+- tamanho: com Jaccard >= threshold, o candidato tem entre threshold * len(q)
+  e len(q) / threshold trigramas;
+- contagem: Jaccard >= t exige dividir ao menos t * (len(q) + len(c)) / (1 + t)
+  trigramas. Quem aparece h vezes nas listas lidas divide no máximo h mais os
+  trigramas da consulta que ficaram de fora do prefixo.
+
+Trigrama comum ("ser", "vic") fica de fora da geração de candidatos, que é
+justamente onde o custo estaria.
+"""
+
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+
+from awsgame import services
+from awsgame.assets import BASE_DIR
+
+CURATION_DIR = BASE_DIR / "curadoria"
+
+# Limiar de "quase casamento": abaixo disso, os pares que aparecem são nomes
+# que só dividem palavras genéricas ("Service", "Manager").
+NEAR_THRESHOLD = 0.5
+
+_VENDOR_PREFIX = re.compile(r"^(?:aws|amazon) ")
+_NOT_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENTHESIS = re.compile(r"\([^)]*\)")
+# Ficam fora da sigla: "Identity and Access Management" é IAM.
+_ACRONYM_SKIP = frozenset(("and", "for", "of", "on", "the", "to", "e", "de", "do", "da", "para", "na", "no"))
+
+
+def normalize_key(name):
+    """A chave de comparação de um nome, no formato das chaves do merged_wip.json."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    key = _NOT_ALNUM.sub(" ", text.lower()).strip()
+    return _VENDOR_PREFIX.sub("", key)
+
+
+def aliases(name):
+    """(chaves, sigla) de um nome: a chave com e sem o parêntese, e a sigla ou None."""
+    bare = normalize_key(_PARENTHESIS.sub(" ", name))
+    keys = list(dict.fromkeys(key for key in (normalize_key(name), bare) if key))
+    words = [word for word in bare.split() if word not in _ACRONYM_SKIP]
+    acronym = "".join(word[0] for word in words) if len(words) >= 2 else None
+    return keys, acronym
+
+
+def trigrams(key):
+    """Trigramas de cada palavra com duas margens no começo e uma no fim."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """Jaccard entre dois conjuntos de trigramas."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class TrigramIndex:
+    """Índice de um catálogo: chave exata e trigramas -> posições."""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.keys = []
+        self.grams = []
+        self.by_key = {}
+        self.by_acronym = {}
+        self.postings = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        key = normalize_key(name)
+        grams = trigrams(key)
+        position = len(self.names)
+        self.names.append(name)
+        self.keys.append(key)
+        self.grams.append(grams)
+        keys, acronym = aliases(name)
+        for alias in keys:
+            self.by_key.setdefault(alias, position)
+        if acronym:
+            self.by_acronym.setdefault(acronym, position)
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(position)
+        return position
+
+    def exact(self, name):
+        """A posição do item com a mesma chave, ou cuja sigla é a chave, ou None.
+
+        A chave vence a sigla: "ECS" casa com o item de chave "ecs" antes de
+        casar com a sigla de "Elastic Container Service".
+        """
+        keys, acronym = aliases(name)
+        positions = [self.by_key.get(key) for key in keys]
+        positions += [self.by_acronym.get(key) for key in keys]
+        if acronym:
+            positions.append(self.by_key.get(acronym))
+        return next((position for position in positions if position is not None), None)
+
+    def candidates(self, name, threshold=NEAR_THRESHOLD, limit=5):
+        """Até `limit` pares (similaridade, posição) acima do limiar, melhor primeiro."""
+        query = trigrams(normalize_key(name))
+        if not query:
+            return []
+        size = len(query)
+        # Do mais raro para o mais comum; trigrama ausente do índice não gera nada.
+        rare = sorted(query, key=lambda gram: len(self.postings.get(gram, ())))
+        prefix = size - math.ceil(threshold * size) + 1
+        hits = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in rare[:prefix]))
+
+        low, high = threshold * size, size / threshold
+        rest = size - prefix
+        ratio = threshold / (1 + threshold)
+        scored = []
+        for position, count in hits.items():
+            grams = self.grams[position]
+            other = len(grams)
+            if not low <= other <= high or count + rest < ratio * (size + other):
+                continue
+            shared = len(query & grams)
+            score = shared / (size + other - shared)
+            if score >= threshold:
+                scored.append((score, position))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        return scored[:limit]
+
+
+def reconcile(left, right, threshold=NEAR_THRESHOLD):
+    """Cruza duas listas de nomes, como os relatórios da curadoria.
+
+    Devolve um dict com:
+      both   [(esquerda, direita)] — mesma chave
+      near   [(esquerda, direita, similaridade)] — o melhor parecido de cada
+             nome da esquerda sem casamento exato, se passar do limiar
+      only_left, only_right — o que sobrou de cada lado
+
+    Cada nome da direita casa uma vez só: o primeiro exato leva, e um
+    parecido já usado por outro nome não aparece de novo.
+    """
+    index = TrigramIndex(right)
+    used = set()
+    both, pending = [], []
+    for name in left:
+        position = index.exact(name)
+        if position is None or position in used:
+            pending.append(name)
+            continue
+        used.add(position)
+        both.append((name, index.names[position]))
+
+    near, only_left = [], []
+    for name in pending:
+        for score, position in index.candidates(name, threshold):
+            if position not in used:
+                used.add(position)
+                near.append((name, index.names[position], score))
+                break
+        else:
+            only_left.append(name)
+    only_right = [name for position, name in enumerate(index.names) if position not in used]
+    return {"both": both, "near": near, "only_left": only_left, "only_right": only_right}
+
+
+def _json(name):
+    return json.loads((CURATION_DIR / name).read_text(encoding="utf-8"))
+
+
+# Os catálogos que a curadoria cruza, pelo nome usado na linha de comando.
+CATALOGS = {
+    "jogo": lambda: [node["name"] for node in services.read_nodes()],
+    "tetris": lambda: [item["comando"] for item in _json("comandos.json")],
+    "oficial": lambda: [item["name"] for item in _json("aws_catalogo_oficial.json")],
+    "docs": lambda: [item["key"] for item in _json("oficial_docs.json")],
+}
+
+
+def load_catalog(name):
+    """Os nomes de um catálogo de CATALOGS ou de um JSON qualquer com uma lista de "name"."""
+    if name in CATALOGS:
+        return CATALOGS[name]()
+    return [item["name"] for item in json.loads(Path(name).read_text(encoding="utf-8"))]
+
+
+def format_reconciliation(result, left_label, right_label):
+    width = max((len(name) for name, _, _ in result["near"]), default=0)
+    lines = [
+        f"{left_label} x {right_label}: {len(result['both'])} em ambos, "
+        f"{len(result['near'])} quase casamentos, {len(result['only_left'])} só em {left_label}, "
+        f"{len(result['only_right'])} só em {right_label}",
+    ]
+    if result["near"]:
+        lines += ["", f"QUASE-CASAMENTOS — conferir se são o mesmo serviço ({len(result['near'])})"]
+        for name, match, score in sorted(result["near"], key=lambda item: -item[2]):
+            lines.append(f"{left_label}: {name:<{width}}  ~~ {right_label}: {match}  ({score:.2f})")
+    return "\n".join(lines)
@@ -0,0 +1,189 @@
+"""Executor incremental de etapas com entradas e saídas declaradas.
+
+Cada etapa diz o que lê e o que grava. O executor guarda, em
+build/pipeline/state.json, o sha256 de cada entrada e de cada saída da última
+execução, e só roda de novo a etapa em que algum desses hashes mudou — ou em
+que uma saída sumiu. O código da etapa conta como entrada: o arquivo do módulo
+que define `run` entra no hash junto, e `code` lista os outros módulos de que
+ela depende (o `run` que chama matching.reconcile() precisa de matching.py ali).
+
+`run()` não grava nada: devolve {caminho: bytes} e quem grava é o executor, só
+o que mudou de fato. Saída igual à anterior não acorda as etapas de baixo —
+trocar uma descrição refaz o servicos.json, mas não o cruzamento de nomes,
+que só olha os nomes.
+
+Etapas independentes rodam em paralelo, numa thread cada: o executor solta
+uma etapa assim que as que produzem as entradas dela terminam.
+
+Saída editada à mão (hash diferente do que o executor gravou) não é
+sobrescrita: o executor para com PipelineError, a não ser com force=True.
+"""
+
+import hashlib
+import inspect
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from awsgame.assets import BUILD_DIR
+
+STATE_PATH = BUILD_DIR / "pipeline" / "state.json"
+STATE_VERSION = 1
+
+
+class PipelineError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    inputs: tuple
+    outputs: tuple
+    run: Callable[[], dict]
+    # Arquivos de código além do módulo de `run`. Só entram no hash: não
+    # ordenam as etapas, como `inputs`.
+    code: tuple = ()
+
+
+def file_hash(path):
+    """sha256 do conteúdo, ou None se o arquivo não existe."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def _order(stages):
+    """Quem produz cada arquivo e de quais etapas cada uma depende. Rejeita ciclos."""
+    producer = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producer:
+                raise PipelineError(f"{output} é saída de {producer[output]} e de {stage.name}")
+            producer[output] = stage.name
+    upstream = {
+        stage.name: {producer[path] for path in stage.inputs if path in producer} - {stage.name}
+        for stage in stages
+    }
+    done, pending = set(), set(upstream)
+    while pending:
+        ready = {name for name in pending if upstream[name] <= done}
+        if not ready:
+            raise PipelineError(f"ciclo entre as etapas: {', '.join(sorted(pending))}")
+        done |= ready
+        pending -= ready
+    return upstream
+
+
+class Runner:
+    def __init__(self, stages, state_path=STATE_PATH, workers=4, force=False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.upstream = _order(stages)
+        self.state_path = Path(state_path)
+        self.workers = workers
+        self.force = force
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return state.get("stages", {}) if state.get("version") == STATE_VERSION else {}
+
+    def _save_state(self):
+        data = json.dumps({"version": STATE_VERSION, "stages": self.state}, indent=1, sort_keys=True)
+        _write_atomic(self.state_path, data.encode("utf-8"))
+
+    def _input_hashes(self, stage):
+        paths = [*stage.inputs, Path(inspect.getsourcefile(stage.run)), *stage.code]
+        return {str(path): file_hash(path) for path in paths}
+
+    def _check(self, stage):
+        """(precisa rodar?, hashes das entradas agora)."""
+        inputs = self._input_hashes(stage)
+        missing = [path for path, digest in inputs.items() if digest is None]
+        if missing:
+            raise PipelineError(f"{stage.name}: entrada não existe: {', '.join(missing)}")
+        record = self.state.get(stage.name)
+        if record is None:
+            return True, inputs
+        stale = record["inputs"] != inputs
+        for path in stage.outputs:
+            recorded, current = record["outputs"].get(str(path)), file_hash(path)
+            if current is None or recorded is None:
+                stale = True
+            elif current != recorded and not self.force:
+                raise PipelineError(
+                    f"{path} foi editado à mão desde a última execução de {stage.name}. "
+                    "Leve a edição para as entradas da etapa ou rode com force."
+                )
+            elif current != recorded:
+                stale = True
+        return stale, inputs
+
+    def _execute(self, stage):
+        """Roda uma etapa se preciso. Devolve o resumo dela."""
+        start = time.perf_counter()
+        stale, inputs = self._check(stage)
+        if not stale:
+            return {"stage": stage.name, "ran": False, "changed": [], "ms": 0.0}
+        produced = stage.run()
+        if set(produced) != set(stage.outputs):
+            raise PipelineError(f"{stage.name}: devolveu {sorted(map(str, produced))}, não as saídas declaradas")
+        changed, outputs = [], {}
+        for path, data in produced.items():
+            digest = hashlib.sha256(data).hexdigest()
+            if digest != file_hash(path):
+                _write_atomic(Path(path), data)
+                changed.append(path)
+            outputs[str(path)] = digest
+        self.state[stage.name] = {"inputs": inputs, "outputs": outputs}
+        return {"stage": stage.name, "ran": True, "changed": changed, "ms": (time.perf_counter() - start) * 1000}
+
+    def run(self):
+        """Roda o que estiver velho, em ordem de dependência.
+
+        Devolve um resumo por etapa, na ordem em que foram declaradas.
+        """
+        results, done, running = [], set(), {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            try:
+                while len(done) < len(self.stages):
+                    for name, stage in self.stages.items():
+                        if name not in done and name not in running.values() and self.upstream[name] <= done:
+                            running[pool.submit(self._execute, stage)] = name
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done.add(running.pop(future))
+                        results.append(future.result())
+            finally:
+                # O que terminou fica registrado mesmo se outra etapa falhou.
+                wait(running)
+                self._save_state()
+        order = list(self.stages)
+        return sorted(results, key=lambda result: order.index(result["stage"]))
+
+
+def format_results(results, total_ms):
+    lines = []
+    for result in results:
+        if not result["ran"]:
+            lines.append(f"  {result['stage']:<28} em dia")
+            continue
+        changed = ", ".join(Path(path).name for path in result["changed"]) or "nada mudou"
+        lines.append(f"  {result['stage']:<28} {result['ms']:>7.1f} ms  -> {changed}")
+    ran = sum(result["ran"] for result in results)
+    lines.append(f"{ran} de {len(results)} etapas rodaram em {total_ms:.0f} ms")
+    return "\n".join(lines)
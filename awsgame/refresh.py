@@ -0,0 +1,337 @@
+"""Atualização das páginas dos catálogos oficiais, com cache HTTP em disco.
+
+O `meta` do oficial_coletado.json é a descrição (<meta name="description">)
+da página de cada serviço em aws.amazon.com, e o aws_catalogo_oficial.json
+aponta para as mesmas páginas. Conferir se elas mudaram era abrir uma por uma.
+Aqui cada página vira uma corrotina, com dois limites:
+
+- CONCURRENCY requisições em voo no total;
+- por host, PER_HOST em voo e uma nova a cada HOST_INTERVAL_SECONDS — quase
+  tudo está em aws.amazon.com, e rajada demais ali vira 429.
+
+A resposta vai para um cache endereçado pelo conteúdo: build/refresh/objects/
+guarda cada corpo pelo sha256 (páginas iguais ocupam um arquivo só), e o
+index.json liga cada URL ao hash, ao ETag e ao Last-Modified da última
+resposta. Na rodada seguinte, a requisição leva If-None-Match e
+If-Modified-Since; página que não mudou volta 304, sem corpo, e sai do cache.
+
+Para rodar sem rede (`--fixtures`), write_fixtures() gera uma página por URL a
+partir das descrições já coletadas, e serve_fixtures() as serve em
+127.0.0.1 com o StaticFileHandler do tornado, que responde ETag,
+Last-Modified e 304 como um servidor de verdade. O cache dessas rodadas fica à
+parte, em build/refresh/fixtures-cache/.
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from awsgame.assets import BUILD_DIR
+from awsgame.matching import CURATION_DIR
+
+COLLECTED_PATH = CURATION_DIR / "oficial_coletado.json"
+CATALOG_PATH = CURATION_DIR / "aws_catalogo_oficial.json"
+
+CACHE_DIR = BUILD_DIR / "refresh"
+FIXTURES_DIR = CACHE_DIR / "fixtures"
+FIXTURE_CACHE_DIR = CACHE_DIR / "fixtures-cache"
+
+CONCURRENCY = 16
+PER_HOST = 4
+HOST_INTERVAL_SECONDS = 0.1
+REQUEST_TIMEOUT_SECONDS = 30.0
+USER_AGENT = "awsgame-refresh/1"
+
+# Atraso do servidor de fixtures: sem ele, tudo responde em menos de 1 ms e
+# não há o que a concorrência esconder.
+FIXTURE_LATENCY_SECONDS = 0.05
+
+_META = re.compile(
+    r"<meta\s+(?:name|property)=[\"'](?:description|og:description)[\"']\s+content=[\"']([^\"']*)[\"']",
+    re.IGNORECASE,
+)
+
+
+def catalog_urls():
+    """As URLs dos dois catálogos, sem repetir, na ordem dos arquivos."""
+    urls = []
+    for path in (COLLECTED_PATH, CATALOG_PATH):
+        urls += [item["url"] for item in json.loads(path.read_text(encoding="utf-8")) if item.get("url")]
+    return list(dict.fromkeys(urls))
+
+
+def extract_description(body):
+    """O conteúdo do <meta name="description"> (ou og:description), ou ""."""
+    match = _META.search(body.decode("utf-8", "replace"))
+    return html.unescape(match.group(1)).strip() if match else ""
+
+
+class ResponseCache:
+    """Corpos por sha256 em objects/, e URL -> (hash, ETag, Last-Modified) no index.json."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = Path(directory)
+        self.objects = self.directory / "objects"
+        self.index_path = self.directory / "index.json"
+        try:
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    def _object(self, digest):
+        return self.objects / digest[:2] / digest
+
+    def conditional_headers(self, url):
+        """If-None-Match e If-Modified-Since, se o corpo da última resposta está no cache."""
+        entry = self.index.get(url)
+        if not entry or not self._object(entry["sha256"]).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url):
+        return self._object(self.index[url]["sha256"]).read_bytes()
+
+    def store(self, url, body, headers):
+        """Grava a resposta 200. Devolve True se o corpo é outro que o da última vez."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(body)
+            tmp.replace(path)
+        previous = self.index.get(url, {}).get("sha256")
+        self.index[url] = {
+            "sha256": digest,
+            "etag": headers.get("Etag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }
+        return digest != previous
+
+    def revalidated(self, url, headers):
+        """Resposta 304: o corpo do cache vale; o servidor pode ter mandado um ETag novo."""
+        entry = self.index[url]
+        entry["etag"] = headers.get("Etag", entry.get("etag"))
+        entry["last_modified"] = headers.get("Last-Modified", entry.get("last_modified"))
+        entry["fetched"] = time.time()
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.index, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.index_path)
+
+
+class HostLimiter:
+    """Até `per_host` requisições em voo por host, e uma nova a cada `interval` segundos."""
+
+    def __init__(self, per_host=PER_HOST, interval=HOST_INTERVAL_SECONDS):
+        self.per_host = per_host
+        self.interval = interval
+        self._slots = {}
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, host):
+        semaphore = self._slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            # Sem await entre ler e marcar: o próximo da fila já vê o horário novo.
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            await asyncio.sleep(start - now)
+            yield
+
+
+async def _fetch(http, url, target, cache, limiter, concurrency):
+    from tornado.httpclient import HTTPClientError, HTTPRequest
+
+    result = {"url": url, "status": None, "changed": False, "bytes": 0, "description": "", "error": None}
+    request = HTTPRequest(
+        target, headers={"User-Agent": USER_AGENT, **cache.conditional_headers(url)},
+        request_timeout=REQUEST_TIMEOUT_SECONDS,
+    )
+    # O limite é do host original: no servidor de fixtures, tudo seria 127.0.0.1.
+    # A vez no host vem antes da vaga global: quem espera o intervalo do host
+    # não segura uma vaga que outro host usaria.
+    async with limiter.slot(urlsplit(url).hostname), concurrency:
+        start = time.perf_counter()
+        try:
+            response = await http.fetch(request, raise_error=False)
+        except (OSError, HTTPClientError) as exc:
+            # raise_error=False só vale para código HTTP: timeout e conexão
+            # recusada ainda levantam (HTTPTimeoutError, 599) e são erro desta URL.
+            result["error"] = f"{type(exc).__name__}: {exc}"
+            return result
+        result["ms"] = (time.perf_counter() - start) * 1000
+    result["status"] = response.code
+    if response.code == 304:
+        cache.revalidated(url, response.headers)
+        body = cache.body(url)
+    elif response.code == 200:
+        body = response.body
+        result["bytes"] = len(body)
+        result["changed"] = cache.store(url, body, response.headers)
+    else:
+        result["error"] = f"HTTP {response.code}"
+        return result
+    result["description"] = extract_description(body)
+    return result
+
+
+async def refresh_pages(urls, cache, base=None, concurrency=CONCURRENCY, per_host=PER_HOST,
+                        interval=HOST_INTERVAL_SECONDS):
+    """Busca todas as URLs e devolve um resultado por URL, na ordem delas.
+
+    Com `base`, cada URL é buscada em base/<host><caminho> — o servidor de
+    fixtures —, mas entra no cache e no resultado pela URL original.
+    """
+    from tornado.httpclient import AsyncHTTPClient
+
+    http = AsyncHTTPClient(force_instance=True, max_clients=concurrency)
+    limiter = HostLimiter(per_host, interval)
+    slots = asyncio.Semaphore(concurrency)
+    try:
+        return await asyncio.gather(*(
+            _fetch(http, url, rebase(url, base) if base else url, cache, limiter, slots) for url in urls
+        ))
+    finally:
+        http.close()
+        cache.save()
+
+
+def rebase(url, base):
+    parts = urlsplit(url)
+    return f"{base}/{parts.hostname}{parts.path or '/'}"
+
+
+def _fixture_name(path):
+    # Caminho de diretório vira .../index.html; página .html fica como está.
+    path = path.strip("/")
+    if path.endswith(".html"):
+        return path
+    return f"{path}/index.html" if path else "index.html"
+
+
+def write_fixtures(directory=FIXTURES_DIR):
+    """Uma página por URL dos catálogos, com a descrição que está no JSON.
+
+    Só grava o que mudou: o Last-Modified do servidor é o mtime do arquivo, e
+    regravar igual quebraria os 304. Devolve quantas páginas foram gravadas.
+    """
+    descriptions = {}
+    for path, field in ((COLLECTED_PATH, "meta"), (CATALOG_PATH, "summary")):
+        for item in json.loads(path.read_text(encoding="utf-8")):
+            if item.get("url"):
+                descriptions.setdefault(item["url"], item.get(field) or "")
+    written = 0
+    for url, description in descriptions.items():
+        parts = urlsplit(url)
+        page = (
+            '<!doctype html>\n<html><head><meta charset="utf-8">\n'
+            f'<meta name="description" content="{html.escape(description)}">\n'
+            f"<title>{html.escape(parts.path)}</title></head><body></body></html>\n"
+        ).encode("utf-8")
+        path = Path(directory) / parts.hostname / _fixture_name(parts.path)
+        if not path.exists() or path.read_bytes() != page:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(page)
+            written += 1
+    return written
+
+
+def serve_fixtures(directory=FIXTURES_DIR, latency=FIXTURE_LATENCY_SECONDS):
+    """Sobe o servidor de fixtures em 127.0.0.1, numa porta livre. Devolve (servidor, base).
+
+    Tem de ser chamado de dentro do loop asyncio em que o refresh vai rodar.
+    """
+    from tornado.httpserver import HTTPServer
+    from tornado.netutil import bind_sockets
+    from tornado.web import Application, StaticFileHandler
+
+    class FixtureHandler(StaticFileHandler):
+        def parse_url_path(self, url_path):
+            return _fixture_name(url_path)
+
+        def compute_etag(self):
+            # O StaticFileHandler guarda o hash de cada arquivo até o processo
+            # acabar: uma fixture editada continuaria com o ETag antigo (e 304).
+            return f'"{self.get_content_version(self.absolute_path)}"'
+
+        async def get(self, path, include_body=True):
+            await asyncio.sleep(latency)
+            await super().get(path, include_body)
+
+    sockets = bind_sockets(0, "127.0.0.1")
+    application = Application(
+        [(r"/(.*)", FixtureHandler, {"path": str(directory)})], log_function=lambda handler: None,
+    )
+    server = HTTPServer(application)
+    server.add_sockets(sockets)
+    return server, f"http://127.0.0.1:{sockets[0].getsockname()[1]}"
+
+
+def run_refresh(urls, fixtures=False, concurrency=CONCURRENCY, per_host=PER_HOST,
+                interval=HOST_INTERVAL_SECONDS):
+    """refresh_pages() num loop novo; com fixtures=True, contra o servidor local."""
+
+    async def run():
+        server, base = serve_fixtures() if fixtures else (None, None)
+        cache = ResponseCache(FIXTURE_CACHE_DIR if fixtures else CACHE_DIR)
+        try:
+            return await refresh_pages(urls, cache, base, concurrency, per_host, interval)
+        finally:
+            if server:
+                server.stop()
+
+    return asyncio.run(run())
+
+
+def apply_descriptions(results, path=COLLECTED_PATH):
+    """Leva as descrições novas para o `meta` do oficial_coletado.json.
+
+    Página com erro ou sem descrição não apaga o que já estava. Devolve os
+    nomes dos serviços que mudaram.
+    """
+    found = {result["url"]: result["description"] for result in results if result["description"]}
+    items = json.loads(path.read_text(encoding="utf-8"))
+    changed = []
+    for item in items:
+        description = found.get(item["url"])
+        if description and description != item["meta"]:
+            item["meta"] = description
+            changed.append(item["name_game"])
+    if changed:
+        path.write_text(json.dumps(items, indent=1, ensure_ascii=False), encoding="utf-8")
+    return changed
+
+
+def format_results(results, elapsed):
+    counts = {"200 novo": 0, "200 igual": 0, "304": 0, "erro": 0}
+    for result in results:
+        if result["error"]:
+            counts["erro"] += 1
+        elif result["status"] == 304:
+            counts["304"] += 1
+        else:
+            counts["200 novo" if result["changed"] else "200 igual"] += 1
+    received = sum(result["bytes"] for result in results)
+    lines = [
+        f"{len(results)} páginas em {elapsed:.2f} s: "
+        + ", ".join(f"{count} {label}" for label, count in counts.items()),
+        f"{received:,} bytes de corpo recebidos",
+    ]
+    lines += [f"  ERRO {result['url']}: {result['error']}" for result in results if result["error"]]
+    return "\n".join(lines)
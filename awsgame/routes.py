@@ -0,0 +1,73 @@
+"""Rotas POST do jogo para o servidor, pela porta dos componentes.
+
+O Streamlit não tem rota para o navegador mandar dados ao servidor fora do
+websocket. Como o awsgame.assets já faz com o cache, a rota entra pelo
+ComponentRequestHandler: um POST em component/<endpoint>, com o token XSRF do
+próprio Streamlit — o tornado confere o cabeçalho X-Xsrftoken contra o cookie
+antes de chamar post(). Nenhum componente tem esses nomes: as rotas só existem
+para o POST.
+
+API interna do Streamlit: o patch só entra nas versões de
+assets.STREAMLIT_TESTED. Fora delas, o jogo segue mandando e recebe 405, sem
+efeito nenhum.
+"""
+
+import json
+import logging
+
+from awsgame import assets
+
+MAX_BODY_BYTES = 4096
+
+_LOGGER = logging.getLogger(__name__)
+_routes = {}
+
+
+def route_url(endpoint):
+    """URL do endpoint relativa ao jogo, como assets.component_url()."""
+    return f"../{endpoint}"
+
+
+def register_post(endpoint, handle):
+    """Passa a aceitar POST em component/<endpoint>.
+
+    `handle(body)` recebe os bytes do corpo e devolve o objeto da resposta
+    (vai como JSON) ou None (204). ValueError vira 400 com a mensagem; OSError,
+    500. Registrar o mesmo endpoint de novo só troca a função — o script roda
+    a cada sessão.
+    """
+    _routes[endpoint] = handle
+    ComponentRequestHandler = assets.component_handler()
+    if ComponentRequestHandler is None:
+        return
+    from tornado.web import HTTPError
+
+    if getattr(ComponentRequestHandler, "awsgame_routes", False):
+        return
+
+    def post(self, path):
+        route = _routes.get(path)
+        if route is None:
+            raise HTTPError(405)
+        if len(self.request.body) > MAX_BODY_BYTES:
+            self.set_status(413)
+            return
+        try:
+            response = route(self.request.body)
+        except ValueError as exc:
+            self.set_status(400)
+            self.write(str(exc))
+            return
+        except OSError:
+            _LOGGER.exception("Falha em POST %s", path)
+            self.set_status(500)
+            return
+        if response is None:
+            self.set_status(204)
+            return
+        self.set_header("Content-Type", "application/json")
+        self.set_header("Cache-Control", "no-store")
+        self.write(json.dumps(response))
+
+    ComponentRequestHandler.post = post
+    ComponentRequestHandler.awsgame_routes = True
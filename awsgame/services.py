@@ -0,0 +1,39 @@
+"""Leitura do servicos.json, a fonte do dataset (ver awsgame.dataset)."""
+
+import json
+from pathlib import Path
+
+SERVICES_PATH = Path(__file__).resolve().parent.parent / "servicos.json"
+
+
+def read_nodes(path=SERVICES_PATH):
+    """Devolve a lista de {name, description, category} na ordem da escalada.
+
+    Só normaliza — tira espaços das pontas e aceita "Description" ou
+    "description". Não valida nem descarta nada: repetidos, campos vazios e
+    categorias desconhecidas são problema de awsgame.dataset.validate(), que
+    derruba o build. Não trata erro: FileNotFoundError e json.JSONDecodeError
+    sobem para quem chama.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [
+        {
+            "name": (node.get("name") or "").strip(),
+            "description": (node.get("Description") or node.get("description") or "").strip(),
+            "category": (node.get("Category") or "").strip(),
+        }
+        for node in data.get("nodes", [])
+    ]
+
+
+def dump_nodes(catalog):
+    """O servicos.json de uma lista de {name, description, category}, em bytes.
+
+    No formato do arquivo versionado (indentação 1, acentos sem escape, sem
+    quebra de linha no fim): regerar o que não mudou não gera diff.
+    """
+    nodes = [
+        {"name": entry["name"], "Category": entry["category"], "Description": entry["description"]}
+        for entry in catalog
+    ]
+    return json.dumps({"nodes": nodes}, indent=1, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,87 @@
+"""Um objeto por processo para o dataset, a legenda e o manifesto do jogo.
+
+O @st.cache_data guarda o resultado em pickle e devolve uma cópia nova a cada
+acerto: todo rerun de toda sessão despicklava ~240 KB de HTML e o dataset
+inteiro. Com centenas de sessões chegando juntas, eram centenas de cópias
+iguais vivas ao mesmo tempo. O @st.cache_resource devolve o MESMO objeto — por
+isso o dataset sai congelado: ninguém pode mexer no que todos compartilham.
+Do jogo, hoje, nem o HTML passa por aqui: ele é servido por HTTP como
+componente (awsgame.assets), e o app só precisa do manifesto do bundle. Nem o
+JSON do dataset: o catálogo vem do artefato compilado (awsgame.dataset), sem
+as descrições, que o app não usa.
+
+A validade também mudou: em vez de 8 horas de TTL, a chave do cache é o
+(mtime, tamanho) dos arquivos de origem. Trocou o servicos.json ou o bundle, o
+próximo rerun já vê a versão nova; não trocou, o objeto vive o processo todo.
+"""
+
+import os
+import types
+
+import streamlit as st
+
+from awsgame import bundle, chrome, dataset, services
+
+
+def stat_signature(*paths):
+    """(mtime_ns, tamanho) de cada arquivo — None para os que não existem."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def freeze(catalog):
+    return tuple(types.MappingProxyType(service) for service in catalog)
+
+
+# O argumento `signature` só existe para entrar na chave do cache. max_entries=1
+# descarta a versão anterior assim que o arquivo muda.
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _services(signature):
+    return freeze(dataset.ensure_dataset(descriptions=False))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _legend(signature):
+    return chrome.legend_html(_services(signature))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _bundle(signature):
+    return types.MappingProxyType(bundle.ensure_bundle())
+
+
+def shared_services():
+    """O dataset, compartilhado por todas as sessões: {name, category} por serviço.
+
+    Erros de leitura sobem, e dado que não passa na validação vira
+    dataset.DatasetError.
+    """
+    return _services(stat_signature(services.SERVICES_PATH))
+
+
+def shared_legend():
+    """O HTML da legenda da sidebar, montado uma vez por versão do dataset."""
+    return _legend(stat_signature(services.SERVICES_PATH))
+
+
+def shared_bundle():
+    """O manifesto do bundle atual, compartilhado por todas as sessões.
+
+    Chamá-lo garante que o build em disco está em dia antes de o navegador
+    pedir o componente. A assinatura cobre o que faz o bundle envelhecer —
+    dataset, manifesto e código do template. Os arquivos de static/ ficam de
+    fora: o hash deles é calculado uma vez por processo
+    (awsgame.assets.publish_assets).
+    """
+    return _bundle(stat_signature(
+        services.SERVICES_PATH,
+        bundle.BUNDLE_DIR / bundle.MANIFEST_NAME,
+        *bundle.SOURCE_FILES,
+    ))
@@ -0,0 +1,215 @@
+"""Tempos de quadro dos jogadores, agregados por classe de aparelho.
+
+O gameLoop roda a física em passo fixo: quando um quadro atrasa, ele recupera
+até MAX_TICKS_PER_FRAME ticks e, se nem assim alcança, zera o acumulador — o
+jogo fica mais lento, sem aviso nenhum. Não havia como saber quanto isso
+acontece nos aparelhos de verdade. Agora o jogo conta, por quadro, os ticks
+rodados, os descartes e o tempo de update() e draw() num histograma, e a cada
+FRAME_STATS_FLUSH_SECONDS manda um resumo de poucas centenas de bytes para cá.
+
+O resumo chega por POST em component/awsgame.telemetry/frames (ver
+awsgame.routes). Cada um é somado ao da classe do aparelho em
+build/telemetry/frames.json; `python -m awsgame frames` mostra o agregado.
+"""
+
+import json
+import math
+import threading
+
+from awsgame import game, routes
+from awsgame.assets import BUILD_DIR
+
+TELEMETRY_DIR = BUILD_DIR / "telemetry"
+FRAMES_PATH = TELEMETRY_DIR / "frames.json"
+
+# O que vem depois de component/ na URL (ver awsgame.routes).
+ENDPOINT = "awsgame.telemetry/frames"
+ENDPOINT_URL = routes.route_url(ENDPOINT)
+
+MAX_FRAMES_PER_REPORT = 60 * 60 * 10
+
+# Fraco: até 4 núcleos ou até 4 GB de memória (navigator.deviceMemory, que
+# só o Chrome informa — 0 quando não sabe).
+LOW_END_CORES = 4
+LOW_END_MEMORY_GB = 4
+DEVICE_CLASSES = ("desktop", "desktop-low", "mobile", "mobile-low")
+DEVICE_CLASS_LABELS = {
+    "desktop": "Desktop",
+    "desktop-low": "Desktop fraco",
+    "mobile": "Celular/tablet",
+    "mobile-low": "Celular/tablet fraco",
+}
+
+DURATION_BINS = len(game.DURATION_BINS_MS) + 1   # o último é "acima do maior limite"
+TICK_BINS = game.MAX_TICKS_PER_FRAME + 1         # 0..MAX ticks num quadro
+
+_lock = threading.Lock()
+_aggregate = None
+
+
+def device_class(device):
+    mobile = bool(device.get("touch"))
+    cores = device.get("cores") or 0
+    memory = device.get("memory") or 0
+    low = (0 < cores <= LOW_END_CORES) or (0 < memory <= LOW_END_MEMORY_GB)
+    return ("mobile" if mobile else "desktop") + ("-low" if low else "")
+
+
+def _counts(value, length, name):
+    if (
+        not isinstance(value, list)
+        or len(value) != length
+        or not all(isinstance(v, int) and not isinstance(v, bool) and v >= 0 for v in value)
+    ):
+        raise ValueError(f"{name}: esperava {length} contagens inteiras")
+    return value
+
+
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f"{name}: esperava um número >= 0")
+    return value
+
+
+def parse_report(body):
+    """Valida o resumo que o jogo manda. ValueError se não for um."""
+    try:
+        report = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"JSON inválido: {exc}") from None
+    if not isinstance(report, dict) or not isinstance(report.get("device"), dict):
+        raise ValueError("faltou o aparelho")
+
+    frames = report.get("frames")
+    if not isinstance(frames, int) or not 0 < frames <= MAX_FRAMES_PER_REPORT:
+        raise ValueError("frames fora da faixa")
+    ticks = _counts(report.get("ticks"), TICK_BINS, "ticks")
+    update = _counts(report.get("update"), DURATION_BINS, "update")
+    draw = _counts(report.get("draw"), DURATION_BINS, "draw")
+    if sum(ticks) != frames or sum(update) != frames or sum(draw) != frames:
+        raise ValueError("histogramas não somam frames")
+
+    dropped = report.get("dropped")
+    if not isinstance(dropped, int) or not 0 <= dropped <= frames:
+        raise ValueError("dropped fora da faixa")
+    device = report["device"]
+    return {
+        "device_class": device_class(device),
+        "worker": report.get("mode") == "worker",
+        "seconds": _number(report.get("seconds"), "seconds"),
+        "frames": frames,
+        "ticks": ticks,
+        "dropped": dropped,
+        "dropped_ms": _number(report.get("droppedMs"), "droppedMs"),
+        "update": update,
+        "draw": draw,
+    }
+
+
+def _empty_class():
+    return {
+        "reports": 0,
+        "worker_reports": 0,
+        "seconds": 0.0,
+        "frames": 0,
+        "ticks": [0] * TICK_BINS,
+        "dropped": 0,
+        "dropped_ms": 0.0,
+        "update": [0] * DURATION_BINS,
+        "draw": [0] * DURATION_BINS,
+    }
+
+
+def load_aggregate(path=FRAMES_PATH):
+    """{classe: agregado} gravado em disco, ou {} se não há nada (ou é de outro formato)."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    classes = data.get("classes", {})
+    if any(
+        len(entry.get("ticks", ())) != TICK_BINS or len(entry.get("update", ())) != DURATION_BINS
+        for entry in classes.values()
+    ):
+        return {}   # histogramas de outra versão do jogo não se somam a estes
+    return classes
+
+
+def merge(aggregate, report):
+    entry = aggregate.setdefault(report["device_class"], _empty_class())
+    entry["reports"] += 1
+    entry["worker_reports"] += report["worker"]
+    for field in ("seconds", "frames", "dropped", "dropped_ms"):
+        entry[field] += report[field]
+    for field in ("ticks", "update", "draw"):
+        entry[field] = [a + b for a, b in zip(entry[field], report[field])]
+    return aggregate
+
+
+def record(report, path=FRAMES_PATH):
+    """Soma o resumo ao agregado da classe e grava. Seguro entre threads."""
+    global _aggregate
+    with _lock:
+        if _aggregate is None:
+            _aggregate = load_aggregate(path)
+        merge(_aggregate, report)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"classes": _aggregate}, indent=1), encoding="utf-8")
+        tmp.replace(path)
+
+
+def _handle(body):
+    record(parse_report(body))
+
+
+def register_telemetry():
+    """Aceita POST em component/awsgame.telemetry/frames (ver awsgame.routes)."""
+    routes.register_post(ENDPOINT, _handle)
+
+
+def percentile(counts, fraction):
+    """Limite superior (ms) do balde onde cai o percentil; inf no último."""
+    total = sum(counts)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for bin_index, count in enumerate(counts):
+        seen += count
+        if seen >= target:
+            break
+    if bin_index < len(game.DURATION_BINS_MS):
+        return game.DURATION_BINS_MS[bin_index]
+    return math.inf
+
+
+def _bound(ms):
+    if ms is None:
+        return "—"
+    return f"> {game.DURATION_BINS_MS[-1]:g}" if math.isinf(ms) else f"≤ {ms:g}"
+
+
+def format_report(aggregate):
+    if not aggregate:
+        return f"Nenhum resumo em {FRAMES_PATH} ainda."
+    lines = [
+        f"{'classe':<22}{'resumos':>8}{'min':>7}{'quadros':>10}{'≥2 ticks':>10}"
+        f"{'descartes/min':>15}{'update p50/p95 ms':>20}{'draw p50/p95 ms':>20}",
+    ]
+    for name in sorted(aggregate, key=lambda c: DEVICE_CLASSES.index(c) if c in DEVICE_CLASSES else 99):
+        entry = aggregate[name]
+        minutes = entry["seconds"] / 60
+        catch_up = sum(entry["ticks"][2:]) / entry["frames"] if entry["frames"] else 0
+        drops = entry["dropped"] / minutes if minutes else 0
+        update = f"{_bound(percentile(entry['update'], .5))} / {_bound(percentile(entry['update'], .95))}"
+        draw = f"{_bound(percentile(entry['draw'], .5))} / {_bound(percentile(entry['draw'], .95))}"
+        lines.append(
+            f"{DEVICE_CLASS_LABELS.get(name, name):<22}{entry['reports']:>8}{minutes:>7.1f}"
+            f"{entry['frames']:>10,}{catch_up:>10.1%}{drops:>15.2f}{update:>20}{draw:>20}"
+        )
+    lines.append(
+        "≥2 ticks: quadros em que a física teve de recuperar atraso. Descarte: o quadro "
+        f"chegou a {game.MAX_TICKS_PER_FRAME} ticks e o atraso restante foi jogado fora."
+    )
+    return "\n".join(lines)
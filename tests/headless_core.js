@@ -0,0 +1,101 @@
+// Roda o núcleo do jogo (<script id="gameCore">) sem navegador e conta o que
+// o próprio núcleo aloca em TICKS chamadas de update(), com a partida em curso,
+// e em RESTARTS chamadas de core.restart().
+// Uso: node headless_core.js <html> <levels.bin>   — imprime um JSON.
+//
+// A contagem vem do perfil de amostragem do heap do V8 (o mesmo da aba Memory
+// do DevTools), com o que já foi coletado e só com as amostras cuja pilha
+// termina em código do núcleo. O heapUsed não serve: o código que o JIT compila
+// também mora no heap e faz o número oscilar centenas de KB entre execuções.
+const fs = require('fs');
+const inspector = require('inspector');
+const vm = require('vm');
+
+const WARMUP = 20000;
+const TICKS = 20000;
+const RESTARTS = 200;
+const SAMPLING_BYTES = 64;
+const CORE_FILE = 'gameCore.js';
+
+const [html, levels] = process.argv.slice(2).map((path) => fs.readFileSync(path));
+const core = /<script id="gameCore">([\s\S]*?)<\/script>/.exec(html.toString('utf8'))[1];
+
+const noop = () => {};
+const context2d = new Proxy({}, {
+    get: (target, name) => (name in target ? target[name] : name === 'measureText' ? () => ({ width: 10 }) : noop),
+    set: (target, name, value) => { target[name] = value; return true; }
+});
+class OffscreenCanvas {
+    constructor(width, height) { this.width = width; this.height = height; }
+    getContext() { return context2d; }
+}
+const host = {};
+for (const name of ['card', 'endRound', 'frameStats', 'hud', 'level', 'levelsLoaded', 'saveTrace', 'sound', 'viewTop']) {
+    host[name] = noop;
+}
+const sandbox = {
+    console, Math, JSON, Date, performance, OffscreenCanvas, host,
+    requestAnimationFrame: noop     // o teste chama update() direto
+};
+sandbox.self = sandbox;
+vm.createContext(sandbox);
+const run = (code) => vm.runInContext(code, sandbox, { filename: CORE_FILE });
+run(core);
+
+const buffer = levels.buffer.slice(levels.byteOffset, levels.byteOffset + levels.byteLength);
+run('core').init(new OffscreenCanvas(700, 650));
+run('core').loadLevels(buffer);
+run('core').start(false);
+
+// Pula de tempos em tempos, para a colisão e a câmera trabalharem também.
+const step = run(`(ticks) => {
+    for (let t = 0; t < ticks; t++) {
+        core.key('ArrowUp', t % 40 < 5);
+        update();
+    }
+}`);
+const poolsOf = () => run('[enemies.x, powerUps.x, coins.x, movingRows, enemyRows]');
+
+function coreBytes(node) {
+    const own = node.callFrame.url === CORE_FILE ? node.selfSize : 0;
+    return node.children.reduce((sum, child) => sum + coreBytes(child), own);
+}
+
+const session = new inspector.Session();
+session.connect();
+const post = (method, params = {}) => new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => (error ? reject(error) : resolve(result)));
+});
+
+// Bytes que o núcleo alocou durante fn(), coletados ou não.
+async function sampled(fn) {
+    await post('HeapProfiler.startSampling', {
+        samplingInterval: SAMPLING_BYTES,
+        includeObjectsCollectedByMajorGC: true,
+        includeObjectsCollectedByMinorGC: true
+    });
+    fn();
+    const { profile } = await post('HeapProfiler.stopSampling');
+    return coreBytes(profile.head);
+}
+
+(async () => {
+    step(WARMUP);                   // compila o código quente antes de medir
+    const tickBytes = await sampled(() => step(TICKS));
+    const running = run('gameState.gameRunning');
+
+    const pools = poolsOf();
+    const restart = run('() => core.restart()');
+    const restartBytes = await sampled(() => {
+        for (let i = 0; i < RESTARTS; i++) restart();
+    });
+    console.log(JSON.stringify({
+        ticks: TICKS,
+        bytes_per_tick: tickBytes / TICKS,
+        running,
+        enemies: run('enemyCount'),
+        restarts: RESTARTS,
+        bytes_per_restart: restartBytes / RESTARTS,
+        pools_kept_on_restart: poolsOf().every((pool, i) => pool === pools[i])
+    }));
+})();
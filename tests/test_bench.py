@@ -0,0 +1,36 @@
+"""A suíte de awsgame.bench contra a linha de base, como no `python -m awsgame bench`.
+
+O app.py roda inteiro pelo AppTest; os tempos que pioram são medidos de novo
+antes de contar (bench.confirm). Para regravar a base de propósito:
+`python -m awsgame bench --update`.
+"""
+
+import pytest
+
+from awsgame import bench
+
+
+@pytest.fixture(scope="module")
+def report():
+    baseline = bench.load_baseline()
+    assert baseline is not None, "sem awsgame/bench_baseline.json: rode `python -m awsgame bench --update`"
+    results = bench.run_suite()
+    lines, regressions = bench.confirm(results, baseline)
+    return results, "\n".join(lines), regressions
+
+
+def test_app_runs_and_sends_deltas(report):
+    results, _, _ = report
+    kinds = [kind for kind, _ in results["deltas"]]
+    assert "component_instance" in kinds    # o jogo
+    assert results["delta_bytes_cached"] < results["delta_bytes_total"]
+
+
+def test_delta_bytes_within_baseline(report):
+    _, text, regressions = report
+    assert not [name for name in regressions if name.startswith("delta")], text
+
+
+def test_timings_within_baseline(report):
+    _, text, regressions = report
+    assert not [name for name in regressions if not name.startswith("delta")], text
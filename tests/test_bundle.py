@@ -0,0 +1,11 @@
+"""O bundle do jogo: teto de bytes do HTML."""
+
+from awsgame import bundle
+
+
+def test_html_within_budget(tmp_path):
+    manifest = bundle.build(tmp_path)
+    assert manifest["bytes"] == (tmp_path / manifest["html"]).stat().st_size
+    assert manifest["bytes"] <= bundle.HTML_BUDGET_BYTES, (
+        f"HTML com {manifest['bytes']:,} bytes, acima do teto de {bundle.HTML_BUDGET_BYTES:,}"
+    )
@@ -0,0 +1,36 @@
+"""Quanto o núcleo do jogo aloca com a partida em curso (ver headless_core.js).
+
+Inimigos, power-ups e moedas moram em typed arrays alocados uma vez por página:
+nem o tick nem o restart criam objeto por entidade. O que sobra são números que
+o V8 encaixota entre chamadas (HeapNumber, 16 bytes) — ~0,2 KB por tick e ~2 KB
+por restart. Um objeto por inimigo daria ~11 KB por tick e ~13 KB por restart.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from awsgame import bundle
+
+DRIVER = Path(__file__).with_name("headless_core.js")
+MAX_BYTES_PER_TICK = 1024
+MAX_BYTES_PER_RESTART = 6 * 1024
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="precisa do Node.js")
+def test_steady_state_allocates_no_entities(tmp_path):
+    manifest = bundle.build(tmp_path)
+    output = subprocess.run(
+        ["node", str(DRIVER), str(tmp_path / manifest["html"]), str(tmp_path / manifest["levels"]["file"])],
+        check=True, capture_output=True, text=True, timeout=120,
+    ).stdout
+    result = json.loads(output)
+
+    assert result["running"], "a partida acabou no meio da medida"
+    assert result["enemies"] > 0
+    assert result["bytes_per_tick"] < MAX_BYTES_PER_TICK, result
+    assert result["bytes_per_restart"] < MAX_BYTES_PER_RESTART, result
+    assert result["pools_kept_on_restart"]
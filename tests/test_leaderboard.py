@@ -0,0 +1,81 @@
+"""O placar: validação do resultado que chega por POST e o topo do dia."""
+
+import json
+import threading
+
+import pytest
+
+from awsgame import game, leaderboard
+
+CATALOG = [{"name": f"Serviço {n}"} for n in range(1, 11)]
+
+
+def _body(**fields):
+    result = {"score": 0, "height": 0, "platform": 0, "won": False}
+    result.update(fields)
+    return json.dumps(result).encode()
+
+
+def _result(score, day=None):
+    return {
+        "score": score, "height": 0, "platform": 0, "service": "Início",
+        "won": False, "daily_day": day, "level": None,
+    }
+
+
+def test_plausible_result_is_accepted():
+    score = 3 * game.POINTS_PLATFORM + game.POINTS_COIN + game.POINTS_ENEMY
+    result = leaderboard.parse_result(_body(score=score, height=40, platform=3), CATALOG)
+    assert (result["score"], result["service"]) == (score, "Serviço 3")
+
+
+def test_skipping_platform_one_is_plausible():
+    # Do chão, o pulo alcança a plataforma 2: dois pousos levam à 3.
+    leaderboard.parse_result(_body(score=2 * game.POINTS_PLATFORM, height=33, platform=3), CATALOG)
+
+
+def test_win_at_the_top():
+    top = len(CATALOG)
+    assert leaderboard.score_range(top, top)[1] == top * leaderboard.POINTS_PER_REACHED + (top + 1) * leaderboard.POINTS_PER_ROW
+    result = leaderboard.parse_result(_body(score=top * game.POINTS_PLATFORM, platform=top, won=True), CATALOG)
+    assert result["won"]
+
+
+@pytest.mark.parametrize("fields", [
+    {"score": 1_000_000, "platform": 3},                             # pontos que 3 plataformas não dão
+    {"score": 0, "platform": 3},                                     # menos pousos que a plataforma pede
+    {"score": 25, "platform": len(CATALOG), "won": True},            # vitória com a pontuação errada
+    {"score": 0, "platform": 5, "won": True},                        # vitória sem chegar ao topo
+    {"score": 3 * game.POINTS_PLATFORM, "platform": 3, "height": 5_000},
+    {"score": 10, "platform": 0},                                    # fora do degrau de 25
+    {                                                                # acima do máximo no topo
+        "score": leaderboard.score_range(len(CATALOG), len(CATALOG))[1] + leaderboard.SCORE_STEP,
+        "platform": len(CATALOG), "won": True,
+    },
+])
+def test_forged_result_is_rejected(fields):
+    with pytest.raises(ValueError):
+        leaderboard.parse_result(_body(**fields), CATALOG)
+
+
+def test_daily_top_keeps_results_submitted_while_loading(tmp_path, monkeypatch):
+    board = leaderboard.Leaderboard(tmp_path / "placar.sqlite3")
+    day = 20_000
+    board.submit(_result(100, day))
+    flush = board.flush
+    late = threading.Thread(target=board.submit, args=(_result(200, day),))
+
+    def flush_then_submit():
+        # Um submit() de outra sessão logo depois do flush() da primeira consulta
+        # do dia: ou ele espera a consulta terminar, ou entra no que ela leu.
+        flush()
+        late.start()
+        late.join(0.2)
+
+    monkeypatch.setattr(board, "flush", flush_then_submit)
+    board.daily_top(day)
+    late.join()
+    monkeypatch.setattr(board, "flush", flush)
+    board.flush()
+
+    assert [entry["score"] for entry in board.daily_top(day)] == [200, 100]
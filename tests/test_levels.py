@@ -0,0 +1,10 @@
+"""O comando levels no caminho padrão, com as plataformas do servicos.json."""
+
+from awsgame import dataset
+from awsgame.__main__ import main
+
+
+def test_levels_default_platforms(capsys):
+    assert main(["levels", "--layouts", "200", "--worst", "1"]) == 0
+    report = capsys.readouterr().out
+    assert report.startswith(f"200 fases de {len(dataset.ensure_dataset())} plataformas")
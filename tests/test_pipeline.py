@@ -0,0 +1,36 @@
+"""O executor de awsgame.pipeline: o código declarado da etapa entra no hash."""
+
+from awsgame import curation, matching, services
+from awsgame.pipeline import Runner, Stage
+
+
+def _stage(tmp_path, calls):
+    source, helper, out = tmp_path / "fonte.txt", tmp_path / "ajudante.py", tmp_path / "saida.txt"
+
+    def run():
+        calls.append(1)
+        return {out: source.read_bytes().upper()}
+
+    return Stage("etapa", (source,), (out,), run, (helper,))
+
+
+def test_declared_code_reruns_stage(tmp_path):
+    (tmp_path / "fonte.txt").write_text("a")
+    (tmp_path / "ajudante.py").write_text("X = 1\n")
+    calls = []
+    state = tmp_path / "state.json"
+    stages = [_stage(tmp_path, calls)]
+
+    Runner(stages, state).run()
+    Runner(stages, state).run()
+    assert len(calls) == 1
+
+    (tmp_path / "ajudante.py").write_text("X = 2\n")
+    Runner(stages, state).run()
+    assert len(calls) == 2
+
+
+def test_curation_stages_declare_their_code():
+    stages = {stage.name: stage for stage in curation.STAGES}
+    assert {matching.__file__, services.__file__} <= set(map(str, stages["cruzamento"].code))
+    assert services.__file__ in set(map(str, stages["servicos"].code))
@@ -0,0 +1,57 @@
+"""O refresh contra um servidor local: 304, acerto de cache e timeout, sem rede."""
+
+import asyncio
+
+from awsgame import refresh
+
+URL = "https://aws.amazon.com/teste/"
+
+
+def _page(description):
+    return f'<html><head><meta name="description" content="{description}"></head></html>'
+
+
+def _refresh(tmp_path, latency=0.0):
+    async def run():
+        server, base = refresh.serve_fixtures(tmp_path / "fixtures", latency)
+        try:
+            cache = refresh.ResponseCache(tmp_path / "cache")
+            return await refresh.refresh_pages([URL], cache, base, interval=0)
+        finally:
+            server.stop()
+
+    return asyncio.run(run())[0]
+
+
+def _write(tmp_path, description):
+    path = tmp_path / "fixtures" / "aws.amazon.com" / "teste" / "index.html"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_page(description))
+
+
+def test_second_run_revalidates_from_cache(tmp_path):
+    _write(tmp_path, "primeira")
+    first = _refresh(tmp_path)
+    assert (first["status"], first["changed"], first["description"]) == (200, True, "primeira")
+    assert first["bytes"] > 0
+
+    again = _refresh(tmp_path)
+    # 304 sem corpo: a descrição sai do corpo guardado no cache.
+    assert (again["status"], again["bytes"], again["error"]) == (304, 0, None)
+    assert again["description"] == "primeira"
+
+
+def test_changed_page_is_fetched_again(tmp_path):
+    _write(tmp_path, "primeira")
+    _refresh(tmp_path)
+    _write(tmp_path, "segunda")
+    changed = _refresh(tmp_path)
+    assert (changed["status"], changed["changed"], changed["description"]) == (200, True, "segunda")
+
+
+def test_timeout_is_an_error_of_the_url(tmp_path, monkeypatch):
+    _write(tmp_path, "lenta")
+    monkeypatch.setattr(refresh, "REQUEST_TIMEOUT_SECONDS", 0.1)
+    result = _refresh(tmp_path, latency=1.0)
+    assert result["status"] is None
+    assert result["error"].startswith("HTTPTimeoutError")
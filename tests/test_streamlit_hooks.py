@@ -0,0 +1,89 @@
+"""Os ganchos no ComponentRequestHandler do Streamlit (API interna).
+
+Se uma versão nova do Streamlit mudar o handler, estes testes falham em vez de
+o jogo perder em silêncio o cache imutável ou as rotas POST.
+"""
+
+import asyncio
+import json
+
+import pytest
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
+from tornado.web import Application
+
+from awsgame import assets, routes
+
+HASHED = "game.0123456789ab.html"
+
+
+class _Registry:
+    def __init__(self, path):
+        self.path = path
+
+    def get_component_path(self, name):
+        return str(self.path) if name == "comp" else None
+
+
+def _request(tmp_path, path, **kwargs):
+    """Um pedido ao ComponentRequestHandler servido de verdade, numa porta livre."""
+    handler = assets.component_handler()
+
+    async def run():
+        sockets = bind_sockets(0, "127.0.0.1")
+        server = HTTPServer(Application([(r"/component/(.*)", handler, {"registry": _Registry(tmp_path)})]))
+        server.add_sockets(sockets)
+        http = AsyncHTTPClient(force_instance=True)
+        try:
+            url = f"http://127.0.0.1:{sockets[0].getsockname()[1]}/component/{path}"
+            return await http.fetch(url, raise_error=False, **kwargs)
+        finally:
+            http.close()
+            server.stop()
+
+    return asyncio.run(run())
+
+
+def test_streamlit_version_is_tested():
+    import streamlit
+
+    assert assets.component_handler() is not None, (
+        f"Streamlit {streamlit.__version__} fora de assets.STREAMLIT_TESTED: confira set_extra_headers "
+        "e a rota POST no ComponentRequestHandler e acrescente a versão."
+    )
+
+
+@pytest.fixture
+def component_dir(tmp_path):
+    (tmp_path / HASHED).write_text("<p>jogo</p>")
+    (tmp_path / assets.ENTRY_NAME).write_text("<p>entrada</p>")
+    assets._serve_immutable("comp")
+    return tmp_path
+
+
+def test_hashed_file_is_immutable(component_dir):
+    response = _request(component_dir, f"comp/{HASHED}")
+    assert response.code == 200
+    assert response.headers["Cache-Control"] == assets.IMMUTABLE
+
+
+def test_entry_is_revalidated(component_dir):
+    response = _request(component_dir, f"comp/{assets.ENTRY_NAME}")
+    assert response.headers["Cache-Control"] == assets.REVALIDATE
+
+
+def test_post_route(tmp_path):
+    def handle(body):
+        if body == b"ruim":
+            raise ValueError("corpo ruim")
+        return {"bytes": len(body)}
+
+    routes.register_post("teste/rota", handle)
+    ok = _request(tmp_path, "teste/rota", method="POST", body=b"abc")
+    assert ok.code == 200
+    assert json.loads(ok.body) == {"bytes": 3}
+    assert _request(tmp_path, "teste/rota", method="POST", body=b"ruim").code == 400
+    assert _request(tmp_path, "teste/outra", method="POST", body=b"abc").code == 405
+    big = b"x" * (routes.MAX_BODY_BYTES + 1)
+    assert _request(tmp_path, "teste/rota", method="POST", body=big).code == 413